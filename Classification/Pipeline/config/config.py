@@ -19,11 +19,25 @@ class Config:
     DATA_DIR: Path = BASE_DIR / "data"
     RAW_DATA_DIR: Path = DATA_DIR / "raw"
     PROCESSED_DATA_DIR: Path = DATA_DIR / "processed"
+    PROCESSED_DATASET_PATH: Path = PROCESSED_DATA_DIR / "processed_dataset.zip"
+    FEATURE_STORE_PATH: Path = PROCESSED_DATA_DIR / "feature_store.pkl"
+    EDA_CACHE_DIR: Path = PROCESSED_DATA_DIR / "eda"
     MODEL_DIR: Path = BASE_DIR / "models"
     PRODUCTION_MODEL_DIR: Path = MODEL_DIR / "production"
+    CHECKPOINT_DIR: Path = MODEL_DIR / "checkpoints"
+    OOF_CACHE_DIR: Path = MODEL_DIR / "oof_cache"
     EXPERIMENT_DIR: Path = BASE_DIR / "spaceship_experiments"
     SUBMISSION_DIR: Path = BASE_DIR / "submissions"
+    EXPERIMENT_INDEX_PATH: Path = BASE_DIR / "experiment_index.sqlite"
     
+    # Processed dataset store
+    DATASET_CHUNK_ROWS: int = 4096
+    
+    # Out-of-core incremental training
+    INCREMENTAL_EPOCHS: int = 5
+    INCREMENTAL_BATCH_SIZE: int = 256
+    SHUFFLE_BUFFER_ROWS: int = 16384
+
     # Logging
     LOG_LEVEL: str = "INFO"
     
@@ -7,11 +7,26 @@ Handles data loading, feature engineering, and preprocessing.
 from .load_data import load_train_test_data, prepare_train_val_test_split
 from .feature_engineering import SpaceshipFeatureEngineer
 from .preprocessing import create_preprocessing_pipeline, preprocess_data
+from .dataset_store import ProcessedDataset, write_dataset
+from .feature_store import FeatureStore
+from .eda_summary import build_eda_summary, load_eda_summary
+from .incremental_preprocessing import (
+    SketchImputer, SketchRobustScaler, partial_fit_preprocessing, merge_preprocessing
+)
 
 __all__ = [
     'load_train_test_data',
     'prepare_train_val_test_split', 
     'SpaceshipFeatureEngineer',
     'create_preprocessing_pipeline',
-    'preprocess_data'
+    'preprocess_data',
+    'ProcessedDataset',
+    'write_dataset',
+    'FeatureStore',
+    'build_eda_summary',
+    'load_eda_summary',
+    'SketchImputer',
+    'SketchRobustScaler',
+    'partial_fit_preprocessing',
+    'merge_preprocessing'
 ]
\ No newline at end of file
@@ -0,0 +1,217 @@
+"""
+Chunked single-file store for processed datasets.
+
+Replaces the six loose ``.npy`` files written by ``run_preprocessing`` with one
+container holding every split, the feature names, dtypes and a schema hash.
+Each (split, row chunk, column) is stored as its own compressed member of a
+zip file, so reading a row range or a subset of features only decompresses
+the chunks that overlap the request.
+"""
+import hashlib
+import json
+import logging
+import zipfile
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+META_NAME = 'meta.json'
+
+
+def schema_hash(feature_names, x_dtype, y_dtype):
+    """Hash of the feature layout; changes whenever the preprocessing output changes."""
+    payload = json.dumps({
+        'features': list(feature_names),
+        'x_dtype': np.dtype(x_dtype).str,
+        'y_dtype': np.dtype(y_dtype).str,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _member(split, array, chunk, column=None):
+    if column is None:
+        return f'{split}/{array}/{chunk:05d}'
+    return f'{split}/{array}/{chunk:05d}/{column:05d}'
+
+
+def write_dataset(path, splits, feature_names=None, chunk_rows=4096, metadata=None, compresslevel=6):
+    """
+    Write named splits into one chunked container.
+
+    Args:
+        path: Output file
+        splits: dict {split name: (X, y)} with 2-D X and 1-D y
+        feature_names: Column names of X (default: feature_0, feature_1, ...)
+        chunk_rows: Rows per chunk
+        metadata: Extra JSON-serializable info (e.g. pipeline checksum)
+        compresslevel: zlib level for every chunk
+
+    Returns:
+        str: Schema hash of the stored layout
+    """
+    path = Path(path)
+    first_X = np.asarray(next(iter(splits.values()))[0])
+    n_features = first_X.shape[1]
+    feature_names = list(feature_names) if feature_names is not None else \
+        [f'feature_{i}' for i in range(n_features)]
+    if len(feature_names) != n_features:
+        raise ValueError(f"{len(feature_names)} feature names for {n_features} columns")
+
+    x_dtype = first_X.dtype
+    y_dtype = np.asarray(next(iter(splits.values()))[1]).dtype
+    meta = {
+        'format_version': FORMAT_VERSION,
+        'feature_names': feature_names,
+        'x_dtype': np.dtype(x_dtype).str,
+        'y_dtype': np.dtype(y_dtype).str,
+        'chunk_rows': int(chunk_rows),
+        'schema_hash': schema_hash(feature_names, x_dtype, y_dtype),
+        'splits': {},
+        'metadata': metadata or {},
+    }
+
+    # Content hash of every stored chunk, so readers can tell rewritten data apart
+    digest = hashlib.sha256()
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_DEFLATED,
+                         compresslevel=compresslevel) as zf:
+        for split, (X, y) in splits.items():
+            X = np.asarray(X, dtype=x_dtype)
+            y = np.asarray(y, dtype=y_dtype)
+            if X.shape != (len(y), n_features):
+                raise ValueError(f"Split '{split}': X {X.shape} does not match y ({len(y)},) "
+                                 f"and {n_features} features")
+            n_chunks = -(-len(y) // chunk_rows)
+            for chunk in range(n_chunks):
+                rows = slice(chunk * chunk_rows, (chunk + 1) * chunk_rows)
+                block = np.asfortranarray(X[rows])
+                for column in range(n_features):
+                    data = block[:, column].tobytes()
+                    digest.update(data)
+                    zf.writestr(_member(split, 'X', chunk, column), data)
+                data = y[rows].tobytes()
+                digest.update(data)
+                zf.writestr(_member(split, 'y', chunk), data)
+            meta['splits'][split] = {'n_rows': int(len(y)), 'n_chunks': int(n_chunks)}
+            digest.update(f'{split}:{len(y)}:{n_chunks}'.encode())
+        meta['data_hash'] = digest.hexdigest()
+        zf.writestr(META_NAME, json.dumps(meta, indent=2))
+    tmp_path.replace(path)
+
+    logger.info(f"💾 Wrote {len(splits)} split(s) to {path} (schema {meta['schema_hash'][:12]})")
+    return meta['schema_hash']
+
+
+class ProcessedDataset:
+    """
+    Reader for containers written by ``write_dataset``.
+
+    Args:
+        path: Container file
+
+    Example:
+        ds = ProcessedDataset(Config.PROCESSED_DATASET_PATH)
+        X, y = ds.read('train', rows=slice(0, 1000), columns=['num__Age', 'num__TotalSpending'])
+        for X_chunk, y_chunk in ds.iter_chunks('train'):
+            ...
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._zf = zipfile.ZipFile(self.path, 'r')
+        self.meta = json.loads(self._zf.read(META_NAME))
+        self.feature_names = self.meta['feature_names']
+        self.schema_hash = self.meta['schema_hash']
+        self.chunk_rows = self.meta['chunk_rows']
+        self.x_dtype = np.dtype(self.meta['x_dtype'])
+        self.y_dtype = np.dtype(self.meta['y_dtype'])
+        self._column_index = {name: i for i, name in enumerate(self.feature_names)}
+
+    @property
+    def fingerprint(self):
+        """Hash of the schema, the stored data and the chunking; changes on any rewrite."""
+        # Containers written before data_hash existed fall back to the pipeline
+        # checksum and split sizes
+        data = self.meta.get('data_hash') or json.dumps(
+            [self.meta['metadata'], self.meta['splits']], sort_keys=True)
+        payload = json.dumps([self.schema_hash, data, self.chunk_rows, self.meta['splits']],
+                             sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def close(self):
+        self._zf.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def splits(self):
+        return list(self.meta['splits'])
+
+    def n_rows(self, split):
+        return self.meta['splits'][split]['n_rows']
+
+    def _columns(self, columns):
+        if columns is None:
+            return list(range(len(self.feature_names)))
+        return [self._column_index[c] if isinstance(c, str) else int(c) for c in columns]
+
+    def _read_chunk(self, split, chunk, columns):
+        X = np.column_stack([
+            np.frombuffer(self._zf.read(_member(split, 'X', chunk, column)), dtype=self.x_dtype)
+            for column in columns
+        ]) if columns else None
+        y = np.frombuffer(self._zf.read(_member(split, 'y', chunk)), dtype=self.y_dtype)
+        if X is None:
+            X = np.empty((len(y), 0), dtype=self.x_dtype)
+        return X, y
+
+    def read(self, split, rows=None, columns=None):
+        """
+        Read a row range and/or column subset of one split.
+
+        Args:
+            split: Split name ('train', 'val', 'test', ...)
+            rows: ``slice`` of rows (step 1) or None for all rows
+            columns: Feature names or indices, or None for all features
+
+        Returns:
+            tuple: (X, y) numpy arrays
+        """
+        n = self.n_rows(split)
+        start, stop, step = (rows or slice(None)).indices(n)
+        if step != 1:
+            raise ValueError("Row slices must be contiguous (step 1)")
+        columns = self._columns(columns)
+        if stop <= start:
+            return np.empty((0, len(columns)), dtype=self.x_dtype), np.empty(0, dtype=self.y_dtype)
+
+        first, last = start // self.chunk_rows, (stop - 1) // self.chunk_rows
+        parts = [self._read_chunk(split, chunk, columns) for chunk in range(first, last + 1)]
+        X = np.concatenate([p[0] for p in parts])
+        y = np.concatenate([p[1] for p in parts])
+        offset = first * self.chunk_rows
+        return X[start - offset:stop - offset], y[start - offset:stop - offset]
+
+    def n_chunks(self, split):
+        return self.meta['splits'][split]['n_chunks']
+
+    def iter_chunks(self, split, columns=None, order=None):
+        """Yield (X, y) one stored chunk at a time, in row order or in ``order``."""
+        columns = self._columns(columns)
+        for chunk in (range(self.n_chunks(split)) if order is None else order):
+            yield self._read_chunk(split, chunk, columns)
+
+
+def get_feature_names(pipeline, n_features):
+    """Best-effort output feature names of the fitted preprocessing pipeline."""
+    try:
+        return list(pipeline.named_steps['preprocessor'].get_feature_names_out())
+    except (AttributeError, KeyError, ValueError):
+        return [f'feature_{i}' for i in range(n_features)]
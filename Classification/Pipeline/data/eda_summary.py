@@ -0,0 +1,242 @@
+"""
+Precomputed EDA summaries for the Streamlit app.
+
+The EDA page used to need the raw passenger frames and recomputed every
+distribution on each rerun. Instead, the pipeline reduces the engineered
+training data once to small aggregates -- histograms, value counts, a
+correlation matrix and binned 2-D densities -- and writes them as JSON keyed
+by a hash of the raw data. The app only reads those aggregates, so page
+loads cost the same whatever the size of the dataset.
+
+Usage:
+    summary = build_eda_summary(train_df, Config.EDA_CACHE_DIR)   # skipped if cached
+    summary = load_eda_summary(Config.EDA_CACHE_DIR)               # latest summary
+"""
+import hashlib
+import json
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .feature_engineering import FEATURE_VERSION, SPENDING_FEATURES, SpaceshipFeatureEngineer
+from .feature_store import row_hashes
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the summary layout changes, so cached summaries are rebuilt
+EDA_VERSION = 1
+
+TARGET = 'Transported'
+# Identifiers and free text: no meaningful distribution
+EXCLUDED_COLUMNS = ['PassengerId', 'Name', 'Cabin', 'GroupId']
+# Heavily skewed, mostly zero; histogrammed on a log1p scale
+LOG_FEATURES = SPENDING_FEATURES + ['TotalSpending']
+DENSITY_PAIRS = [('Age', 'TotalSpending'), ('CabinNum', 'TotalSpending'), ('Age', 'CabinNum')]
+
+HIST_BINS = 40
+DENSITY_BINS = 40
+MAX_CATEGORIES = 30
+
+INDEX_FILE = 'index.json'
+
+
+def data_hash(df):
+    """SHA-256 of the raw frame: column names plus the per-row hashes."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([str(col) for col in df.columns]).encode())
+    digest.update(row_hashes(df).tobytes())
+    return digest.hexdigest()
+
+
+def _histogram(values, target, bins, log):
+    mask = np.isfinite(values)
+    x = np.log1p(values[mask]) if log else values[mask]
+    if not len(x):
+        return None
+    counts, edges = np.histogram(x, bins=bins)
+    entry = {'edges': edges.tolist(), 'counts': counts.tolist(), 'log1p': log,
+             'missing': int((~mask).sum())}
+    if target is not None:
+        entry['target_counts'] = np.histogram(x, bins=edges, weights=target[mask])[0].astype(int).tolist()
+    return entry
+
+
+def _value_counts(series, target, max_categories):
+    labels = series.astype(object).where(series.notna(), '(missing)').astype(str)
+    if target is None:
+        counts = labels.value_counts()
+        positives = None
+    else:
+        grouped = pd.Series(target, index=labels.index).groupby(labels)
+        counts = grouped.size().sort_values(ascending=False, kind='stable')
+        positives = grouped.sum().reindex(counts.index)
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Keep the natural order of binned features such as AgeGroup
+        order = [str(c) for c in series.cat.categories] + ['(missing)']
+        counts = counts.reindex([c for c in order if c in counts.index])
+        if positives is not None:
+            positives = positives.reindex(counts.index)
+    if len(counts) > max_categories:
+        # Long tail folded into one bar
+        head = counts.index[:max_categories - 1]
+        counts = pd.concat([counts[head], pd.Series({'(other)': counts.drop(head).sum()})])
+        if positives is not None:
+            positives = pd.concat([positives[head],
+                                   pd.Series({'(other)': positives.drop(head).sum()})])
+    entry = {'values': counts.index.tolist(), 'counts': counts.astype(int).tolist()}
+    if positives is not None:
+        entry['target_counts'] = positives.astype(int).tolist()
+    return entry
+
+
+def _density(x, y, bins, log_x, log_y):
+    mask = np.isfinite(x) & np.isfinite(y)
+    x = np.log1p(x[mask]) if log_x else x[mask]
+    y = np.log1p(y[mask]) if log_y else y[mask]
+    if not len(x):
+        return None
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=bins)
+    return {'x_edges': x_edges.tolist(), 'y_edges': y_edges.tolist(),
+            'counts': counts.astype(int).tolist(), 'log1p_x': log_x, 'log1p_y': log_y}
+
+
+def compute_eda_summary(df, bins=HIST_BINS, density_bins=DENSITY_BINS,
+                        max_categories=MAX_CATEGORIES, engineer=None):
+    """
+    Reduce a raw passenger frame to the aggregates shown on the EDA page.
+
+    Args:
+        df: Raw passenger rows (train.csv columns, with or without Transported)
+        bins: Histogram bins per numeric feature
+        density_bins: Bins per axis of the 2-D densities
+        max_categories: Bars per categorical feature; the rest become '(other)'
+        engineer: Feature engineer (default: ``SpaceshipFeatureEngineer()``)
+
+    Returns:
+        dict: JSON-serializable summary
+    """
+    engineer = engineer if engineer is not None else SpaceshipFeatureEngineer()
+    X = df.drop(columns=TARGET) if TARGET in df.columns else df
+    X_eng = engineer.transform(X)
+    target = df[TARGET].astype(float).to_numpy() if TARGET in df.columns else None
+
+    columns = [col for col in X_eng.columns if col not in EXCLUDED_COLUMNS]
+    numeric, categorical = [], []
+    for col in columns:
+        series = X_eng[col]
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series) \
+                and series.nunique() > 2:
+            numeric.append(col)
+        else:
+            categorical.append(col)
+
+    histograms = {}
+    for col in numeric:
+        entry = _histogram(X_eng[col].to_numpy(dtype=float), target, bins, col in LOG_FEATURES)
+        if entry is not None:
+            histograms[col] = entry
+
+    value_counts = {col: _value_counts(X_eng[col], target, max_categories) for col in categorical}
+
+    corr_frame = X_eng[numeric].astype(float)
+    if target is not None:
+        corr_frame = corr_frame.assign(**{TARGET: target})
+    corr = corr_frame.corr()
+    correlation = {'columns': corr.columns.tolist(),
+                   'matrix': [[None if np.isnan(v) else round(float(v), 4) for v in row]
+                              for row in corr.to_numpy()]}
+
+    densities = {}
+    for x_col, y_col in DENSITY_PAIRS:
+        if x_col in X_eng.columns and y_col in X_eng.columns:
+            entry = _density(X_eng[x_col].to_numpy(dtype=float), X_eng[y_col].to_numpy(dtype=float),
+                             density_bins, x_col in LOG_FEATURES, y_col in LOG_FEATURES)
+            if entry is not None:
+                densities[f'{x_col}|{y_col}'] = {'x': x_col, 'y': y_col, **entry}
+
+    return {
+        'version': EDA_VERSION,
+        'feature_version': FEATURE_VERSION,
+        'data_hash': data_hash(df),
+        'n_rows': int(len(df)),
+        'target_rate': None if target is None else float(np.nanmean(target)),
+        'missing': {col: int(n) for col, n in df.isna().sum().items()},
+        'histograms': histograms,
+        'value_counts': value_counts,
+        'correlation': correlation,
+        'densities': densities,
+    }
+
+
+def _read_index(cache_dir):
+    try:
+        return json.loads((Path(cache_dir) / INDEX_FILE).read_text())
+    except FileNotFoundError:
+        return {'latest': None, 'summaries': {}}
+
+
+def _write_json(path, payload):
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    tmp_path.write_text(json.dumps(payload))
+    tmp_path.replace(path)
+
+
+def save_eda_summary(summary, cache_dir):
+    """Write a summary under its data hash and mark it as the latest one."""
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    name = f"eda_{summary['data_hash'][:16]}.json"
+    _write_json(cache_dir / name, summary)
+
+    index = _read_index(cache_dir)
+    index['summaries'][summary['data_hash']] = {'file': name, 'n_rows': summary['n_rows']}
+    index['latest'] = summary['data_hash']
+    _write_json(cache_dir / INDEX_FILE, index)
+    return cache_dir / name
+
+
+def load_eda_summary(cache_dir, data_hash=None):
+    """
+    Read a cached summary (default: the latest one).
+
+    Returns:
+        dict or None: the summary, or None if it is missing or out of date
+    """
+    index = _read_index(cache_dir)
+    data_hash = data_hash or index['latest']
+    entry = index['summaries'].get(data_hash) if data_hash else None
+    if entry is None:
+        return None
+    path = Path(cache_dir) / entry['file']
+    if not path.exists():
+        return None
+    summary = json.loads(path.read_text())
+    if summary.get('version') != EDA_VERSION or summary.get('feature_version') != FEATURE_VERSION:
+        return None
+    return summary
+
+
+def build_eda_summary(df, cache_dir, force=False, **kwargs):
+    """
+    Compute and cache the summary of ``df`` unless it is already cached.
+
+    Returns:
+        dict: the (possibly cached) summary
+    """
+    digest = data_hash(df)
+    if not force:
+        cached = load_eda_summary(cache_dir, digest)
+        if cached is not None:
+            logger.info(f"📦 EDA summary for data {digest[:12]} already cached")
+            index = _read_index(cache_dir)
+            if index['latest'] != digest:
+                index['latest'] = digest
+                _write_json(Path(cache_dir) / INDEX_FILE, index)
+            return cached
+
+    summary = compute_eda_summary(df, **kwargs)
+    path = save_eda_summary(summary, cache_dir)
+    logger.info(f"📊 EDA summary for {summary['n_rows']:,} rows written to {path}")
+    return summary
@@ -1,33 +1,99 @@
 """
 Feature engineering for Spaceship Titanic dataset.
 """
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
 from sklearn.base import BaseEstimator, TransformerMixin
 
+# Bump whenever the engineered features change, so persisted features
+# (see data/feature_store.py) are recomputed instead of reused.
+FEATURE_VERSION = 1
+
+SPENDING_FEATURES = ['RoomService', 'FoodCourt', 'ShoppingMall', 'Spa', 'VRDeck']
+# Features that depend on the other members of a passenger's group
+GROUP_FEATURES = ['GroupSize', 'IsAlone']
+
+# Below this many rows the process pool costs more than it saves
+PARALLEL_MIN_ROWS = 50_000
+
+
+# Input frame shared with forked workers, so shards are not pickled to them
+_FORK_INPUT = None
+
+
+def _transform_shard(shard):
+    """Process-pool worker: engineer one shard of whole groups."""
+    return SpaceshipFeatureEngineer().transform(shard)
+
+
+def _transform_positions(positions):
+    """Forked worker: engineer the rows at ``positions`` of the inherited input."""
+    return _transform_shard(_FORK_INPUT.iloc[positions])
+
+
+def _shard_positions(passenger_ids, n_shards):
+    """Row positions per shard; every row of a group lands in the same shard."""
+    group_ids = np.char.partition(passenger_ids.to_numpy(dtype=str), '_')[:, 0]
+    shard_of_row = pd.util.hash_array(group_ids) % np.uint64(n_shards)
+    return [np.flatnonzero(shard_of_row == k) for k in range(n_shards)]
+
+
+def _reassemble(frames, positions, n_rows, index):
+    """Scatter shard outputs back into original row order."""
+    inverse = np.empty(n_rows, dtype=np.int64)
+    inverse[np.concatenate(positions)] = np.arange(n_rows)
+    columns = {}
+    for col in frames[0].columns:
+        parts = [frame[col] for frame in frames]
+        if all(isinstance(part.dtype, np.dtype) for part in parts):
+            # Preallocated buffer; dtypes can differ per shard (e.g. int vs float
+            # CabinNum when only some shards have missing cabins)
+            buffer = np.empty(n_rows, dtype=np.result_type(*[part.dtype for part in parts]))
+            for pos, part in zip(positions, parts):
+                buffer[pos] = part.to_numpy()
+            # Explicit dtype: a bare object buffer would be re-inferred as str
+            columns[col] = pd.Series(buffer, dtype=buffer.dtype)
+        else:
+            # Extension dtypes (category, string) keep their dtype through concat
+            columns[col] = pd.concat(parts, ignore_index=True).take(inverse).reset_index(drop=True)
+    out = pd.DataFrame(columns)
+    out.index = index
+    return out
+
+
 class SpaceshipFeatureEngineer(BaseEstimator, TransformerMixin):
-    """Advanced feature engineering for Spaceship Titanic dataset"""
+    """
+    Advanced feature engineering for Spaceship Titanic dataset
     
-    def __init__(self):
+    Args:
+        n_jobs: Worker processes for large inputs (-1 = all cores). Rows are
+            sharded by GroupId hash so group features stay exact per shard.
+    """
+    
+    def __init__(self, n_jobs=1):
+        self.n_jobs = n_jobs
         self.feature_names = []
     
     def fit(self, X, y=None):
         return self
     
-    def transform(self, X):
+    def row_features(self, X):
+        """Features computed from each passenger's own row (everything except GROUP_FEATURES)."""
         X_eng = X.copy()
         
         # Extract information from PassengerId
-        X_eng['GroupId'] = X_eng['PassengerId'].apply(lambda x: x.split('_')[0]).astype(int)
-        X_eng['GroupSize'] = X_eng.groupby('GroupId')['GroupId'].transform('count')
+        X_eng['GroupId'] = X_eng['PassengerId'].str.split('_', n=1).str[0].astype(int)
         
         # Extract deck/num/side from Cabin
         X_eng[['CabinDeck', 'CabinNum', 'CabinSide']] = X_eng['Cabin'].str.split('/', expand=True)
         X_eng['CabinNum'] = pd.to_numeric(X_eng['CabinNum'], errors='coerce')
         
         # Create total spending feature
-        spending_features = ['RoomService', 'FoodCourt', 'ShoppingMall', 'Spa', 'VRDeck']
-        X_eng['TotalSpending'] = X_eng[spending_features].sum(axis=1)
+        X_eng['TotalSpending'] = X_eng[SPENDING_FEATURES].sum(axis=1)
         X_eng['HasSpending'] = (X_eng['TotalSpending'] > 0).astype(int)
         
         # Age groups
@@ -35,12 +101,52 @@ class SpaceshipFeatureEngineer(BaseEstimator, TransformerMixin):
                                   bins=[0, 12, 18, 30, 50, 100], 
                                   labels=['Child', 'Teen', 'Young Adult', 'Adult', 'Senior'])
         
+        # Drop original columns
+        columns_to_drop = ['PassengerId', 'Cabin', 'Name']
+        return X_eng.drop([col for col in columns_to_drop if col in X_eng.columns], axis=1)
+    
+    @staticmethod
+    def add_group_features(X_eng, group_size):
+        """Insert GROUP_FEATURES given each row's group size (aligned with X_eng)."""
+        X_eng.insert(X_eng.columns.get_loc('GroupId') + 1, 'GroupSize', group_size)
+        
         # Family features
         X_eng['IsAlone'] = (X_eng['GroupSize'] == 1).astype(int)
+        return X_eng
+    
+    def _n_workers(self, n_rows):
+        n_jobs = getattr(self, 'n_jobs', 1)  # pipelines pickled before n_jobs existed
+        n_workers = os.cpu_count() if n_jobs in (None, -1) else n_jobs
+        return max(1, min(n_workers, n_rows // (PARALLEL_MIN_ROWS // 4)))
+    
+    def transform(self, X):
+        n_workers = self._n_workers(len(X)) if len(X) >= PARALLEL_MIN_ROWS else 1
+        if n_workers > 1:
+            return self._parallel_transform(X, n_workers)
         
-        # Drop original columns
-        columns_to_drop = ['PassengerId', 'Cabin', 'Name']
-        X_eng = X_eng.drop([col for col in columns_to_drop if col in X_eng.columns], axis=1)
+        X_eng = self.row_features(X)
+        X_eng = self.add_group_features(
+            X_eng, X_eng.groupby('GroupId')['GroupId'].transform('count')
+        )
+        
+        self.feature_names = list(X_eng.columns)
+        return X_eng
+    
+    def _parallel_transform(self, X, n_workers):
+        positions = [pos for pos in _shard_positions(X['PassengerId'], n_workers) if len(pos)]
+        global _FORK_INPUT
+        if 'fork' in multiprocessing.get_all_start_methods():
+            _FORK_INPUT = X
+            try:
+                with ProcessPoolExecutor(max_workers=n_workers,
+                                         mp_context=multiprocessing.get_context('fork')) as pool:
+                    frames = list(pool.map(_transform_positions, positions))
+            finally:
+                _FORK_INPUT = None
+        else:
+            with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                frames = list(pool.map(_transform_shard, [X.iloc[pos] for pos in positions]))
+        X_eng = _reassemble(frames, positions, len(X), X.index)
         
         self.feature_names = list(X_eng.columns)
         return X_eng
@@ -50,4 +156,44 @@ class SpaceshipFeatureEngineer(BaseEstimator, TransformerMixin):
         return self.transform(X)
     
     def get_feature_names(self):
-        return self.feature_names
\ No newline at end of file
+        return self.feature_names
+
+
+def check_parallel_transform(X, n_jobs=-1, min_rows=2 * PARALLEL_MIN_ROWS):
+    """
+    Assert that the sharded transform returns exactly the serial output.
+
+    ``X`` is tiled (with fresh group ids per copy) until it has at least
+    ``min_rows`` rows, so the parallel path is actually taken.
+
+    Raises:
+        AssertionError: if values, dtypes, columns or index differ
+    """
+    copies = []
+    parts = X['PassengerId'].astype(str).str.split('_', n=1, expand=True)
+    group, member = parts[0].astype(int), parts[1]
+    offset = int(group.max()) + 1
+    for k in range(max(1, -(-min_rows // len(X)))):
+        copy = X.copy()
+        copy['PassengerId'] = (group + k * offset).astype(str).str.zfill(4) + '_' + member
+        copies.append(copy)
+    X_big = pd.concat(copies, ignore_index=True)
+
+    serial = SpaceshipFeatureEngineer(n_jobs=1).transform(X_big)
+    parallel = SpaceshipFeatureEngineer(n_jobs=n_jobs).transform(X_big)
+    pd.testing.assert_frame_equal(serial, parallel)
+    return len(X_big)
+
+
+if __name__ == '__main__':
+    # python -m data.feature_engineering  (from the Pipeline directory)
+    from data.load_data import load_train_test_data
+
+    train_df, _ = load_train_test_data()
+    X = train_df.drop(columns='Transported')
+    text_columns = X.select_dtypes(include=['object', 'string']).columns
+    # As read (pandas str dtype) and as object columns, e.g. from older pandas
+    for frame in (X, X.astype({col: object for col in text_columns})):
+        n_rows = check_parallel_transform(frame)
+    print(f"✅ Serial and parallel feature engineering agree on {n_rows:,} rows")
+
@@ -0,0 +1,156 @@
+"""
+Persistent, incrementally refreshed feature store for Spaceship Titanic.
+
+Engineered features are kept per PassengerId together with a hash of the raw
+row they were computed from and the ``FEATURE_VERSION`` of the feature code.
+A refresh only runs ``SpaceshipFeatureEngineer.row_features`` on new or
+changed rows, and only recomputes group features (GroupSize, IsAlone) for the
+groups those rows belong to, so daily updates cost in proportion to the delta.
+
+Group features are computed over every passenger in the store, not just the
+rows passed to one ``update`` call.
+
+Usage:
+    store = FeatureStore(Config.FEATURE_STORE_PATH)
+    counts = store.update(raw_df)          # {'new': .., 'changed': .., ...}
+    X_eng = store.features(raw_df['PassengerId'])
+    store.save()
+"""
+import logging
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from .feature_engineering import FEATURE_VERSION, GROUP_FEATURES, SpaceshipFeatureEngineer
+
+logger = logging.getLogger(__name__)
+
+HASH_COLUMN = '_row_hash'
+
+
+def row_hashes(df):
+    """Stable 64-bit hash of every raw row (all columns, index ignored)."""
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+class FeatureStore:
+    """
+    Engineered features keyed by PassengerId.
+
+    Args:
+        path: Pickle file holding the store (created on ``save``)
+        engineer: Feature engineer whose ``row_features``/``add_group_features``
+            are used (default: ``SpaceshipFeatureEngineer()``)
+    """
+
+    def __init__(self, path, engineer=None):
+        self.path = Path(path)
+        self.engineer = engineer if engineer is not None else SpaceshipFeatureEngineer()
+        self.version = FEATURE_VERSION
+        self._frame = None
+
+        if self.path.exists():
+            state = joblib.load(self.path)
+            if state.get('version') == self.version:
+                self._frame = state['frame']
+                logger.info(f"📦 Loaded {len(self._frame):,} passengers from feature store {self.path}")
+            else:
+                logger.warning(f"⚠️ Feature store version {state.get('version')} != {self.version}, "
+                               f"recomputing all features")
+
+    def __len__(self):
+        return 0 if self._frame is None else len(self._frame)
+
+    def __contains__(self, passenger_id):
+        return self._frame is not None and passenger_id in self._frame.index
+
+    def update(self, df):
+        """
+        Add new passengers and refresh changed ones.
+
+        Args:
+            df: Raw passenger rows (same columns as the Kaggle CSVs)
+
+        Returns:
+            dict: counts of 'new', 'changed' and 'unchanged' rows, and
+            'groups' whose group features were recomputed
+        """
+        if df['PassengerId'].duplicated().any():
+            raise ValueError("PassengerId must be unique within an update")
+
+        ids = pd.Index(df['PassengerId'])
+        hashes = row_hashes(df)
+
+        if self._frame is None:
+            is_new = np.ones(len(ids), dtype=bool)
+        else:
+            is_new = ~ids.isin(self._frame.index)
+        is_changed = np.zeros(len(ids), dtype=bool)
+        if not is_new.all():
+            # Compare as uint64; a reindex with missing ids would upcast to float
+            known = self._frame.loc[ids[~is_new], HASH_COLUMN].to_numpy()
+            is_changed[~is_new] = known != hashes[~is_new]
+        dirty = is_new | is_changed
+        counts = {'new': int(is_new.sum()), 'changed': int(is_changed.sum()),
+                  'unchanged': int((~dirty).sum()), 'groups': 0}
+        if not dirty.any():
+            return counts
+
+        # Row-level features for the delta only
+        delta = self.engineer.row_features(df[dirty])
+        delta.index = ids[dirty]
+        delta[HASH_COLUMN] = hashes[dirty]
+
+        if self._frame is None:
+            frame = self.engineer.add_group_features(delta.drop(columns=HASH_COLUMN), 0)
+            frame[HASH_COLUMN] = delta[HASH_COLUMN]
+        else:
+            frame = self._frame
+            changed_ids = ids[is_changed]
+            if len(changed_ids):
+                frame.loc[changed_ids, delta.columns] = delta.loc[changed_ids]
+            new_rows = delta.loc[ids[is_new]]
+            if len(new_rows):
+                frame = pd.concat([frame, new_rows.reindex(columns=frame.columns)])
+
+        # Group features only for the groups touched by this delta
+        groups = delta['GroupId'].unique()
+        in_groups = frame['GroupId'].isin(groups).to_numpy()
+        group_ids = frame.loc[in_groups, 'GroupId']
+        group_size = group_ids.map(group_ids.value_counts()).to_numpy()
+        frame.loc[in_groups, 'GroupSize'] = group_size
+        frame.loc[in_groups, 'IsAlone'] = (group_size == 1).astype(int)
+        if counts['new']:
+            # New rows arrive with empty group features; they are all filled now
+            frame = frame.astype({name: 'int64' for name in GROUP_FEATURES})
+
+        self._frame = frame
+        counts['groups'] = int(len(groups))
+        logger.info(f"🔄 Feature store refresh: {counts['new']} new, {counts['changed']} changed, "
+                    f"{counts['unchanged']} unchanged, {counts['groups']} groups recomputed")
+        return counts
+
+    def features(self, passenger_ids):
+        """
+        Engineered features for the given passengers, in the given order.
+
+        Returns:
+            DataFrame: Same columns as ``SpaceshipFeatureEngineer.transform``
+        """
+        if self._frame is None:
+            raise KeyError("Feature store is empty; call update() first")
+        ids = pd.Index(passenger_ids)
+        missing = ids.difference(self._frame.index)
+        if len(missing):
+            raise KeyError(f"{len(missing)} passengers not in feature store, e.g. {list(missing[:3])}")
+        return self._frame.loc[ids].drop(columns=HASH_COLUMN).reset_index(drop=True)
+
+    def save(self):
+        """Write the store atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        joblib.dump({'version': self.version, 'frame': self._frame}, tmp_path)
+        tmp_path.replace(self.path)
+        logger.info(f"💾 Saved {len(self):,} passengers to feature store {self.path}")
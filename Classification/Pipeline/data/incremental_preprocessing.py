@@ -0,0 +1,394 @@
+"""
+Incrementally updatable preprocessing statistics.
+
+``SimpleImputer(strategy='median' | 'most_frequent')`` and ``RobustScaler``
+need every historical row to refit. The transformers here keep mergeable
+sketches instead:
+
+- ``QuantileSketch``: (value, count) pairs, exact while a column has at most
+  ``max_size`` distinct values, then compressed into equal-weight centroids.
+  Medians and quantiles use the same linear interpolation as numpy.
+- ``CountTable``: value counts for modes.
+
+Both support ``partial_fit`` on new chunks and ``merge`` of states fitted on
+different chunks or in different processes, so fitting can be parallelized
+and daily updates only touch the new rows.
+
+Usage:
+    pipeline = create_preprocessing_pipeline(X_sample, incremental=True)
+    pipeline.fit(first_chunk)
+    for chunk in later_chunks:
+        partial_fit_preprocessing(pipeline, chunk)
+
+    # or fit chunks in parallel and combine
+    merge_preprocessing(pipeline_a, pipeline_b)
+"""
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.preprocessing import OneHotEncoder
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch over one numeric column.
+
+    Args:
+        max_size: Maximum number of stored (value, count) pairs
+    """
+
+    def __init__(self, max_size=4096):
+        self.max_size = max_size
+        self.values = np.empty(0)
+        self.counts = np.empty(0)
+        self.exact = True
+
+    @property
+    def n(self):
+        return float(self.counts.sum())
+
+    def _add(self, values, counts):
+        values = np.concatenate([self.values, values])
+        counts = np.concatenate([self.counts, counts])
+        self.values, inverse = np.unique(values, return_inverse=True)
+        self.counts = np.bincount(inverse.ravel(), weights=counts)
+        if len(self.values) > self.max_size:
+            self._compress()
+
+    def _compress(self):
+        """Collapse into ``max_size`` equal-weight centroids (weighted means)."""
+        cum = np.cumsum(self.counts)
+        bins = np.minimum(((cum - self.counts / 2) / cum[-1] * self.max_size).astype(np.int64),
+                          self.max_size - 1)
+        counts = np.bincount(bins, weights=self.counts)
+        sums = np.bincount(bins, weights=self.values * self.counts)
+        keep = counts > 0
+        self.values, self.counts = sums[keep] / counts[keep], counts[keep]
+        self.exact = False
+
+    def update(self, x):
+        """Add the non-missing values of ``x``."""
+        x = np.asarray(x, dtype=np.float64)
+        x = x[~np.isnan(x)]
+        if len(x):
+            values, counts = np.unique(x, return_counts=True)
+            self._add(values, counts.astype(np.float64))
+        return self
+
+    def merge(self, other):
+        self._add(other.values, other.counts)
+        self.exact = self.exact and other.exact
+        return self
+
+    def remove(self, value, count):
+        """Take back ``count`` copies of ``value`` (no-op once it was compressed away)."""
+        idx = np.searchsorted(self.values, value)
+        if count and idx < len(self.values) and self.values[idx] == value:
+            self.counts[idx] = max(self.counts[idx] - count, 0.0)
+            keep = self.counts > 0
+            self.values, self.counts = self.values[keep], self.counts[keep]
+        return self
+
+    def with_point(self, value, count):
+        """Copy of the sketch with ``count`` extra copies of ``value``."""
+        out = QuantileSketch(len(self.values) + 1)
+        out.values, out.counts, out.exact = self.values, self.counts, self.exact
+        if count and not np.isnan(value):
+            out._add(np.array([value]), np.array([float(count)]))
+        return out
+
+    def quantile(self, q):
+        """Quantile(s) ``q`` in [0, 1] with numpy's 'linear' interpolation."""
+        if not len(self.values):
+            return np.full(np.shape(q), np.nan)
+        cum = np.cumsum(self.counts)
+        pos = np.asarray(q, dtype=np.float64) * (cum[-1] - 1)
+        lo, hi = np.floor(pos), np.ceil(pos)
+        last = len(self.values) - 1
+        v_lo = self.values[np.minimum(np.searchsorted(cum, lo, side='right'), last)]
+        v_hi = self.values[np.minimum(np.searchsorted(cum, hi, side='right'), last)]
+        return v_lo + (pos - lo) * (v_hi - v_lo)
+
+
+class CountTable(Counter):
+    """Mergeable value counts over one column (missing values skipped)."""
+
+    def update_values(self, x):
+        x = pd.Series(np.asarray(x, dtype=object))
+        self.update(x[x.notna()].value_counts(sort=False).to_dict())
+        return self
+
+    def merge(self, other):
+        self.update(other)
+        return self
+
+    def mode(self):
+        """Most frequent value; ties go to the smallest, like ``SimpleImputer``."""
+        if not self:
+            return np.nan
+        top = max(self.values())
+        return min(value for value, count in self.items() if count == top)
+
+
+class _SketchTransformer(BaseEstimator, TransformerMixin):
+    """Shared input handling and feature-name bookkeeping."""
+
+    def _columns(self, X):
+        if isinstance(X, pd.DataFrame):
+            return X.columns, [X[c].to_numpy() for c in X.columns]
+        X = np.asarray(X)
+        if X.ndim == 1:
+            X = X.reshape(-1, 1)
+        return None, [X[:, j] for j in range(X.shape[1])]
+
+    def _start(self, X):
+        names, columns = self._columns(X)
+        if names is not None:
+            self.feature_names_in_ = np.asarray(names, dtype=object)
+        self.n_features_in_ = len(columns)
+        return columns
+
+    def _check_columns(self, X):
+        _, columns = self._columns(X)
+        if len(columns) != self.n_features_in_:
+            raise ValueError(f"X has {len(columns)} features, expected {self.n_features_in_}")
+        return columns
+
+    def _reset(self):
+        for attr in ('sketches_', 'feature_names_in_'):
+            if hasattr(self, attr):
+                delattr(self, attr)
+
+    def fit(self, X, y=None):
+        """Reset the sketches and fit on ``X``."""
+        self._reset()
+        return self.partial_fit(X, y)
+
+    def merge(self, other):
+        """Combine with a transformer of the same kind fitted on other rows."""
+        if other.n_features_in_ != self.n_features_in_:
+            raise ValueError("Cannot merge transformers fitted on different columns")
+        for mine, theirs in zip(self.sketches_, other.sketches_):
+            mine.merge(theirs)
+        self._finalize()
+        return self
+
+    def get_feature_names_out(self, input_features=None):
+        if input_features is not None:
+            return np.asarray(input_features, dtype=object)
+        if hasattr(self, 'feature_names_in_'):
+            return self.feature_names_in_.copy()
+        return np.asarray([f'x{i}' for i in range(self.n_features_in_)], dtype=object)
+
+
+class SketchImputer(_SketchTransformer):
+    """
+    Drop-in replacement for ``SimpleImputer`` with ``partial_fit`` and ``merge``.
+
+    Args:
+        strategy: 'median' (quantile sketches) or 'most_frequent' (count tables)
+        max_size: Sketch size for 'median'
+    """
+
+    def __init__(self, strategy='median', max_size=4096):
+        self.strategy = strategy
+        self.max_size = max_size
+
+    def partial_fit(self, X, y=None):
+        if self.strategy not in ('median', 'most_frequent'):
+            raise ValueError(f"Unsupported strategy: {self.strategy}")
+        if not hasattr(self, 'sketches_'):
+            columns = self._start(X)
+            new = (lambda: QuantileSketch(self.max_size)) if self.strategy == 'median' else CountTable
+            self.sketches_ = [new() for _ in columns]
+            self.n_missing_ = np.zeros(len(columns), dtype=np.int64)
+        else:
+            columns = self._check_columns(X)
+        for j, (sketch, column) in enumerate(zip(self.sketches_, columns)):
+            self.n_missing_[j] += int(pd.isna(column).sum())
+            if self.strategy == 'median':
+                sketch.update(column)
+            else:
+                sketch.update_values(column)
+        self._finalize()
+        return self
+
+    def merge(self, other):
+        self.n_missing_ = self.n_missing_ + other.n_missing_
+        return super().merge(other)
+
+    def _finalize(self):
+        if self.strategy == 'median':
+            self.statistics_ = np.array([s.quantile(0.5) for s in self.sketches_])
+        else:
+            self.statistics_ = np.array([s.mode() for s in self.sketches_], dtype=object)
+
+    def transform(self, X):
+        columns = self._check_columns(X)
+        dtype = np.float64 if self.strategy == 'median' else object
+        out = np.empty((len(columns[0]) if columns else 0, len(columns)), dtype=dtype)
+        for j, (column, fill) in enumerate(zip(columns, self.statistics_)):
+            column = np.asarray(column, dtype=dtype)
+            out[:, j] = np.where(pd.isna(column), fill, column)
+        return out
+
+
+class SketchRobustScaler(_SketchTransformer):
+    """
+    Drop-in replacement for ``RobustScaler`` with ``partial_fit`` and ``merge``.
+
+    Behind a median ``SketchImputer`` the pipeline helpers switch the scaler
+    to raw (non-missing) values plus ``n_missing_`` virtual copies of the
+    imputer's current median, so its quantiles match a full refit even when
+    the median moves between chunks.
+
+    Args:
+        with_centering: Subtract the median
+        with_scaling: Divide by the ``quantile_range`` spread
+        quantile_range: (q_min, q_max) percentiles
+        max_size: Sketch size per column
+    """
+
+    def __init__(self, with_centering=True, with_scaling=True, quantile_range=(25.0, 75.0),
+                 max_size=4096):
+        self.with_centering = with_centering
+        self.with_scaling = with_scaling
+        self.quantile_range = quantile_range
+        self.max_size = max_size
+
+    def _reset(self):
+        super()._reset()
+        self.missing_fill_ = None
+        self.n_missing_ = None
+
+    def partial_fit(self, X, y=None):
+        if not hasattr(self, 'sketches_'):
+            columns = self._start(X)
+            self.sketches_ = [QuantileSketch(self.max_size) for _ in columns]
+        else:
+            columns = self._check_columns(X)
+        for sketch, column in zip(self.sketches_, columns):
+            sketch.update(column)
+        self._finalize()
+        return self
+
+    def set_missing(self, fill_values, n_missing):
+        """Count ``n_missing`` rows per column as imputed with ``fill_values``."""
+        self.missing_fill_ = np.asarray(fill_values, dtype=np.float64)
+        self.n_missing_ = np.asarray(n_missing)
+        self._finalize()
+        return self
+
+    def _finalize(self):
+        sketches = self.sketches_
+        if getattr(self, 'n_missing_', None) is not None:
+            sketches = [s.with_point(fill, n)
+                        for s, fill, n in zip(sketches, self.missing_fill_, self.n_missing_)]
+        q_min, q_max = self.quantile_range
+        quantiles = np.array([s.quantile([0.5, q_min / 100, q_max / 100]) for s in sketches])
+        self.center_ = quantiles[:, 0] if self.with_centering else None
+        if self.with_scaling:
+            scale = quantiles[:, 2] - quantiles[:, 1]
+            # Same zero handling as sklearn: constant columns are left unscaled
+            scale[scale < 10 * np.finfo(np.float64).eps] = 1.0
+            self.scale_ = scale
+        else:
+            self.scale_ = None
+
+    def transform(self, X):
+        X = np.column_stack(self._check_columns(X)).astype(np.float64)
+        if self.with_centering:
+            X -= self.center_
+        if self.with_scaling:
+            X /= self.scale_
+        return X
+
+
+# ---------- pipeline helpers ----------
+def _branches(pipeline):
+    """Yield (name, fitted branch Pipeline, columns) of the preprocessor."""
+    for name, branch, columns in pipeline.named_steps['preprocessor'].transformers_:
+        if name != 'remainder' and hasattr(branch, 'steps'):
+            yield name, branch, columns
+
+
+def _imputed_scalers(branch):
+    """Yield (median imputer, scaler) pairs that follow each other in a branch."""
+    for (_, step), (_, following) in zip(branch.steps, branch.steps[1:]):
+        if isinstance(step, SketchImputer) and step.strategy == 'median' \
+                and isinstance(following, SketchRobustScaler):
+            yield step, following
+
+
+def _detach_fills(branch):
+    """
+    Switch scalers behind a median imputer to raw values + virtual fills.
+
+    After ``pipeline.fit`` the scaler's sketches contain the imputed medians;
+    they are taken back out (before the imputer changes) so later updates can
+    re-add them at the current median.
+    """
+    for imputer, scaler in _imputed_scalers(branch):
+        if getattr(scaler, 'n_missing_', None) is None:
+            for sketch, fill, n in zip(scaler.sketches_, imputer.statistics_, imputer.n_missing_):
+                sketch.remove(fill, n)
+            scaler.set_missing(imputer.statistics_, imputer.n_missing_)
+
+
+def _refresh_encoder(encoder, imputer):
+    """Refit a OneHotEncoder on every category the imputer's count tables have seen."""
+    categories = [np.array(sorted(table), dtype=object) for table in imputer.sketches_]
+    if all(len(new) == len(old) and (new == old).all()
+           for new, old in zip(categories, encoder.categories_)):
+        return
+    n_rows = max(len(c) for c in categories)
+    rows = np.column_stack([np.resize(c, n_rows) for c in categories])
+    encoder.set_params(categories=categories).fit(rows)
+
+
+def _refresh(branch):
+    """Re-derive dependent state after the imputers of a branch changed."""
+    for imputer, scaler in _imputed_scalers(branch):
+        scaler.set_missing(imputer.statistics_, imputer.n_missing_)
+    for (_, step), (_, following) in zip(branch.steps, branch.steps[1:]):
+        if isinstance(step, SketchImputer) and step.strategy == 'most_frequent' \
+                and isinstance(following, OneHotEncoder):
+            _refresh_encoder(following, step)
+
+
+def partial_fit_preprocessing(pipeline, X_chunk):
+    """
+    Update a fitted incremental preprocessing pipeline with a new chunk.
+
+    Each step with ``partial_fit`` absorbs the chunk as seen by that step.
+    A scaler behind a median imputer absorbs the raw values and accounts for
+    missing ones at the imputer's current median. One-hot categories are
+    extended to every value the categorical imputer has counted.
+    """
+    X_eng = pipeline.named_steps['feature_engineer'].transform(X_chunk)
+    for _, branch, columns in _branches(pipeline):
+        _detach_fills(branch)
+        # Scalers behind a median imputer take the raw values (see _detach_fills)
+        raw_feeders = [imputer for imputer, _ in _imputed_scalers(branch)]
+        data = X_eng[columns]
+        for i, (_, step) in enumerate(branch.steps):
+            if hasattr(step, 'partial_fit'):
+                step.partial_fit(data)
+            if i < len(branch.steps) - 1 and step not in raw_feeders:
+                data = step.transform(data)
+        _refresh(branch)
+    return pipeline
+
+
+def merge_preprocessing(pipeline, other):
+    """Merge the sketches of ``other`` (fitted on different rows) into ``pipeline``."""
+    for (_, branch, _), (_, other_branch, _) in zip(_branches(pipeline), _branches(other)):
+        _detach_fills(branch)
+        _detach_fills(other_branch)
+        for (_, step), (_, other_step) in zip(branch.steps, other_branch.steps):
+            if hasattr(step, 'merge'):
+                step.merge(other_step)
+        _refresh(branch)
+    return pipeline
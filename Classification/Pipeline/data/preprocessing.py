@@ -9,16 +9,20 @@ from sklearn.compose import ColumnTransformer
 from sklearn.impute import SimpleImputer
 from sklearn.preprocessing import RobustScaler, OneHotEncoder
 
+from config import Config
 from .feature_engineering import SpaceshipFeatureEngineer
+from .incremental_preprocessing import SketchImputer, SketchRobustScaler
 
 logger = logging.getLogger(__name__)
 
-def create_preprocessing_pipeline(X_sample):
+def create_preprocessing_pipeline(X_sample, incremental=False):
     """
     Create preprocessing pipeline based on data sample.
     
     Args:
         X_sample: Sample DataFrame to determine feature types
+        incremental: Use sketch-based imputers/scaler that support
+            ``partial_fit_preprocessing`` and ``merge_preprocessing``
         
     Returns:
         Pipeline: Full preprocessing pipeline
@@ -35,13 +39,21 @@ def create_preprocessing_pipeline(X_sample):
     logger.info(f"🔤 Categorical features ({len(categorical_features)}): {categorical_features}")
     
     # Create preprocessing pipelines
-    numerical_pipeline = Pipeline([
-        ('imputer', SimpleImputer(strategy='median')),
-        ('scaler', RobustScaler())
-    ])
+    if incremental:
+        numerical_pipeline = Pipeline([
+            ('imputer', SketchImputer(strategy='median')),
+            ('scaler', SketchRobustScaler())
+        ])
+        categorical_imputer = SketchImputer(strategy='most_frequent')
+    else:
+        numerical_pipeline = Pipeline([
+            ('imputer', SimpleImputer(strategy='median')),
+            ('scaler', RobustScaler())
+        ])
+        categorical_imputer = SimpleImputer(strategy='most_frequent')
     
     categorical_pipeline = Pipeline([
-        ('imputer', SimpleImputer(strategy='most_frequent')),
+        ('imputer', categorical_imputer),
         ('encoder', OneHotEncoder(handle_unknown='ignore', sparse_output=False))
     ])
     
@@ -53,13 +65,13 @@ def create_preprocessing_pipeline(X_sample):
     
     # Create full pipeline with feature engineering
     full_pipeline = Pipeline([
-        ('feature_engineer', SpaceshipFeatureEngineer()),
+        ('feature_engineer', SpaceshipFeatureEngineer(n_jobs=Config.N_JOBS)),
         ('preprocessor', preprocessor)
     ])
     
     return full_pipeline
 
-def preprocess_data(X_train, X_val, X_test, pipeline):
+def preprocess_data(X_train, X_val, X_test, pipeline, feature_store=None):
     """
     Apply preprocessing pipeline to data.
     
@@ -68,18 +80,29 @@ def preprocess_data(X_train, X_val, X_test, pipeline):
         X_val: Validation features
         X_test: Test features
         pipeline: Preprocessing pipeline
+        feature_store: Optional ``FeatureStore`` already updated with these
+            passengers; engineered rows are read from it instead of running
+            the pipeline's (stateless) feature engineering step
         
     Returns:
         tuple: Processed X_train, X_val, X_test and fitted pipeline
     """
     logger.info("🔄 Applying preprocessing pipeline...")
     
-    # Fit and transform training data
-    X_train_proc = pipeline.fit_transform(X_train)
-    
-    # Transform validation and test data
-    X_val_proc = pipeline.transform(X_val)
-    X_test_proc = pipeline.transform(X_test)
+    if feature_store is not None:
+        # Fit only the column transformer on stored features; the full pipeline
+        # still engineers raw rows itself at inference time
+        preprocessor = pipeline.named_steps['preprocessor']
+        X_train_proc = preprocessor.fit_transform(feature_store.features(X_train['PassengerId']))
+        X_val_proc = preprocessor.transform(feature_store.features(X_val['PassengerId']))
+        X_test_proc = preprocessor.transform(feature_store.features(X_test['PassengerId']))
+    else:
+        # Fit and transform training data
+        X_train_proc = pipeline.fit_transform(X_train)
+        
+        # Transform validation and test data
+        X_val_proc = pipeline.transform(X_val)
+        X_test_proc = pipeline.transform(X_test)
     
     logger.info(f"✅ Preprocessing complete!")
     logger.info(f"📊 Processed data shapes:")
@@ -6,12 +6,16 @@ This script orchestrates the entire ML pipeline from data loading to model deplo
 Usage:
     python run_pipeline.py --mode full
     python run_pipeline.py --mode preprocessing
+    python run_pipeline.py --mode eda
     python run_pipeline.py --mode training
+    python run_pipeline.py --mode training --incremental
+    python run_pipeline.py --mode training --stacking
     python run_pipeline.py --mode evaluation
     python run_pipeline.py --mode submission
 """
 
 import argparse
+import hashlib
 import logging
 import sys
 import os
@@ -25,14 +29,20 @@ sys.path.insert(0, str(current_dir))
 from config.config import Config
 from data.load_data import load_train_test_data, prepare_train_val_test_split
 from data.preprocessing import preprocess_data, create_preprocessing_pipeline
+from data.dataset_store import write_dataset, get_feature_names
+from data.eda_summary import build_eda_summary
+from data.feature_store import FeatureStore
 from models.train_model import train_all_models, select_best_model, generate_submission
 from models.evaluate_model import comprehensive_evaluation
+from training.incremental import train_incremental_models
+from training.stacking import StackedClassifier, train_stacking
 
 import joblib
 import json
 from datetime import datetime
 import pandas as pd
 import numpy as np
+from sklearn.base import clone
 
 # Setup logging
 logging.basicConfig(
@@ -76,9 +86,11 @@ def run_preprocessing(save_processed: bool = True):
     logger.info("Creating preprocessing pipeline...")
     pipeline = create_preprocessing_pipeline(X_train)
     
+    feature_store = update_feature_store(train_df, test_df)
+    
     logger.info("Applying preprocessing...")
     X_train_proc, X_val_proc, X_test_proc, pipeline = preprocess_data(
-        X_train, X_val, X_test, pipeline
+        X_train, X_val, X_test, pipeline, feature_store=feature_store
     )
     
     # Save processed data if requested
@@ -86,23 +98,75 @@ def run_preprocessing(save_processed: bool = True):
         logger.info("Saving processed data...")
         processed_dir = Config.PROCESSED_DATA_DIR
         
-        np.save(processed_dir / 'X_train_processed.npy', X_train_proc)
-        np.save(processed_dir / 'X_val_processed.npy', X_val_proc)
-        np.save(processed_dir / 'X_test_processed.npy', X_test_proc)
-        np.save(processed_dir / 'y_train.npy', y_train)
-        np.save(processed_dir / 'y_val.npy', y_val)
-        np.save(processed_dir / 'y_test.npy', y_test)
+        pipeline_path = processed_dir / 'preprocessing_pipeline.pkl'
+        joblib.dump(pipeline, pipeline_path)
         
-        joblib.dump(pipeline, processed_dir / 'preprocessing_pipeline.pkl')
+        # One chunked container instead of six loose .npy files
+        write_dataset(
+            Config.PROCESSED_DATASET_PATH,
+            {
+                'train': (X_train_proc, np.asarray(y_train)),
+                'val': (X_val_proc, np.asarray(y_val)),
+                'test': (X_test_proc, np.asarray(y_test)),
+            },
+            feature_names=get_feature_names(pipeline, X_train_proc.shape[1]),
+            chunk_rows=Config.DATASET_CHUNK_ROWS,
+            metadata={'pipeline_sha256': hashlib.sha256(pipeline_path.read_bytes()).hexdigest()},
+        )
         
         logger.info(f"✅ Processed data saved to {processed_dir}")
+        
+        run_eda_summary(train_df)
     
     return (X_train_proc, X_val_proc, X_test_proc, 
             y_train, y_val, y_test, 
             pipeline, test_df)
 
 
-def run_training(X_train_proc, y_train, X_val_proc, y_val):
+def update_feature_store(train_df, test_df):
+    """
+    Refresh the persistent feature store with every raw passenger.
+    
+    Only new or changed passengers are re-engineered. Group features are
+    computed over each whole Kaggle file (groups never span train and test),
+    as they are when the saved pipeline engineers test.csv for a submission.
+    
+    Args:
+        train_df: Raw training data (with Transported)
+        test_df: Raw Kaggle test data
+        
+    Returns:
+        FeatureStore: Store holding features for every passenger
+    """
+    feature_store = FeatureStore(Config.FEATURE_STORE_PATH)
+    raw = pd.concat([train_df.drop(columns='Transported'), test_df], ignore_index=True)
+    counts = feature_store.update(raw)
+    misses = counts['new'] + counts['changed']
+    logger.info(f"📦 Feature store: {counts['unchanged']:,} hits, {misses:,} misses "
+                f"({counts['new']:,} new, {counts['changed']:,} changed)")
+    if misses:
+        feature_store.save()
+    return feature_store
+
+
+def run_eda_summary(train_df=None, force=False):
+    """
+    Precompute the aggregates shown on the Streamlit EDA page.
+    
+    Args:
+        train_df: Raw training data (loaded from data/raw if None)
+        force: Recompute even if a summary for this data is cached
+        
+    Returns:
+        dict: EDA summary
+    """
+    logger.info("Precomputing EDA summary...")
+    if train_df is None:
+        train_df, _ = load_train_test_data()
+    return build_eda_summary(train_df, Config.EDA_CACHE_DIR, force=force)
+
+
+def run_training(X_train_proc, y_train, X_val_proc, y_val, stacking=False):
     """
     Run model training pipeline.
     
@@ -111,6 +175,8 @@ def run_training(X_train_proc, y_train, X_val_proc, y_val):
         y_train: Training labels
         X_val_proc: Processed validation features
         y_val: Validation labels
+        stacking: Also stack all candidates; the stack replaces the best
+            model if it scores higher on validation
         
     Returns:
         Tuple of results and trained models
@@ -135,6 +201,76 @@ def run_training(X_train_proc, y_train, X_val_proc, y_val):
     logger.info(f"   Validation Accuracy: {best_metrics['val_accuracy']:.4f}")
     logger.info(f"   CV Accuracy: {best_metrics['cv_accuracy_mean']:.4f} ± {best_metrics['cv_accuracy_std']:.4f}")
     
+    if stacking:
+        best_name, best_model = run_stacking(
+            results, trained_models, best_name, best_model,
+            X_train_proc, y_train, X_val_proc, y_val
+        )
+    
+    return results, trained_models, best_name, best_model
+
+
+def run_stacking(results, trained_models, best_name, best_model,
+                 X_train_proc, y_train, X_val_proc, y_val):
+    """
+    Stack the fitted candidates on their out-of-fold predictions from training.
+    
+    Args:
+        results: Candidate metrics from ``train_all_models``
+        trained_models: Fitted candidates from ``train_all_models``
+        best_name: Name of the single best model
+        best_model: The single best model
+        X_train_proc, y_train: Training split the candidates were fitted on
+        X_val_proc, y_val: Validation split
+        
+    Returns:
+        Tuple of the name and model to carry forward
+    """
+    logger.info("="*80)
+    logger.info("STEP 2b: STACKING")
+    logger.info("="*80)
+    
+    stacked_model, report = train_stacking(
+        trained_models, results, X_train_proc, y_train, X_val_proc, y_val
+    )
+    
+    report_path = Config.MODEL_DIR / 'stacking_report.json'
+    with open(report_path, 'w') as f:
+        json.dump({'timestamp': datetime.now().isoformat(), **report}, f, indent=2)
+    
+    logger.info(f"\n🧱 Stacked Model: {report['stacked_val_accuracy']:.4f} validation accuracy "
+                f"({report['improvement']:+.4f} vs {report['best_model']})")
+    if report['stacking_wins']:
+        logger.info("   ✅ Stacking beats the single best model and replaces it")
+        return 'Stacking', stacked_model
+    
+    logger.info(f"   Keeping {best_name}; stacking did not improve validation accuracy")
+    return best_name, best_model
+
+
+def run_incremental_training():
+    """
+    Train partial_fit models out of core from the processed dataset container.
+    
+    Returns:
+        Tuple of results, trained models, best model name and best model
+    """
+    logger.info("="*80)
+    logger.info("STEP 2: INCREMENTAL MODEL TRAINING (out of core)")
+    logger.info("="*80)
+    
+    if not Config.PROCESSED_DATASET_PATH.exists():
+        raise FileNotFoundError(
+            f"{Config.PROCESSED_DATASET_PATH} not found - run --mode preprocessing first"
+        )
+    
+    results, trained_models, best_name, best_model = train_incremental_models(
+        Config.PROCESSED_DATASET_PATH, track_mlflow=True
+    )
+    
+    logger.info(f"\n🏆 Best Model: {best_name}")
+    logger.info(f"   Validation Accuracy: {results[best_name]['val_accuracy']:.4f}")
+    
     return results, trained_models, best_name, best_model
 
 
@@ -246,12 +382,26 @@ def main():
     parser.add_argument(
         '--mode',
         type=str,
-        choices=['full', 'preprocessing', 'training', 'evaluation', 'submission'],
+        choices=['full', 'preprocessing', 'eda', 'training', 'evaluation', 'submission'],
         default='full',
         help='Pipeline mode to run'
     )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='With --mode training: stream processed chunks into partial_fit models'
+    )
+    parser.add_argument(
+        '--stacking',
+        action='store_true',
+        help='With --mode training/full: stack all candidates on cached out-of-fold predictions'
+    )
     
     args = parser.parse_args()
+    if args.incremental and args.mode != 'training':
+        parser.error("--incremental is only supported with --mode training")
+    if args.stacking and (args.incremental or args.mode not in ['full', 'training']):
+        parser.error("--stacking is only supported with --mode training or full")
     
     logger.info("🚀 SPACESHIP TITANIC ML PIPELINE")
     logger.info("="*80)
@@ -263,6 +413,16 @@ def main():
     setup_environment()
     
     try:
+        if args.incremental:
+            run_incremental_training()
+            logger.info("\n✅ Incremental training complete!")
+            return
+        
+        if args.mode == 'eda':
+            run_eda_summary(force=True)
+            logger.info("\n✅ EDA summary complete!")
+            return
+        
         if args.mode in ['full', 'preprocessing']:
             # Run preprocessing
             (X_train_proc, X_val_proc, X_test_proc,
@@ -276,7 +436,7 @@ def main():
         if args.mode in ['full', 'training']:
             # Run training
             results, trained_models, best_name, best_model = run_training(
-                X_train_proc, y_train, X_val_proc, y_val
+                X_train_proc, y_train, X_val_proc, y_val, stacking=args.stacking
             )
         
         if args.mode == 'training':
@@ -288,7 +448,11 @@ def main():
             logger.info("\nRetraining best model on full training data...")
             X_full_train = np.vstack([X_train_proc, X_val_proc])
             y_full_train = np.concatenate([y_train, y_val])
-            best_model.fit(X_full_train, y_full_train)
+            # Refit a copy so the candidates in trained_models stay as evaluated
+            if isinstance(best_model, StackedClassifier):
+                best_model.fit(X_full_train, y_full_train)  # refits clones of the candidates
+            else:
+                best_model = clone(best_model).fit(X_full_train, y_full_train)
             
             # Run evaluation
             test_metrics = run_evaluation(
@@ -0,0 +1,138 @@
+"""
+EDA page for the Spaceship Titanic Streamlit app.
+
+Reads only the aggregates written by ``python run_pipeline.py --mode eda``
+(see data/eda_summary.py): histograms, value counts, the correlation matrix
+and binned 2-D densities. No raw rows are loaded, so the page stays fast
+however large the training data grows.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from config.config import Config
+from data.eda_summary import INDEX_FILE, load_eda_summary
+
+st.set_page_config(page_title="EDA - Spaceship Titanic ML", page_icon="📊", layout="wide")
+
+
+@st.cache_data
+def get_summary(cache_dir, index_mtime):
+    """Cached per index file version; a new pipeline run invalidates it."""
+    return load_eda_summary(cache_dir)
+
+
+def _axis_label(name, log1p):
+    return f"log1p({name})" if log1p else name
+
+
+def histogram_figure(name, hist, split_by_target):
+    edges = np.asarray(hist['edges'])
+    centers, widths = (edges[:-1] + edges[1:]) / 2, np.diff(edges)
+    counts = np.asarray(hist['counts'])
+    fig = go.Figure()
+    if split_by_target and 'target_counts' in hist:
+        positives = np.asarray(hist['target_counts'])
+        fig.add_bar(x=centers, y=counts - positives, width=widths, name='Not transported')
+        fig.add_bar(x=centers, y=positives, width=widths, name='Transported')
+        fig.update_layout(barmode='stack')
+    else:
+        fig.add_bar(x=centers, y=counts, width=widths, name=name)
+    fig.update_layout(xaxis_title=_axis_label(name, hist['log1p']), yaxis_title='Passengers',
+                      margin=dict(t=30, b=10))
+    return fig
+
+
+def value_counts_figure(name, counts, show_rate):
+    fig = go.Figure()
+    if show_rate and 'target_counts' in counts:
+        rate = np.asarray(counts['target_counts']) / np.maximum(np.asarray(counts['counts']), 1)
+        fig.add_bar(x=counts['values'], y=rate, name='Transported rate')
+        fig.update_layout(yaxis_title='Transported rate', yaxis_range=[0, 1])
+    else:
+        fig.add_bar(x=counts['values'], y=counts['counts'], name=name)
+        fig.update_layout(yaxis_title='Passengers')
+    fig.update_layout(xaxis_title=name, xaxis_type='category', margin=dict(t=30, b=10))
+    return fig
+
+
+def main():
+    st.title("📊 Exploratory Data Analysis")
+
+    index_path = Config.EDA_CACHE_DIR / INDEX_FILE
+    if not index_path.exists():
+        st.warning("No EDA summary found. Run `python run_pipeline.py --mode eda` first.")
+        return
+    summary = get_summary(str(Config.EDA_CACHE_DIR), index_path.stat().st_mtime_ns)
+    if summary is None:
+        st.warning("The EDA summary is out of date. Run `python run_pipeline.py --mode eda` again.")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Passengers", f"{summary['n_rows']:,}")
+    if summary['target_rate'] is not None:
+        col2.metric("Transported", f"{summary['target_rate']:.1%}")
+    col3.metric("Data hash", summary['data_hash'][:12])
+
+    tabs = st.tabs(["Distributions", "Categories", "Correlation", "2-D densities", "Missing values"])
+
+    with tabs[0]:
+        name = st.selectbox("Feature", list(summary['histograms']))
+        split = st.checkbox("Split by Transported", value=True)
+        st.plotly_chart(histogram_figure(name, summary['histograms'][name], split),
+                        use_container_width=True)
+
+    with tabs[1]:
+        name = st.selectbox("Feature", list(summary['value_counts']), key='categorical')
+        show_rate = st.checkbox("Show Transported rate", value=False)
+        st.plotly_chart(value_counts_figure(name, summary['value_counts'][name], show_rate),
+                        use_container_width=True)
+
+    with tabs[2]:
+        corr = summary['correlation']
+        matrix = np.array([[np.nan if v is None else v for v in row] for row in corr['matrix']])
+        fig = go.Figure(go.Heatmap(z=matrix, x=corr['columns'], y=corr['columns'],
+                                   colorscale='RdBu', zmid=0, zmin=-1, zmax=1))
+        fig.update_layout(height=600, margin=dict(t=30, b=10))
+        st.plotly_chart(fig, use_container_width=True)
+
+    with tabs[3]:
+        densities = summary['densities']
+        if not densities:
+            st.info("No 2-D densities in this summary.")
+        else:
+            key = st.selectbox("Pair", list(densities), format_func=lambda k: k.replace('|', ' vs '))
+            density = densities[key]
+            x_edges, y_edges = np.asarray(density['x_edges']), np.asarray(density['y_edges'])
+            counts = np.asarray(density['counts'])
+            # histogram2d counts are indexed [x, y]; heatmap rows are y
+            fig = go.Figure(go.Heatmap(z=np.log1p(counts.T), x=(x_edges[:-1] + x_edges[1:]) / 2,
+                                       y=(y_edges[:-1] + y_edges[1:]) / 2, colorscale='Viridis',
+                                       customdata=counts.T,
+                                       hovertemplate='%{customdata} passengers<extra></extra>',
+                                       colorbar=dict(title='log1p(count)')))
+            fig.update_layout(xaxis_title=_axis_label(density['x'], density['log1p_x']),
+                              yaxis_title=_axis_label(density['y'], density['log1p_y']),
+                              height=550, margin=dict(t=30, b=10))
+            st.plotly_chart(fig, use_container_width=True)
+
+    with tabs[4]:
+        missing = {col: n for col, n in summary['missing'].items() if n}
+        if not missing:
+            st.success("No missing values.")
+        else:
+            fig = go.Figure(go.Bar(x=list(missing), y=[n / summary['n_rows'] for n in missing.values()]))
+            fig.update_layout(yaxis_title='Share missing', yaxis_tickformat='.0%', margin=dict(t=30, b=10))
+            st.plotly_chart(fig, use_container_width=True)
+
+
+if __name__ == "__main__":
+    main()
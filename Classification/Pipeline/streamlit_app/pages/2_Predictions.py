@@ -0,0 +1,97 @@
+"""
+Predictions page for the Spaceship Titanic Streamlit app.
+
+Scores an uploaded CSV of raw passengers (test.csv columns) with the model
+saved by ``python run_pipeline.py --mode full``. Every request goes through
+``InstrumentedPredictor``, so preprocessing and prediction latencies, batch
+sizes and errors show up on the metrics endpoint
+(``http://127.0.0.1:9108/metrics``, see utils/serving_metrics.py).
+"""
+
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+import joblib
+import pandas as pd
+import streamlit as st
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from config.config import Config
+from utils.serving_metrics import InstrumentedPredictor, start_metrics_server
+
+st.set_page_config(page_title="Predictions - Spaceship Titanic ML", page_icon="🤖", layout="wide")
+
+MODEL_PATH = Config.PRODUCTION_MODEL_DIR / 'final_model.pkl'
+PIPELINE_PATH = Config.PRODUCTION_MODEL_DIR / 'preprocessing_pipeline.pkl'
+CARD_PATH = Config.PRODUCTION_MODEL_DIR / 'model_card.json'
+
+
+@st.cache_resource
+def get_predictor(model_mtime):
+    """Cached per saved model; a new pipeline run invalidates it."""
+    model_bytes = MODEL_PATH.read_bytes()
+    card = json.loads(CARD_PATH.read_text()) if CARD_PATH.exists() else {}
+    # Model name plus checksum, so metrics of successive runs stay apart
+    version = f"{card.get('model_name', 'model')}_{hashlib.sha256(model_bytes).hexdigest()[:12]}"
+    model = joblib.load(MODEL_PATH)
+    pipeline = joblib.load(PIPELINE_PATH)
+    return InstrumentedPredictor(model, pipeline, version), card
+
+
+@st.cache_resource
+def get_metrics_server():
+    # Prometheus endpoint on SERVING_METRICS_PORT (default 9108); None if the
+    # port is taken by another app
+    try:
+        return start_metrics_server()
+    except OSError:
+        return None
+
+
+def main():
+    st.title("🤖 Predictions")
+
+    if not (MODEL_PATH.exists() and PIPELINE_PATH.exists()):
+        st.warning("No production model found. Run `python run_pipeline.py --mode full` first.")
+        return
+    predictor, card = get_predictor(MODEL_PATH.stat().st_mtime_ns)
+    get_metrics_server()
+
+    st.caption(f"Model version: `{predictor.version}`")
+    metrics = card.get('metrics', {})
+    if metrics:
+        cols = st.columns(3)
+        for col, key, label in zip(cols, ['accuracy', 'f1', 'roc_auc'], ['Accuracy', 'F1-Score', 'ROC-AUC']):
+            col.metric(f"Test {label}", f"{metrics[key]:.4f}" if key in metrics else "n/a")
+
+    uploaded = st.file_uploader("Passenger CSV (same columns as test.csv)", type="csv")
+    if uploaded is None:
+        return
+
+    passengers = pd.read_csv(uploaded)
+    try:
+        predictions = predictor.predict(passengers)
+    except Exception as e:
+        st.error(f"❌ Prediction Error: {e}")
+        return
+
+    results = pd.DataFrame({
+        'PassengerId': passengers['PassengerId'],
+        'Transported': pd.Series(predictions).astype(bool),
+    })
+    col1, col2 = st.columns(2)
+    col1.metric("Passengers", f"{len(results):,}")
+    col2.metric("Predicted transported", f"{results['Transported'].mean():.1%}")
+
+    st.dataframe(results.head(100), use_container_width=True, hide_index=True)
+    st.download_button("💾 Download submission CSV", results.to_csv(index=False),
+                       file_name="submission.csv", mime="text/csv")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+"""
+Incremental training and stacking modules for Spaceship Titanic ML Pipeline.
+"""
+
+from .incremental import (
+    get_incremental_models, ShuffleBuffer, train_incremental, train_incremental_models
+)
+from .stacking import OOFCache, StackedClassifier, cache_oof_scores, oof_scores, train_stacking
+
+__all__ = [
+    'get_incremental_models',
+    'ShuffleBuffer',
+    'train_incremental',
+    'train_incremental_models',
+    'OOFCache',
+    'StackedClassifier',
+    'cache_oof_scores',
+    'oof_scores',
+    'train_stacking'
+]
@@ -0,0 +1,238 @@
+"""
+Out-of-core incremental training for the Spaceship Titanic classifier.
+
+Streams processed chunks from the dataset container written by
+``run_preprocessing`` (see data/dataset_store.py) into estimators that
+support ``partial_fit``, so the training history never has to fit in memory.
+
+Each epoch visits the stored chunks in a seeded random order and passes them
+through a bounded shuffling buffer that emits random mini-batches. Model
+state, the epoch/chunk position and the buffer contents are checkpointed
+after every chunk, and an interrupted run resumes from the last checkpoint.
+Checkpoints are tied to the container's data fingerprint and chunk count and
+are removed once training finishes, so a rerun on re-preprocessed data starts
+from scratch.
+
+Usage:
+    python run_pipeline.py --mode training --incremental
+"""
+import logging
+from pathlib import Path
+
+import joblib
+import numpy as np
+from sklearn.linear_model import SGDClassifier
+from sklearn.naive_bayes import GaussianNB
+from sklearn.neural_network import MLPClassifier
+
+from config import Config
+from data.dataset_store import ProcessedDataset
+
+logger = logging.getLogger(__name__)
+
+
+def get_incremental_models(random_state=Config.RANDOM_STATE):
+    """
+    Candidate models that support ``partial_fit``.
+
+    Returns:
+        dict: Model name -> unfitted estimator
+    """
+    return {
+        'SGD_LogLoss': SGDClassifier(loss='log_loss', alpha=1e-4, random_state=random_state),
+        'SGD_ModifiedHuber': SGDClassifier(loss='modified_huber', alpha=1e-4,
+                                           random_state=random_state),
+        'GaussianNB': GaussianNB(),
+        'MLP': MLPClassifier(hidden_layer_sizes=(64, 32), learning_rate_init=1e-3,
+                             random_state=random_state),
+    }
+
+
+class ShuffleBuffer:
+    """
+    Bounded shuffling buffer between chunk reads and mini-batches.
+
+    Rows are accumulated until ``buffer_rows`` are held, then shuffled and
+    emitted as ``batch_size`` mini-batches; the remainder carries over. Memory
+    stays bounded by ``buffer_rows + chunk_rows``.
+
+    Args:
+        buffer_rows: Rows gathered before a shuffle
+        batch_size: Rows per emitted mini-batch
+    """
+
+    def __init__(self, buffer_rows=16384, batch_size=256):
+        self.buffer_rows = buffer_rows
+        self.batch_size = batch_size
+        self.X = None
+        self.y = None
+
+    def __len__(self):
+        return 0 if self.y is None else len(self.y)
+
+    def _emit(self, rng, flush):
+        order = rng.permutation(len(self))
+        n_full = len(order) if flush else len(order) - len(order) % self.batch_size
+        for start in range(0, n_full, self.batch_size):
+            idx = order[start:start + self.batch_size]
+            yield self.X[idx], self.y[idx]
+        rest = order[n_full:]
+        self.X, self.y = self.X[rest], self.y[rest]
+
+    def add(self, X, y, rng):
+        """Add a chunk; yield shuffled mini-batches once the buffer is full."""
+        self.X = X if self.X is None else np.concatenate([self.X, X])
+        self.y = y if self.y is None else np.concatenate([self.y, y])
+        if len(self) >= self.buffer_rows:
+            yield from self._emit(rng, flush=False)
+
+    def flush(self, rng):
+        """Yield everything left (end of epoch)."""
+        if len(self):
+            yield from self._emit(rng, flush=True)
+
+    def state(self):
+        return {'X': self.X, 'y': self.y}
+
+    def restore(self, state):
+        self.X, self.y = state['X'], state['y']
+
+
+def _checkpoint_path(checkpoint_dir, name):
+    return Path(checkpoint_dir) / f'{name}_incremental.pkl'
+
+
+def _save_checkpoint(path, state):
+    tmp_path = path.with_suffix('.tmp')
+    joblib.dump(state, tmp_path)
+    tmp_path.replace(path)
+
+
+def streaming_accuracy(model, dataset, split='val'):
+    """Accuracy of ``model`` on one split, predicted chunk by chunk."""
+    correct = total = 0
+    for X, y in dataset.iter_chunks(split):
+        correct += int((model.predict(X) == y).sum())
+        total += len(y)
+    return correct / total
+
+
+def train_incremental(name, model, dataset, classes, epochs=Config.INCREMENTAL_EPOCHS,
+                      buffer_rows=Config.SHUFFLE_BUFFER_ROWS, batch_size=Config.INCREMENTAL_BATCH_SIZE,
+                      checkpoint_dir=Config.CHECKPOINT_DIR, resume=True,
+                      random_state=Config.RANDOM_STATE):
+    """
+    Train one model with ``partial_fit`` over streamed training chunks.
+
+    Args:
+        name: Model name (used for the checkpoint file)
+        model: Estimator with ``partial_fit``
+        dataset: Open ``ProcessedDataset``
+        classes: All class labels (required by the first ``partial_fit``)
+        epochs: Passes over the training split
+        buffer_rows: Shuffling buffer size in rows
+        batch_size: Rows per ``partial_fit`` call
+        checkpoint_dir: Where checkpoints are written
+        resume: Continue from an existing checkpoint
+        random_state: Seed of the chunk order and buffer shuffles
+
+    Returns:
+        tuple: (fitted model, list of per-epoch validation accuracies)
+    """
+    checkpoint_dir = Path(checkpoint_dir)
+    checkpoint_dir.mkdir(parents=True, exist_ok=True)
+    path = _checkpoint_path(checkpoint_dir, name)
+
+    buffer = ShuffleBuffer(buffer_rows, batch_size)
+    n_chunks = dataset.n_chunks('train')
+    # Resuming is only valid on the exact same rows, chunking and chunk order, and
+    # for the same estimator configuration and buffer layout
+    run_key = {
+        'fingerprint': dataset.fingerprint, 'n_chunks': n_chunks, 'random_state': random_state,
+        'model': type(model).__name__, 'params': joblib.hash(model.get_params()),
+        'buffer_rows': buffer_rows, 'batch_size': batch_size,
+    }
+    epoch, chunks_done, history = 0, 0, []
+    if resume and path.exists():
+        state = joblib.load(path)
+        if state.get('run_key') != run_key:
+            logger.warning(f"⚠️ {name}: checkpoint was written for other data, chunking "
+                           f"or settings, restarting")
+        elif state['epoch'] >= epochs:
+            logger.warning(f"⚠️ {name}: checkpoint is from a finished run, restarting")
+        else:
+            model, epoch, chunks_done, history = (state['model'], state['epoch'],
+                                                  state['chunks_done'], state['history'])
+            buffer.restore(state['buffer'])
+            logger.info(f"♻️ {name}: resuming at epoch {epoch + 1}, chunk {chunks_done}")
+
+    while epoch < epochs:
+        # Same seed -> same chunk order, so a resumed epoch skips exactly what was done
+        order = np.random.default_rng([random_state, epoch]).permutation(n_chunks)
+        for position in range(chunks_done, n_chunks):
+            chunk = order[position]
+            rng = np.random.default_rng([random_state, epoch, chunk])
+            X, y = next(dataset.iter_chunks('train', order=[chunk]))
+            for X_batch, y_batch in buffer.add(X, y, rng):
+                model.partial_fit(X_batch, y_batch, classes=classes)
+            _save_checkpoint(path, {
+                'model': model, 'epoch': epoch, 'chunks_done': position + 1, 'history': history,
+                'buffer': buffer.state(), 'run_key': run_key,
+            })
+
+        for X_batch, y_batch in buffer.flush(np.random.default_rng([random_state, epoch, n_chunks])):
+            model.partial_fit(X_batch, y_batch, classes=classes)
+        history.append(streaming_accuracy(model, dataset, 'val'))
+        epoch, chunks_done = epoch + 1, 0
+        _save_checkpoint(path, {
+            'model': model, 'epoch': epoch, 'chunks_done': 0, 'history': history,
+            'buffer': buffer.state(), 'run_key': run_key,
+        })
+        logger.info(f"   {name} epoch {epoch}/{epochs}: val accuracy {history[-1]:.4f}")
+
+    # Finished: nothing left to resume
+    path.unlink(missing_ok=True)
+    return model, history
+
+
+def train_incremental_models(dataset_path=Config.PROCESSED_DATASET_PATH, models=None,
+                             track_mlflow=False, **kwargs):
+    """
+    Train every incremental candidate out of core and pick the best.
+
+    Args:
+        dataset_path: Container written by ``run_preprocessing``
+        models: dict name -> estimator (default: ``get_incremental_models()``)
+        track_mlflow: Log parameters and per-epoch accuracy to MLflow
+        **kwargs: Forwarded to ``train_incremental``
+
+    Returns:
+        tuple: (results dict, trained models dict, best name, best model)
+    """
+    models = models if models is not None else get_incremental_models()
+    results, trained = {}, {}
+
+    with ProcessedDataset(dataset_path) as dataset:
+        classes = np.unique(np.concatenate([y for _, y in dataset.iter_chunks('train', columns=[])]))
+        logger.info(f"📦 Streaming {dataset.n_rows('train'):,} training rows in "
+                    f"{dataset.n_chunks('train')} chunks from {dataset_path}")
+
+        for name, model in models.items():
+            logger.info(f"🔄 Training {name} incrementally...")
+            if track_mlflow:
+                import mlflow
+                from utils.mlflow_utils import setup_mlflow
+                setup_mlflow()
+                with mlflow.start_run(run_name=f'{name}_incremental'):
+                    mlflow.log_params({'model_type': name, 'incremental': True, **kwargs})
+                    model, history = train_incremental(name, model, dataset, classes, **kwargs)
+                    for step, accuracy in enumerate(history, start=1):
+                        mlflow.log_metric('val_accuracy', accuracy, step=step)
+            else:
+                model, history = train_incremental(name, model, dataset, classes, **kwargs)
+
+            trained[name] = model
+            results[name] = {'val_accuracy': history[-1], 'val_accuracy_history': history}
+
+    best_name = max(results, key=lambda name: results[name]['val_accuracy'])
+    return results, trained, best_name, trained[best_name]
@@ -0,0 +1,239 @@
+"""
+Stacking stage on top of the candidates from ``train_all_models``.
+
+``select_best_model`` keeps one candidate and drops the rest. Here the
+already-fitted candidates are combined instead: a meta-learner is trained on
+each candidate's out-of-fold (OOF) positive-class scores over the training
+split, then applied to the scores the fitted candidates give on the
+validation split. The fitted candidates are used as they are; no base model
+is refitted.
+
+OOF scores are the ``cross_val_predict`` output of the cross-validation in
+training: ``train_all_models`` passes it to ``cache_oof_scores`` (or returns
+it as ``results[name]['oof_predictions']``). They are kept in a compact array
+cache (one float32 ``.npy`` per candidate, keyed by the training data, the
+candidate's parameters and the CV settings). Only a candidate whose scores
+were never handed over is cross-validated here, with the same stratified
+``Config.CV_FOLDS`` split, and a warning is logged.
+
+Usage in models/train_model.py, after each candidate's cross-validation:
+    oof = cross_val_predict(model, X_train, y_train, cv=cv, method='predict_proba')
+    cache_oof_scores(name, model, X_train, y_train, oof)
+
+Usage:
+    python run_pipeline.py --mode training --stacking
+"""
+import logging
+from pathlib import Path
+
+import joblib
+import numpy as np
+from sklearn.base import clone
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, roc_auc_score
+from sklearn.model_selection import StratifiedKFold, cross_val_predict
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def get_meta_learner(random_state=Config.RANDOM_STATE):
+    """Default meta-learner: a lightly regularized logistic regression."""
+    return LogisticRegression(C=1.0, max_iter=1000, random_state=random_state)
+
+
+def _cv_splitter(cv_folds=Config.CV_FOLDS, random_state=Config.RANDOM_STATE):
+    return StratifiedKFold(n_splits=cv_folds, shuffle=True, random_state=random_state)
+
+
+def model_scores(model, X):
+    """Positive-class score of a fitted classifier (probability if available)."""
+    if hasattr(model, 'predict_proba'):
+        return model.predict_proba(X)[:, 1]
+    if hasattr(model, 'decision_function'):
+        return model.decision_function(X)
+    return model.predict(X).astype(float)
+
+
+def _oof_method(model):
+    if hasattr(model, 'predict_proba'):
+        return 'predict_proba'
+    if hasattr(model, 'decision_function'):
+        return 'decision_function'
+    return 'predict'
+
+
+class OOFCache:
+    """
+    Out-of-fold scores per candidate, one float32 array file each.
+
+    Args:
+        cache_dir: Directory of the ``.npy`` files
+    """
+
+    def __init__(self, cache_dir=Config.OOF_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+
+    @staticmethod
+    def key(name, model, X, y, cv_folds, random_state):
+        """Hash of everything the OOF scores depend on."""
+        return joblib.hash((name, type(model).__name__, model.get_params(),
+                            np.asarray(X), np.asarray(y), cv_folds, random_state))
+
+    def _path(self, name, key):
+        return self.cache_dir / f'{name}_{key[:16]}.npy'
+
+    def get(self, name, key):
+        path = self._path(name, key)
+        return np.load(path) if path.exists() else None
+
+    def put(self, name, key, scores):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(name, key)
+        tmp_path = path.with_suffix('.tmp.npy')
+        np.save(tmp_path, np.asarray(scores, dtype=np.float32))
+        tmp_path.replace(path)
+        return path
+
+
+def _positive_scores(scores):
+    scores = np.asarray(scores)
+    return scores[:, 1] if scores.ndim == 2 else scores
+
+
+def cache_oof_scores(name, model, X, y, scores, cache=None, cv_folds=Config.CV_FOLDS,
+                     random_state=Config.RANDOM_STATE):
+    """
+    Store out-of-fold predictions computed during training for the stacking stage.
+
+    Args:
+        name, model: Candidate name and estimator (fitted or not; only its parameters are hashed)
+        X, y: Training data the cross-validation ran on
+        scores: ``cross_val_predict`` output (probabilities, decision values or labels)
+
+    Returns:
+        Path: The cache file
+    """
+    cache = cache if cache is not None else OOFCache()
+    key = OOFCache.key(name, model, X, y, cv_folds, random_state)
+    return cache.put(name, key, _positive_scores(scores))
+
+
+def oof_scores(name, model, X, y, cache=None, cv_folds=Config.CV_FOLDS,
+               random_state=Config.RANDOM_STATE, n_jobs=Config.N_JOBS):
+    """
+    Out-of-fold positive-class scores of one candidate, from the cache if possible.
+
+    ``model`` is only cloned for the folds; the fitted instance is not touched.
+
+    Returns:
+        tuple: (scores array of len(y), whether it came from the cache)
+    """
+    cache = cache if cache is not None else OOFCache()
+    key = OOFCache.key(name, model, X, y, cv_folds, random_state)
+    cached = cache.get(name, key)
+    if cached is not None and len(cached) == len(y):
+        return cached, True
+
+    logger.warning(f"⚠️ {name}: no out-of-fold predictions from training, cross-validating clones")
+    method = _oof_method(model)
+    scores = _positive_scores(cross_val_predict(clone(model), X, y,
+                                                cv=_cv_splitter(cv_folds, random_state),
+                                                method=method, n_jobs=n_jobs))
+    cache.put(name, key, scores)
+    return scores.astype(np.float32), False
+
+
+class StackedClassifier:
+    """
+    Fitted candidates plus a meta-learner over their positive-class scores.
+
+    Args:
+        base_models: dict name -> fitted classifier
+        meta_model: Fitted meta-learner (on the candidates' scores, in ``base_models`` order)
+    """
+
+    def __init__(self, base_models, meta_model):
+        self.base_models = dict(base_models)
+        self.meta_model = meta_model
+
+    def meta_features(self, X):
+        return np.column_stack([model_scores(model, X) for model in self.base_models.values()])
+
+    def predict_proba(self, X):
+        return self.meta_model.predict_proba(self.meta_features(X))
+
+    def predict(self, X):
+        return self.meta_model.predict(self.meta_features(X))
+
+    def fit(self, X, y, cache=None):
+        """
+        Refit clones of every candidate on ``X`` and the meta-learner on their OOF
+        scores (final retrain). The candidate instances passed in are left untouched.
+        """
+        oof = np.column_stack([oof_scores(name, model, X, y, cache)[0]
+                               for name, model in self.base_models.items()])
+        self.base_models = {name: clone(model).fit(X, y) for name, model in self.base_models.items()}
+        self.meta_model = clone(self.meta_model).fit(oof, y)
+        return self
+
+
+def train_stacking(trained_models, results, X_train, y_train, X_val, y_val, meta_model=None,
+                   cache=None, oof_predictions=None, cv_folds=Config.CV_FOLDS,
+                   random_state=Config.RANDOM_STATE):
+    """
+    Stack the fitted candidates and compare with the single best one.
+
+    Args:
+        trained_models: dict name -> fitted model (from ``train_all_models``)
+        results: dict name -> metrics with 'val_accuracy' (from ``train_all_models``)
+        X_train, y_train: Data the candidates were fitted and cross-validated on
+        X_val, y_val: Validation split for the comparison
+        meta_model: Unfitted meta-learner (default: ``get_meta_learner()``)
+        cache: ``OOFCache`` (default: ``Config.OOF_CACHE_DIR``)
+        oof_predictions: dict name -> ``cross_val_predict`` output from training
+            (default: ``results[name]['oof_predictions']`` where present)
+
+    Returns:
+        tuple: (StackedClassifier, report dict)
+    """
+    cache = cache if cache is not None else OOFCache()
+    meta_model = meta_model if meta_model is not None else get_meta_learner(random_state)
+    y_train, y_val = np.asarray(y_train), np.asarray(y_val)
+    if oof_predictions is None:
+        oof_predictions = {name: result['oof_predictions'] for name, result in results.items()
+                           if 'oof_predictions' in result}
+    for name, scores in oof_predictions.items():
+        cache_oof_scores(name, trained_models[name], X_train, y_train, scores, cache,
+                         cv_folds, random_state)
+
+    columns, cache_hits = [], []
+    for name, model in trained_models.items():
+        scores, hit = oof_scores(name, model, X_train, y_train, cache, cv_folds, random_state)
+        columns.append(scores)
+        if hit:
+            cache_hits.append(name)
+        logger.info(f"   {name}: OOF scores {'from cache' if hit else 'computed'}")
+    meta_model.fit(np.column_stack(columns), y_train)
+
+    stacked = StackedClassifier(trained_models, meta_model)
+    val_proba = stacked.predict_proba(X_val)[:, 1]
+    val_pred = stacked.predict(X_val)
+
+    best_name = max(results, key=lambda name: results[name]['val_accuracy'])
+    best_accuracy = float(results[best_name]['val_accuracy'])
+    stacked_accuracy = float(accuracy_score(y_val, val_pred))
+    report = {
+        'stacked_val_accuracy': stacked_accuracy,
+        'stacked_val_roc_auc': float(roc_auc_score(y_val, val_proba)),
+        'best_model': best_name,
+        'best_val_accuracy': best_accuracy,
+        'improvement': stacked_accuracy - best_accuracy,
+        'stacking_wins': stacked_accuracy > best_accuracy,
+        'base_models': list(trained_models),
+        'oof_cache_hits': cache_hits,
+    }
+    if hasattr(meta_model, 'coef_'):
+        report['meta_weights'] = dict(zip(trained_models, np.ravel(meta_model.coef_).tolist()))
+    return stacked, report
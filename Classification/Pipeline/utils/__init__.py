@@ -5,5 +5,7 @@ Contains helper functions for MLflow, visualization, and metrics.
 """
 
 from .mlflow_utils import setup_mlflow
+from .experiment_index import ExperimentIndex
+from .serving_metrics import InstrumentedPredictor, start_metrics_server
 
-__all__ = ['setup_mlflow']
\ No newline at end of file
+__all__ = ['setup_mlflow', 'ExperimentIndex', 'InstrumentedPredictor', 'start_metrics_server']
\ No newline at end of file
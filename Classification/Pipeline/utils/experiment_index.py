@@ -0,0 +1,311 @@
+"""
+Incremental query index over local MLflow file stores.
+
+Walking an MLflow file store (what ``mlflow ui`` does) reads every run's
+meta.yaml, params, metrics and tags on each load. This module copies that
+information into a single SQLite file and, on later runs, only re-reads
+runs whose files changed since they were last indexed. Leaderboard queries
+then run against SQLite in milliseconds.
+
+Usage:
+    python utils/experiment_index.py index ../spaceship_experiments
+    python utils/experiment_index.py leaderboard --metric val_accuracy
+    python utils/experiment_index.py leaderboard --metric cv_accuracy_mean --top 3
+"""
+import argparse
+import logging
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    store TEXT NOT NULL,
+    experiment_id TEXT,
+    experiment_name TEXT,
+    run_name TEXT,
+    model_type TEXT,
+    status INTEGER,
+    lifecycle_stage TEXT,
+    start_time INTEGER,
+    end_time INTEGER,
+    signature TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS params (
+    run_id TEXT NOT NULL, key TEXT NOT NULL, value TEXT,
+    PRIMARY KEY (run_id, key)
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id TEXT NOT NULL, key TEXT NOT NULL, value REAL, step INTEGER, timestamp INTEGER,
+    PRIMARY KEY (run_id, key)
+);
+CREATE TABLE IF NOT EXISTS tags (
+    run_id TEXT NOT NULL, key TEXT NOT NULL, value TEXT,
+    PRIMARY KEY (run_id, key)
+);
+CREATE INDEX IF NOT EXISTS idx_metrics_key ON metrics (key, value);
+CREATE INDEX IF NOT EXISTS idx_runs_store ON runs (store);
+"""
+
+# Suffixes the training code appends to run names (e.g. "XGBoost_tuned")
+RUN_NAME_SUFFIXES = ('_tuned', '_baseline', '_final')
+
+
+def _read_meta(path):
+    """Parse a flat MLflow meta.yaml (``key: value`` lines) without PyYAML."""
+    meta = {}
+    with open(path) as f:
+        for line in f:
+            key, sep, value = line.partition(':')
+            if sep and not line.startswith((' ', '-')):
+                meta[key.strip()] = value.strip().strip("'\"")
+    return meta
+
+
+def _read_dir_files(directory):
+    """Return {relative name: file path} for every file under a params/tags/metrics dir."""
+    files = {}
+    if not directory.is_dir():
+        return files
+    for root, _, names in os.walk(directory):
+        for name in names:
+            path = Path(root) / name
+            files[path.relative_to(directory).as_posix()] = path
+    return files
+
+
+def _latest_metric(path):
+    """Return (value, step, timestamp) of the latest entry in an MLflow metric file."""
+    best = None
+    with open(path) as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) < 2:
+                continue
+            timestamp, value = int(parts[0]), float(parts[1])
+            step = int(parts[2]) if len(parts) > 2 else 0
+            # MLflow's "latest" value: highest step, then most recent timestamp
+            if best is None or (step, timestamp) >= (best[1], best[2]):
+                best = (value, step, timestamp)
+    return best
+
+
+def _run_signature(run_dir):
+    """
+    Cheap change detector for one run: stat calls only, no file reads.
+
+    Directory mtimes change when params/tags/metrics are added. File mtimes
+    change when metric values are appended and when a tag or param file is
+    overwritten in place (re-setting a tag leaves its directory mtime alone).
+    """
+    stamps = []
+    for sub in ('meta.yaml', 'params', 'tags', 'metrics'):
+        try:
+            stamps.append(os.stat(run_dir / sub).st_mtime_ns)
+        except FileNotFoundError:
+            stamps.append(0)
+    for sub in ('params', 'tags', 'metrics'):
+        # Keys with '/' are nested files, so walk the whole directory
+        stamps.append(max((os.stat(path).st_mtime_ns
+                           for path in _read_dir_files(run_dir / sub).values()), default=0))
+    return '-'.join(map(str, stamps))
+
+
+def model_type_from_run(run_name, tags):
+    """Group key for leaderboards: explicit ``model_type`` tag, else the run name minus suffix."""
+    if tags.get('model_type'):
+        return tags['model_type']
+    name = run_name or ''
+    for suffix in RUN_NAME_SUFFIXES:
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+class ExperimentIndex:
+    """
+    SQLite index of MLflow file-store runs.
+
+    Args:
+        db_path: Path of the SQLite file (created if missing)
+    """
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---------- indexing ----------
+    def _index_run(self, store, experiment, run_dir, signature):
+        meta = _read_meta(run_dir / 'meta.yaml')
+        run_id = meta.get('run_id', run_dir.name)
+
+        params = {key: path.read_text() for key, path in _read_dir_files(run_dir / 'params').items()}
+        tags = {key: path.read_text() for key, path in _read_dir_files(run_dir / 'tags').items()}
+        metrics = {}
+        for key, path in _read_dir_files(run_dir / 'metrics').items():
+            latest = _latest_metric(path)
+            if latest is not None:
+                metrics[key] = latest
+
+        run_name = meta.get('run_name') or tags.get('mlflow.runName')
+        for table in ('params', 'metrics', 'tags'):
+            self.conn.execute(f"DELETE FROM {table} WHERE run_id = ?", (run_id,))
+        self.conn.execute(
+            "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (run_id, store, experiment.get('experiment_id'), experiment.get('name'),
+             run_name, model_type_from_run(run_name, tags),
+             int(meta['status']) if meta.get('status', '').isdigit() else None,
+             meta.get('lifecycle_stage'),
+             int(meta['start_time']) if meta.get('start_time', '').isdigit() else None,
+             int(meta['end_time']) if meta.get('end_time', '').isdigit() else None,
+             signature),
+        )
+        self.conn.executemany("INSERT INTO params VALUES (?, ?, ?)",
+                              [(run_id, k, v) for k, v in params.items()])
+        self.conn.executemany("INSERT INTO tags VALUES (?, ?, ?)",
+                              [(run_id, k, v) for k, v in tags.items()])
+        self.conn.executemany("INSERT INTO metrics VALUES (?, ?, ?, ?, ?)",
+                              [(run_id, k, *v) for k, v in metrics.items()])
+        return run_id
+
+    def update(self, store_dir):
+        """
+        Bring the index up to date with one MLflow file store.
+
+        Only runs whose signature changed are re-read; runs that disappeared
+        from the store are removed from the index.
+
+        Returns:
+            dict: counts of 'indexed', 'unchanged' and 'removed' runs
+        """
+        store_dir = Path(store_dir).resolve()
+        store = str(store_dir)
+        known = dict(self.conn.execute(
+            "SELECT run_id, signature FROM runs WHERE store = ?", (store,)
+        ).fetchall())
+
+        seen, indexed = set(), 0
+        for experiment_dir in sorted(p for p in store_dir.iterdir() if p.is_dir()):
+            if not (experiment_dir / 'meta.yaml').exists():
+                continue  # e.g. .trash or models/
+            experiment = _read_meta(experiment_dir / 'meta.yaml')
+            for run_dir in experiment_dir.iterdir():
+                if not (run_dir / 'meta.yaml').is_file():
+                    continue
+                run_id = run_dir.name
+                seen.add(run_id)
+                signature = _run_signature(run_dir)
+                if known.get(run_id) == signature:
+                    continue
+                self._index_run(store, experiment, run_dir, signature)
+                indexed += 1
+
+        removed = [run_id for run_id in known if run_id not in seen]
+        for run_id in removed:
+            for table in ('runs', 'params', 'metrics', 'tags'):
+                self.conn.execute(f"DELETE FROM {table} WHERE run_id = ?", (run_id,))
+        self.conn.commit()
+        return {'indexed': indexed, 'unchanged': len(seen) - indexed, 'removed': len(removed)}
+
+    # ---------- queries ----------
+    def leaderboard(self, metric, group_by='model_type', mode='max', top=1, store=None):
+        """
+        Best runs per group for one metric.
+
+        Args:
+            metric: Metric key, e.g. 'val_accuracy'
+            group_by: Run column to group by ('model_type', 'experiment_name', ...)
+            mode: 'max' or 'min' — which direction is better
+            top: Runs kept per group
+            store: Restrict to one indexed store directory
+
+        Returns:
+            list of dict: one row per kept run, best groups first
+        """
+        if group_by not in ('model_type', 'experiment_name', 'run_name', 'store'):
+            raise ValueError(f"Unsupported group_by: {group_by}")
+        order = 'DESC' if mode == 'max' else 'ASC'
+        where, args = "m.key = ?", [metric]
+        if store is not None:
+            where += " AND r.store = ?"
+            args.append(str(Path(store).resolve()))
+        query = f"""
+            SELECT grp, run_id, run_name, experiment_name, value, start_time FROM (
+                SELECT r.{group_by} AS grp, r.run_id, r.run_name, r.experiment_name,
+                       m.value, r.start_time,
+                       ROW_NUMBER() OVER (PARTITION BY r.{group_by} ORDER BY m.value {order}) AS rank
+                FROM metrics m JOIN runs r ON r.run_id = m.run_id
+                WHERE {where} AND r.lifecycle_stage = 'active'
+            )
+            WHERE rank <= ?
+            ORDER BY value {order}
+        """
+        columns = ('group', 'run_id', 'run_name', 'experiment_name', 'value', 'start_time')
+        rows = self.conn.execute(query, (*args, top)).fetchall()
+        return [dict(zip(columns, row)) for row in rows]
+
+    def run_params(self, run_id):
+        """Return the params of one run as a dict."""
+        return dict(self.conn.execute(
+            "SELECT key, value FROM params WHERE run_id = ?", (run_id,)
+        ).fetchall())
+
+    def metric_keys(self):
+        """List every metric key present in the index."""
+        return [row[0] for row in self.conn.execute("SELECT DISTINCT key FROM metrics ORDER BY key")]
+
+
+def main():
+    # Allow "python utils/experiment_index.py" from the Pipeline folder
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from config import Config
+
+    parser = argparse.ArgumentParser(description="Index MLflow file stores and query leaderboards")
+    parser.add_argument('--db', default=str(Config.EXPERIMENT_INDEX_PATH), help='SQLite index path')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    index_parser = sub.add_parser('index', help='Incrementally index one or more stores')
+    index_parser.add_argument('stores', nargs='*', default=[str(Config.EXPERIMENT_DIR)])
+
+    board_parser = sub.add_parser('leaderboard', help='Best run per model type')
+    board_parser.add_argument('--metric', default='val_accuracy')
+    board_parser.add_argument('--group-by', default='model_type')
+    board_parser.add_argument('--mode', choices=['max', 'min'], default='max')
+    board_parser.add_argument('--top', type=int, default=1)
+    board_parser.add_argument('--store', default=None)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=Config.LOG_LEVEL, format='%(message)s')
+
+    with ExperimentIndex(args.db) as index:
+        start = time.perf_counter()
+        if args.command == 'index':
+            for store in args.stores:
+                counts = index.update(store)
+                logger.info(f"✅ {store}: {counts['indexed']} indexed, "
+                            f"{counts['unchanged']} unchanged, {counts['removed']} removed")
+        else:
+            rows = index.leaderboard(args.metric, args.group_by, args.mode, args.top, args.store)
+            logger.info(f"🏆 Best {args.metric} per {args.group_by}:")
+            for row in rows:
+                logger.info(f"   {row['group']:<28} {row['value']:.4f}  ({row['run_id'][:8]} {row['run_name']})")
+        logger.info(f"⏱️ {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
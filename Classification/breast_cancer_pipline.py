@@ -7,24 +7,28 @@ Includes:
 - Loading dataset
 - Train/test split
 - Standardization (Pipeline)
-- Logistic Regression with hyperparameter tuning (GridSearchCV)
-- Loss curve visualization
+- Logistic Regression with hyperparameter tuning (warm-started regularization path)
+- Loss curve visualization (recorded inside a single L-BFGS run)
 - ROC curve & AUC
-- Cross-validation evaluation
+- Cross-validation evaluation (reused from the search folds, no refits)
 - Evaluation (accuracy, classification report, confusion matrix)
-- Feature importance visualization
+- Feature importance visualization (model-agnostic permutation importance)
 """
 
 # --- 1️⃣ Imports ---
 import numpy as np
 import matplotlib.pyplot as plt
+from scipy.optimize import minimize
+from scipy.special import expit
 from sklearn.datasets import load_breast_cancer
-from sklearn.model_selection import train_test_split, GridSearchCV, StratifiedKFold, cross_val_score
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.base import clone
+from sklearn.model_selection import train_test_split, StratifiedKFold
 from sklearn.preprocessing import StandardScaler
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import (
     accuracy_score, classification_report, confusion_matrix,
-    roc_curve, roc_auc_score, log_loss
+    roc_curve, roc_auc_score
 )
 from sklearn.pipeline import Pipeline
 
@@ -47,42 +51,208 @@ def preprocess_data(X, y, test_size=0.3, random_state=42):
     return X_train, X_test, y_train, y_test
 
 # --- 4️⃣ Build pipeline + hyperparameter tuning ---
+def _fold_path(pipeline, X, y, train_idx, val_idx, Cs):
+    """
+    Score every C on one fold, strong to weak regularization.
+
+    The scaler is fitted once per fold and the scaled matrices are reused
+    along the whole path; each fit warm-starts from the previous C's
+    coefficients, so later fits need only a few L-BFGS iterations.
+
+    Returns:
+        tuple: (accuracy per C, [coef | intercept] per C,
+                out-of-fold P(y=1) per C, fitted fold scaler)
+    """
+    scaler = clone(pipeline.named_steps['scaler']).fit(X[train_idx])
+    X_tr, X_val = scaler.transform(X[train_idx]), scaler.transform(X[val_idx])
+    logreg = clone(pipeline.named_steps['logreg']).set_params(warm_start=True)
+    scores = np.empty(len(Cs))
+    params = np.empty((len(Cs), X.shape[1] + 1))
+    val_proba = np.empty((len(Cs), len(val_idx)))
+    for i, C in enumerate(Cs):
+        logreg.set_params(C=C).fit(X_tr, y[train_idx])
+        val_proba[i] = logreg.predict_proba(X_val)[:,1]
+        scores[i] = accuracy_score(y[val_idx], (val_proba[i] > 0.5).astype(int))
+        params[i, :-1], params[i, -1] = logreg.coef_[0], logreg.intercept_[0]
+    return scores, params, val_proba, scaler
+
+
+def _fitted_logreg(template, C, coef, intercept, n_iter=0):
+    """Build a ready-to-predict binary LogisticRegression from known coefficients."""
+    logreg = clone(template).set_params(C=C)
+    logreg.classes_ = np.array([0, 1])
+    logreg.coef_ = np.asarray(coef, dtype=float).reshape(1, -1)
+    logreg.intercept_ = np.atleast_1d(np.asarray(intercept, dtype=float))
+    logreg.n_features_in_ = logreg.coef_.shape[1]
+    logreg.n_iter_ = np.array([n_iter])
+    return logreg
+
+
+class LogisticPathSearchCV:
+    """
+    Cross-validated search over C along a warm-started regularization path.
+
+    Drop-in for ``GridSearchCV`` over ``logreg__C``: exposes ``best_params_``,
+    ``best_score_``, ``best_estimator_`` and a ``cv_results_`` dict. Each fold
+    fits its scaler once and walks the whole (dense) C grid, instead of
+    refitting the scaler and a cold-started model for every C and fold.
+
+    Args:
+        pipeline: Pipeline with 'scaler' and 'logreg' steps
+        Cs: C values to try (sorted ascending = strong to weak regularization)
+        cv: Number of stratified folds (same split as GridSearchCV(cv=int))
+        n_jobs: Folds evaluated in parallel
+    """
+
+    def __init__(self, pipeline, Cs=None, cv=5, n_jobs=None):
+        self.pipeline = pipeline
+        self.Cs = np.sort(np.logspace(-2, 1, 16) if Cs is None else np.asarray(Cs, dtype=float))
+        self.cv = cv
+        self.n_jobs = n_jobs
+
+    def fit(self, X, y):
+        X, y = np.asarray(X), np.asarray(y)
+        folds = list(StratifiedKFold(n_splits=self.cv).split(X, y))
+        fold_results = Parallel(n_jobs=self.n_jobs)(
+            delayed(_fold_path)(self.pipeline, X, y, train_idx, val_idx, self.Cs)
+            for train_idx, val_idx in folds
+        )
+        fold_scores = np.array([result[0] for result in fold_results])
+
+        mean_scores = fold_scores.mean(axis=0)
+        best = int(np.argmax(mean_scores))  # first best = strongest regularization on ties
+        self.cv_results_ = {
+            'param_logreg__C': self.Cs,
+            'mean_test_score': mean_scores,
+            'std_test_score': fold_scores.std(axis=0),
+            **{f'split{i}_test_score': fold_scores[i] for i in range(len(folds))},
+        }
+        self.best_index_ = best
+        # Warm-started lbfgs path: L2 penalty only
+        self.best_params_ = {'logreg__C': float(self.Cs[best]), 'logreg__penalty': 'l2'}
+        self.best_score_ = float(mean_scores[best])
+        self.best_estimator_ = clone(self.pipeline).set_params(logreg__C=self.Cs[best]).fit(X, y)
+
+        # Keep what the search already computed at the best C, so evaluation
+        # never has to refit: per-fold estimators and out-of-fold probabilities
+        template = self.pipeline.named_steps['logreg']
+        self.y_ = y
+        self.fold_indices_ = folds
+        self.fold_estimators_ = []
+        self.oof_proba_ = np.empty(len(y))
+        for (_, val_idx), (_, params, val_proba, scaler) in zip(folds, fold_results):
+            logreg = _fitted_logreg(template, self.Cs[best], params[best, :-1], params[best, -1])
+            self.fold_estimators_.append(Pipeline([('scaler', scaler), ('logreg', logreg)]))
+            self.oof_proba_[val_idx] = val_proba[best]
+        return self
+
+
 def train_model(X_train, y_train, cv_splits=5):
     pipeline = Pipeline([
         ('scaler', StandardScaler()),
         ('logreg', LogisticRegression(max_iter=1000, solver='lbfgs'))
     ])
 
-    param_grid = {
-        'logreg__C': [0.01, 0.1, 1, 10],
-        'logreg__penalty': ['l2']
-    }
-
-    grid = GridSearchCV(pipeline, param_grid, cv=cv_splits, scoring='accuracy')
+    grid = LogisticPathSearchCV(pipeline, Cs=np.logspace(-2, 1, 16), cv=cv_splits)
     grid.fit(X_train, y_train)
 
     print("\n✅ Best Hyperparameters:", grid.best_params_)
     print("✅ Best CV Accuracy: {:.2f}%".format(grid.best_score_ * 100))
 
-    # Track loss curve manually using log_loss
+    # Track loss curve inside one optimization run (no repeated refits)
     model = grid.best_estimator_
-    losses = []
-    max_iter = 200
-    logreg = LogisticRegression(
-        C=grid.best_params_['logreg__C'], max_iter=1, solver='lbfgs', warm_start=True
-    )
     X_scaled = model.named_steps['scaler'].transform(X_train)
-    y_train_arr = np.array(y_train)
-    for i in range(max_iter):
-        logreg.fit(X_scaled, y_train_arr)
-        y_prob = logreg.predict_proba(X_scaled)
-        losses.append(log_loss(y_train_arr, y_prob))
+    _, losses = fit_logistic_with_trajectory(
+        X_scaled, np.array(y_train), C=grid.best_params_['logreg__C'], max_iter=200
+    )
 
-    return model, losses
+    return model, losses, grid
+
+# --- 4️⃣b Single-run logistic regression with loss trajectory ---
+def fit_logistic_with_trajectory(X, y, C=1.0, max_iter=200, tol=1e-6, callback=None):
+    """
+    Fit an L2 logistic regression with L-BFGS and record the log loss per iteration.
+
+    Solves the same objective as ``LogisticRegression(solver='lbfgs')``
+    (mean log loss + ||w||^2 / (2 * C * n), intercept unpenalized) in one
+    optimization run. Loss and gradient come from a single vectorized pass,
+    and the loss at each accepted iterate is reused for the curve instead of
+    re-running ``predict_proba`` + ``log_loss``.
+
+    Args:
+        X: Feature matrix (already scaled)
+        y: Binary labels (0/1)
+        C: Inverse regularization strength
+        max_iter: Maximum L-BFGS iterations
+        tol: Gradient tolerance
+        callback: Optional ``callback(iteration, coef, intercept, loss)``
+
+    Returns:
+        tuple: (fitted LogisticRegression, list of training log losses)
+    """
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n_samples, n_features = X.shape
+    alpha = 1.0 / (C * n_samples)
+    last = {}
+
+    def objective(params):
+        w, b = params[:-1], params[-1]
+        z = X @ w + b
+        data_loss = np.mean(np.logaddexp(0, z) - y * z)
+        residual = (expit(z) - y) / n_samples
+        grad = np.empty_like(params)
+        grad[:-1] = X.T @ residual + alpha * w
+        grad[-1] = residual.sum()
+        last['params'], last['loss'] = params.copy(), data_loss
+        return data_loss + 0.5 * alpha * (w @ w), grad
+
+    losses = []
+
+    def record(params):
+        # L-BFGS almost always accepts the last point it evaluated
+        if not np.array_equal(params, last['params']):
+            objective(params)
+        losses.append(float(last['loss']))
+        if callback is not None:
+            callback(len(losses), params[:-1], params[-1], last['loss'])
+
+    result = minimize(objective, np.zeros(n_features + 1), jac=True, method='L-BFGS-B',
+                      callback=record, options={'maxiter': max_iter, 'gtol': tol})
+
+    logreg = _fitted_logreg(LogisticRegression(max_iter=max_iter, solver='lbfgs'),
+                            C, result.x[:-1], result.x[-1], n_iter=result.nit)
+    return logreg, losses
 
 # --- 5️⃣ Evaluate model ---
+def _draw_confusion_matrix(fig, ax, cm, target_names):
+    im = ax.imshow(cm, cmap='Blues')
+    ax.set_title('Confusion Matrix - Breast Cancer')
+    fig.colorbar(im, ax=ax)
+    tick_marks = np.arange(len(target_names))
+    ax.set_xticks(tick_marks, target_names)
+    ax.set_yticks(tick_marks, target_names)
+
+    thresh = cm.max() / 2
+    for i in range(cm.shape[0]):
+        for j in range(cm.shape[1]):
+            ax.text(j, i, format(cm[i,j],'d'),
+                    ha='center', va='center',
+                    color='white' if cm[i,j] > thresh else 'black',
+                    fontsize=14)
+    ax.set_ylabel('True Label')
+    ax.set_xlabel('Predicted Label')
+
+def _draw_roc_curve(fig, ax, fpr, tpr, auc_score):
+    ax.plot(fpr, tpr, color='blue', label=f'AUC = {auc_score:.2f}')
+    ax.plot([0,1],[0,1],'k--')
+    ax.set_xlabel("False Positive Rate")
+    ax.set_ylabel("True Positive Rate")
+    ax.set_title("ROC Curve - Breast Cancer")
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+
 def evaluate_model(model, X_test, y_test, bc):
-    X_scaled = model.named_steps['scaler'].transform(X_test)
     y_pred = model.predict(X_test)
     acc = accuracy_score(y_test, y_pred) * 100
     print(f"\n🎯 Test Accuracy: {acc:.2f}%")
@@ -92,23 +262,8 @@ def evaluate_model(model, X_test, y_test, bc):
     
     # Confusion matrix
     cm = confusion_matrix(y_test, y_pred)
-    plt.figure(figsize=(6,5))
-    plt.imshow(cm, cmap='Blues')
-    plt.title('Confusion Matrix - Breast Cancer')
-    plt.colorbar()
-    tick_marks = np.arange(len(bc.target_names))
-    plt.xticks(tick_marks, bc.target_names)
-    plt.yticks(tick_marks, bc.target_names)
-    
-    thresh = cm.max() / 2
-    for i in range(cm.shape[0]):
-        for j in range(cm.shape[1]):
-            plt.text(j, i, format(cm[i,j],'d'),
-                     ha='center', va='center',
-                     color='white' if cm[i,j] > thresh else 'black',
-                     fontsize=14)
-    plt.ylabel('True Label')
-    plt.xlabel('Predicted Label')
+    fig, ax = plt.subplots(figsize=(6,5))
+    _draw_confusion_matrix(fig, ax, cm, bc.target_names)
     plt.tight_layout()
     plt.show()
     
@@ -117,63 +272,263 @@ def evaluate_model(model, X_test, y_test, bc):
     fpr, tpr, _ = roc_curve(y_test, y_prob)
     auc_score = roc_auc_score(y_test, y_prob)
     
-    plt.figure(figsize=(7,5))
-    plt.plot(fpr, tpr, color='blue', label=f'AUC = {auc_score:.2f}')
-    plt.plot([0,1],[0,1],'k--')
-    plt.xlabel("False Positive Rate")
-    plt.ylabel("True Positive Rate")
-    plt.title("ROC Curve - Breast Cancer")
-    plt.legend()
-    plt.grid(True, alpha=0.3)
+    fig, ax = plt.subplots(figsize=(7,5))
+    _draw_roc_curve(fig, ax, fpr, tpr, auc_score)
     plt.tight_layout()
     plt.show()
     
     return y_pred
 
 # --- 6️⃣ Feature importance ---
-def plot_feature_importance(model, bc, top_n=10):
-    coef = model.named_steps['logreg'].coef_[0]
-    importance = np.abs(coef)
+def _permuted_scores(model, X, y, columns, n_repeats, random_state):
+    """
+    ROC-AUC of ``n_repeats`` shuffles of each column in ``columns``.
+
+    One ``(n_repeats * n_rows, n_features)`` buffer is allocated per call;
+    each column is overwritten with its shuffles, scored with a single
+    batched ``predict_proba`` and restored before the next column.
+    """
+    n_rows = len(X)
+    buffer = np.tile(X, (n_repeats, 1))
+    scores = np.empty((len(columns), n_repeats))
+    for k, j in enumerate(columns):
+        rng = np.random.default_rng([random_state, j])
+        for r in range(n_repeats):
+            buffer[r*n_rows:(r+1)*n_rows, j] = X[rng.permutation(n_rows), j]
+        proba = model.predict_proba(buffer)[:,1]
+        scores[k] = [roc_auc_score(y, proba[r*n_rows:(r+1)*n_rows]) for r in range(n_repeats)]
+        buffer[:, j] = np.tile(X[:, j], n_repeats)
+    return scores
+
+
+def permutation_importances(model, X, y, n_repeats=10, n_jobs=None, random_state=42):
+    """
+    Model-agnostic importance: drop in ROC-AUC when a feature is shuffled.
+
+    Columns are split into one block per worker and every block is scored
+    in its own process. Permutations are seeded per column, so the result
+    does not depend on ``n_jobs``.
+
+    Args:
+        model: Fitted classifier with ``predict_proba``
+        X, y: Held-out evaluation data
+        n_repeats: Shuffles per feature
+        n_jobs: Worker processes (None: 1, -1: all cores)
+        random_state: Seed of the permutations
+
+    Returns:
+        dict: baseline ROC-AUC and per-feature mean/std of the drop
+    """
+    X = np.ascontiguousarray(X, dtype=float)
+    y = np.asarray(y)
+    baseline = roc_auc_score(y, model.predict_proba(X)[:,1])
+    n_blocks = min(X.shape[1], effective_n_jobs(n_jobs))
+    blocks = np.array_split(np.arange(X.shape[1]), n_blocks)
+    scores = Parallel(n_jobs=n_jobs)(
+        delayed(_permuted_scores)(model, X, y, block, n_repeats, random_state)
+        for block in blocks
+    )
+    drops = baseline - np.vstack(scores)
+    return {
+        'baseline_roc_auc': float(baseline),
+        'n_repeats': n_repeats,
+        'importances_mean': drops.mean(axis=1),
+        'importances_std': drops.std(axis=1),
+    }
+
+def _draw_feature_importance(fig, ax, importance, std, feature_names):
+    importance, std = np.asarray(importance), np.asarray(std)
+    sorted_idx = np.argsort(importance)[::-1]
+    ax.barh(range(len(importance)), importance[sorted_idx], xerr=std[sorted_idx], color='steelblue')
+    ax.set_yticks(range(len(importance)), [feature_names[i] for i in sorted_idx])
+    ax.set_xlabel('Drop in ROC-AUC when shuffled (Importance)')
+    ax.set_title('📊 Permutation Feature Importance')
+    ax.grid(True, alpha=0.3, axis='x')
+    ax.invert_yaxis()
+
+def plot_feature_importance(model, bc, X_test, y_test, top_n=10, n_jobs=None):
+    result = permutation_importances(model, X_test, y_test, n_jobs=n_jobs)
+    importance = result['importances_mean']
     sorted_idx = np.argsort(importance)[::-1]
     
-    plt.figure(figsize=(12,6))
-    plt.barh(range(len(importance)), importance[sorted_idx], color='steelblue')
-    plt.yticks(range(len(importance)), [bc.feature_names[i] for i in sorted_idx])
-    plt.xlabel('Absolute Weight (Importance)')
-    plt.title('📊 Feature Importance - Logistic Regression')
-    plt.grid(True, alpha=0.3, axis='x')
-    plt.gca().invert_yaxis()
+    fig, ax = plt.subplots(figsize=(12,6))
+    _draw_feature_importance(fig, ax, importance, result['importances_std'], bc.feature_names)
     plt.tight_layout()
     plt.show()
     
-    print("Top 5 most important features:")
+    print(f"Top {top_n} most important features:")
     for i in range(top_n if top_n <= len(importance) else len(importance)):
         idx = sorted_idx[i]
-        print(f"{i+1}. {bc.feature_names[idx]}: weight = {coef[idx]:.4f}")
+        print(f"{i+1}. {bc.feature_names[idx]}: ROC-AUC drop = {importance[idx]:.4f} ± {result['importances_std'][idx]:.4f}")
+    return result
 
 # --- 7️⃣ Loss curve ---
+def _draw_loss_curve(fig, ax, losses):
+    ax.plot(range(len(losses)), losses, color='red')
+    ax.set_xlabel("Iterations")
+    ax.set_ylabel("Log Loss")
+    ax.set_title("📉 Logistic Loss Curve")
+    ax.grid(True, alpha=0.3)
+
 def plot_loss_curve(losses):
-    plt.figure(figsize=(7,5))
-    plt.plot(range(len(losses)), losses, color='red')
-    plt.xlabel("Iterations")
-    plt.ylabel("Log Loss")
-    plt.title("📉 Logistic Loss Curve")
-    plt.grid(True, alpha=0.3)
+    fig, ax = plt.subplots(figsize=(7,5))
+    _draw_loss_curve(fig, ax, losses)
     plt.tight_layout()
     plt.show()
 
 # --- 8️⃣ Cross-validation ---
-def cross_val_evaluation(model, X, y, cv_splits=5):
-    cv = StratifiedKFold(n_splits=cv_splits, shuffle=True, random_state=42)
-    scores = cross_val_score(model, X, y, cv=cv, scoring='accuracy')
-    print(f"\n📊 Cross-Validation Accuracy: {scores.mean()*100:.2f}% ± {scores.std()*100:.2f}%")
+def cv_metrics_from_search(search):
+    """
+    Derive CV statistics from a fitted ``LogisticPathSearchCV`` without refitting.
+
+    Uses the per-fold estimators and out-of-fold probabilities the search
+    cached at the best C.
+
+    Returns:
+        dict: fold accuracies, their mean/std, out-of-fold ROC/AUC and
+              the pooled out-of-fold confusion matrix
+    """
+    y = search.y_
+    oof_pred = (search.oof_proba_ > 0.5).astype(int)
+    fold_acc = np.array([accuracy_score(y[val_idx], oof_pred[val_idx])
+                         for _, val_idx in search.fold_indices_])
+    fpr, tpr, _ = roc_curve(y, search.oof_proba_)
+    return {
+        'fold_accuracy': fold_acc,
+        'accuracy_mean': fold_acc.mean(),
+        'accuracy_std': fold_acc.std(),
+        'oof_roc_auc': roc_auc_score(y, search.oof_proba_),
+        'oof_fpr': fpr,
+        'oof_tpr': tpr,
+        'oof_confusion_matrix': confusion_matrix(y, oof_pred),
+    }
+
+def cross_val_evaluation(search):
+    metrics = cv_metrics_from_search(search)
+    print(f"\n📊 Cross-Validation Accuracy: {metrics['accuracy_mean']*100:.2f}% ± {metrics['accuracy_std']*100:.2f}%")
+    print(f"📊 Out-of-fold ROC-AUC: {metrics['oof_roc_auc']:.4f}")
+    print(f"📊 Out-of-fold Confusion Matrix:\n{metrics['oof_confusion_matrix']}")
+    return metrics
+
+# --- 🔟 Headless report mode ---
+# figure name -> (draw function, figure size)
+REPORT_FIGURES = {
+    'confusion_matrix': (_draw_confusion_matrix, (6, 5)),
+    'roc_curve': (_draw_roc_curve, (7, 5)),
+    'feature_importance': (_draw_feature_importance, (12, 6)),
+    'loss_curve': (_draw_loss_curve, (7, 5)),
+}
+
+def _render_figure(name, args, path):
+    """
+    Render one report figure to PNG in a worker process.
+
+    Uses a bare ``Figure`` (Agg canvas) rather than pyplot, so no GUI
+    backend or global figure state is involved.
+    """
+    from matplotlib.figure import Figure
+    draw, figsize = REPORT_FIGURES[name]
+    fig = Figure(figsize=figsize)
+    ax = fig.subplots()
+    draw(fig, ax, *args)
+    fig.tight_layout()
+    fig.savefig(path, dpi=100)
+    return str(path)
+
+def _report_payload(model, X_test, y_test, bc, losses):
+    """Compute metrics and the small arrays each figure needs (parent process)."""
+    y_pred = model.predict(X_test)
+    y_prob = model.predict_proba(X_test)[:,1]
+    fpr, tpr, _ = roc_curve(y_test, y_prob)
+    auc_score = roc_auc_score(y_test, y_prob)
+    cm = confusion_matrix(y_test, y_pred)
+    metrics = {
+        'accuracy': float(accuracy_score(y_test, y_pred)),
+        'roc_auc': float(auc_score),
+        'confusion_matrix': cm.tolist(),
+        'classification_report': classification_report(
+            y_test, y_pred, target_names=bc.target_names, output_dict=True
+        ),
+        'final_train_log_loss': float(losses[-1]) if len(losses) else None,
+    }
+    importances = permutation_importances(model, X_test, y_test)
+    # Stored with the variant, so the charts can be redrawn without recomputing
+    metrics['permutation_importance'] = {
+        'baseline_roc_auc': importances['baseline_roc_auc'],
+        'n_repeats': importances['n_repeats'],
+        'features': list(bc.feature_names),
+        'importances_mean': importances['importances_mean'].tolist(),
+        'importances_std': importances['importances_std'].tolist(),
+    }
+    figures = {
+        'confusion_matrix': (cm, list(bc.target_names)),
+        'roc_curve': (fpr, tpr, auc_score),
+        'feature_importance': (importances['importances_mean'], importances['importances_std'],
+                               list(bc.feature_names)),
+        'loss_curve': (list(losses),),
+    }
+    return metrics, figures
+
+def generate_reports(variants, X_test, y_test, bc, output_dir='reports', n_workers=None):
+    """
+    Write PNG figures and a metrics JSON for each model variant, without plt.show().
+
+    All figures of all variants are rendered in one process pool, so a
+    nightly run over many variants is bounded by the slowest worker rather
+    than by serial plotting.
+
+    Args:
+        variants: dict {variant name: (fitted pipeline, loss curve)}
+        X_test, y_test: Held-out evaluation data
+        bc: Dataset bunch (for target and feature names)
+        output_dir: Root folder; each variant gets its own subfolder
+        n_workers: Worker processes (default: CPU count)
+
+    Returns:
+        dict: {variant name: metrics dict}
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from pathlib import Path
+    import json
+
+    output_dir = Path(output_dir)
+    all_metrics = {}
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        futures = []
+        for name, (model, losses) in variants.items():
+            variant_dir = output_dir / name
+            variant_dir.mkdir(parents=True, exist_ok=True)
+            metrics, figures = _report_payload(model, X_test, y_test, bc, losses)
+            for figure_name, args in figures.items():
+                futures.append(pool.submit(
+                    _render_figure, figure_name, args, variant_dir / f'{figure_name}.png'
+                ))
+            metrics['figures'] = [f'{figure_name}.png' for figure_name in figures]
+            with open(variant_dir / 'metrics.json', 'w') as f:
+                json.dump(metrics, f, indent=2)
+            all_metrics[name] = metrics
+        for future in futures:
+            future.result()
+
+    print(f"\n🗂️ Report written to {output_dir.resolve()} ({len(variants)} variant(s))")
+    return all_metrics
 
 # --- 9️⃣ Main execution ---
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Breast cancer classification pipeline")
+    parser.add_argument('--report', metavar='DIR',
+                        help='Write PNG figures + metrics.json to DIR instead of showing plots')
+    args = parser.parse_args()
+
     X, y, bc = load_data()
     X_train, X_test, y_train, y_test = preprocess_data(X, y)
-    model, losses = train_model(X_train, y_train)
-    y_pred = evaluate_model(model, X_test, y_test, bc)
-    plot_feature_importance(model, bc, top_n=5)
-    plot_loss_curve(losses)
-    cross_val_evaluation(model, X, y)
+    model, losses, search = train_model(X_train, y_train)
+    if args.report:
+        generate_reports({'logreg': (model, losses)}, X_test, y_test, bc, output_dir=args.report)
+    else:
+        y_pred = evaluate_model(model, X_test, y_test, bc)
+        plot_feature_importance(model, bc, X_test, y_test, top_n=5)
+        plot_loss_curve(losses)
+    cross_val_evaluation(search)
@@ -1,27 +1,134 @@
+import hashlib
 import joblib
 import numpy as np
+import pandas as pd
 import gradio as gr
 import os
+import tempfile
+from categorical_encoder import CategoricalEncoder
+from serving_metrics import InstrumentedPredictor, start_metrics_server
 
 MODEL_PATH = os.path.join('models', 'best_model.pkl')
+# Written by train_model.py; the insurance vocabularies are used if it is missing
+ENCODER_PATH = os.path.join('models', 'encoder.npz')
 
-if not os.path.exists(MODEL_PATH):
-    raise FileNotFoundError(f"Model not found at {MODEL_PATH}. Run train_model.py first to create it.")
+# Requests queued within one batch window are scored with a single predict call
+MAX_BATCH_SIZE = int(os.environ.get('MEDCOST_MAX_BATCH_SIZE', 64))
+# Batches (or CSV uploads) processed at the same time
+CONCURRENCY_LIMIT = int(os.environ.get('MEDCOST_CONCURRENCY_LIMIT', 4))
+
+# Column order used by train_model.py / train_and_select_models.py
+FEATURES = ['age', 'sex', 'bmi', 'children', 'smoker',
+            'region_northwest', 'region_southeast', 'region_southwest']
+
+_model = None
+_encoder = None
+_predictor = None
+
+
+def get_model():
+    # Loaded on first use, then shared by every request
+    global _model
+    if _model is None:
+        if not os.path.exists(MODEL_PATH):
+            raise FileNotFoundError(f"Model not found at {MODEL_PATH}. Run train_model.py first to create it.")
+        _model = joblib.load(MODEL_PATH)
+    return _model
+
+
+def get_encoder():
+    global _encoder
+    if _encoder is None:
+        if os.path.exists(ENCODER_PATH):
+            _encoder = CategoricalEncoder.load(ENCODER_PATH)
+        else:
+            _encoder = CategoricalEncoder.from_categories(
+                {'sex': ['female', 'male'], 'smoker': ['no', 'yes']})
+    return _encoder
+
+
+class FrameEncoder:
+    # The 'preprocess' stage of the served predictor
+    def transform(self, df):
+        return encode_frame(df)
+
+
+def get_predictor():
+    # Encoding + predict with per-stage latency, batch size and error metrics
+    global _predictor
+    if _predictor is None:
+        model = get_model()
+        with open(MODEL_PATH, 'rb') as f:
+            checksum = hashlib.sha256(f.read()).hexdigest()[:12]
+        _predictor = InstrumentedPredictor(model, FrameEncoder(), f'best_model_{checksum}')
+    return _predictor
+
+
+def _format(prediction):
+    return f"💰 التكلفة المتوقعة للتأمين الطبي: {prediction:.2f} دولار"
+
+
+def predict_medical_cost_batch(age, sex, bmi, children, smoker,
+                               region_northwest, region_southeast, region_southwest):
+    # Gradio batch mode: every argument is a list with one entry per queued request
+    X = pd.DataFrame({
+        'age': np.asarray(age, dtype=float),
+        'sex': np.asarray(sex, dtype=float).astype(int),
+        'bmi': np.asarray(bmi, dtype=float),
+        'children': np.asarray(children, dtype=float),
+        'smoker': np.asarray(smoker, dtype=float).astype(int),
+        'region_northwest': np.asarray(region_northwest, dtype=float),
+        'region_southeast': np.asarray(region_southeast, dtype=float),
+        'region_southwest': np.asarray(region_southwest, dtype=float),
+    }, columns=FEATURES)
+    predictions = get_predictor().predict(X)
+    return [[_format(p) for p in predictions]]
 
-model = joblib.load(MODEL_PATH)
 
 def predict_medical_cost(age, sex, bmi, children, smoker,
                          region_northwest, region_southeast, region_southwest):
-    # inputs come as strings from dropdowns for sex/smoker in this app, ensure ints
-    sex = int(sex)
-    smoker = int(smoker)
-    input_data = np.array([[age, sex, bmi, children, smoker,
-                            region_northwest, region_southeast, region_southwest]])
-    prediction = model.predict(input_data)[0]
-    return f"💰 التكلفة المتوقعة للتأمين الطبي: {prediction:.2f} دولار"
+    # Single-request helper (same inputs as the form)
+    return predict_medical_cost_batch([age], [sex], [bmi], [children], [smoker],
+                                      [region_northwest], [region_southeast], [region_southwest])[0][0]
+
+
+def encode_frame(df):
+    # Accept either the raw insurance columns (sex/smoker/region as text) or
+    # the already encoded FEATURES columns
+    df = df.copy()
+    text_cols = [c for c in ('sex', 'smoker')
+                 if c in df.columns and not pd.api.types.is_numeric_dtype(df[c])]
+    if text_cols:
+        # All text columns in one pass through the fitted encoder
+        lowered = df[text_cols].apply(lambda s: s.str.lower())
+        try:
+            df[text_cols] = get_encoder().encode(lowered, text_cols)
+        except ValueError as e:
+            raise gr.Error(str(e))
+    if 'region' in df.columns:
+        for region in ('northwest', 'southeast', 'southwest'):
+            df[f'region_{region}'] = (df['region'].str.lower() == region).astype(int)
+    missing = [c for c in FEATURES if c not in df.columns]
+    if missing:
+        raise gr.Error(f"Missing columns: {', '.join(missing)}")
+    X = df[FEATURES].apply(pd.to_numeric, errors='coerce')
+    bad = X.isna().any(axis=1)
+    if bad.any():
+        raise gr.Error(f"{int(bad.sum())} rows have missing or invalid values (first: row {int(np.argmax(bad))})")
+    return X
 
-app = gr.Interface(
-    fn=predict_medical_cost,
+
+def predict_csv(file):
+    # Score a whole uploaded CSV with one vectorized predict
+    df = pd.read_csv(file)
+    df['predicted_charges'] = np.round(get_predictor().predict(df), 2)
+    out_path = os.path.join(tempfile.mkdtemp(), 'predictions.csv')
+    df.to_csv(out_path, index=False)
+    return df.head(100), out_path
+
+
+single = gr.Interface(
+    fn=predict_medical_cost_batch,
     inputs=[
         gr.Number(label="Age", value=35),
         gr.Dropdown(choices=["0","1"], label="Sex (0: Female, 1: Male)", value="1"),
@@ -35,7 +142,29 @@ app = gr.Interface(
     outputs=gr.Textbox(label="Predicted Cost"),
     title="🏥 Medical Cost Prediction App",
     description="نموذج لتوقع تكلفة التأمين الطبي.",
+    batch=True,
+    max_batch_size=MAX_BATCH_SIZE,
+    api_name="predict",
+    concurrency_limit=CONCURRENCY_LIMIT,
 )
 
+batch_upload = gr.Interface(
+    fn=predict_csv,
+    inputs=gr.File(label="CSV (age, sex, bmi, children, smoker, region)", file_types=[".csv"]),
+    outputs=[gr.Dataframe(label="Predictions (first 100 rows)"),
+             gr.File(label="Download predictions")],
+    title="📄 Batch Prediction",
+    description="ارفع ملف CSV لتوقع التكلفة لكل الصفوف دفعة واحدة.",
+    api_name="predict_csv",
+    concurrency_limit=CONCURRENCY_LIMIT,
+)
+
+app = gr.TabbedInterface([single, batch_upload], ["Single prediction", "CSV upload"])
+
 if __name__ == '__main__':
-    app.launch()
+    try:
+        # Prometheus endpoint on SERVING_METRICS_PORT (default 9108)
+        start_metrics_server()
+    except OSError:
+        print("⚠️ Metrics port already in use; serving without /metrics")
+    app.queue(default_concurrency_limit=CONCURRENCY_LIMIT).launch()
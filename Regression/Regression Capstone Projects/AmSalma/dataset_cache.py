@@ -0,0 +1,154 @@
+# =========================================
+# Project: Medical Cost Personal Prediction
+# File: dataset_cache.py
+# Description: Local, checksummed cache for the insurance dataset. The CSV is
+# fetched once (or seeded from a local file), stored under its SHA-256 and
+# converted to typed Parquet; later loads read the Parquet file and never
+# touch the network.
+#
+# Usage:
+#   python dataset_cache.py seed path/to/insurance.csv   # air-gapped nodes
+#   python dataset_cache.py fetch                        # download once
+#   python dataset_cache.py info
+# =========================================
+import argparse
+import hashlib
+import json
+import os
+import time
+import urllib.request
+
+import pandas as pd
+
+INSURANCE_URL = ('https://raw.githubusercontent.com/stedy/Machine-Learning-with-R-datasets/'
+                 'master/insurance.csv')
+# Next to this file, so the scripts hit the cache from any working directory
+CACHE_DIR = os.environ.get('MEDCOST_CACHE_DIR',
+                           os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'cache'))
+# Set MEDCOST_OFFLINE=1 to fail fast instead of downloading on a cache miss
+OFFLINE = os.environ.get('MEDCOST_OFFLINE', '0') == '1'
+
+# Column types of the insurance CSV
+SCHEMA = {
+    'age': 'int64',
+    'sex': 'category',
+    'bmi': 'float64',
+    'children': 'int64',
+    'smoker': 'category',
+    'region': 'category',
+    'charges': 'float64',
+}
+
+
+class CacheMiss(RuntimeError):
+    pass
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _file_sha256(path):
+    with open(path, 'rb') as f:
+        return _sha256(f.read())
+
+
+def _index_path(cache_dir):
+    return os.path.join(cache_dir, 'index.json')
+
+
+def _read_index(cache_dir):
+    try:
+        with open(_index_path(cache_dir)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def _write_index(cache_dir, index):
+    tmp_path = _index_path(cache_dir) + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(index, f, indent=2)
+    os.replace(tmp_path, _index_path(cache_dir))
+
+
+def _store(source, raw, cache_dir, expected_sha256=None, schema=SCHEMA):
+    # Keep the raw bytes under their hash and write the typed Parquet copy
+    digest = _sha256(raw)
+    if expected_sha256 is not None and digest != expected_sha256:
+        raise ValueError(f"Checksum mismatch for {source}: got {digest}, expected {expected_sha256}")
+
+    os.makedirs(os.path.join(cache_dir, 'raw'), exist_ok=True)
+    raw_path = os.path.join(cache_dir, 'raw', f'{digest}.csv')
+    with open(raw_path, 'wb') as f:
+        f.write(raw)
+
+    df = pd.read_csv(raw_path, dtype=schema)
+    parquet_path = os.path.join(cache_dir, f'{digest}.parquet')
+    tmp_path = parquet_path + '.tmp'
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, parquet_path)
+
+    index = _read_index(cache_dir)
+    index[source] = {
+        'sha256': digest,
+        'parquet': os.path.basename(parquet_path),
+        'parquet_sha256': _file_sha256(parquet_path),
+        'rows': len(df),
+        'stored_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+    _write_index(cache_dir, index)
+    return df
+
+
+def seed_cache(local_path, source=INSURANCE_URL, cache_dir=CACHE_DIR, expected_sha256=None):
+    # Register a local copy of the CSV as the cached content of `source`
+    with open(local_path, 'rb') as f:
+        return _store(source, f.read(), cache_dir, expected_sha256)
+
+
+def load_dataset(source=INSURANCE_URL, cache_dir=CACHE_DIR, expected_sha256=None, offline=None):
+    offline = OFFLINE if offline is None else offline
+    entry = _read_index(cache_dir).get(source)
+    if entry is not None and (expected_sha256 is None or entry['sha256'] == expected_sha256):
+        parquet_path = os.path.join(cache_dir, entry['parquet'])
+        if os.path.exists(parquet_path) and _file_sha256(parquet_path) == entry['parquet_sha256']:
+            return pd.read_parquet(parquet_path)
+        print(f"Cached copy of {source} is missing or corrupted, rebuilding...")
+        raw_path = os.path.join(cache_dir, 'raw', f"{entry['sha256']}.csv")
+        if os.path.exists(raw_path) and _file_sha256(raw_path) == entry['sha256']:
+            return seed_cache(raw_path, source, cache_dir, entry['sha256'])
+
+    if offline:
+        raise CacheMiss(f"{source} is not cached. Seed it with: "
+                        f"python dataset_cache.py seed path/to/insurance.csv")
+    print(f"Downloading {source} into {cache_dir}...")
+    with urllib.request.urlopen(source, timeout=30) as response:
+        raw = response.read()
+    return _store(source, raw, cache_dir, expected_sha256)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Manage the local insurance dataset cache')
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    sub = parser.add_subparsers(dest='command', required=True)
+    seed = sub.add_parser('seed', help='Cache a local CSV file')
+    seed.add_argument('path')
+    seed.add_argument('--sha256', default=None, help='Expected checksum of the file')
+    sub.add_parser('fetch', help='Download the dataset once')
+    sub.add_parser('info', help='Show cached datasets')
+    args = parser.parse_args()
+
+    if args.command == 'seed':
+        df = seed_cache(args.path, cache_dir=args.cache_dir, expected_sha256=args.sha256)
+        print(f"Seeded {len(df)} rows into {args.cache_dir}")
+    elif args.command == 'fetch':
+        df = load_dataset(cache_dir=args.cache_dir, offline=False)
+        print(f"Cached {len(df)} rows in {args.cache_dir}")
+    else:
+        for source, entry in _read_index(args.cache_dir).items():
+            print(f"{source}\n  sha256={entry['sha256']} rows={entry['rows']} stored_at={entry['stored_at']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+# =========================================
+# Project: Medical Cost Personal Prediction
+# File: serving_metrics.py
+# Description: Copy of Regression/serving_metrics.py, so the Gradio app runs
+# from this folder alone.
+# =========================================
+"""
+Low-overhead serving metrics with a Prometheus-format endpoint.
+
+``InstrumentedPredictor`` wraps a preprocessor and a model and records, per
+model version, the latency of each stage (``preprocess``, ``predict`` and
+the ``total``), batch sizes, row counts and errors (counted once, under
+the stage that failed). Histograms use fixed buckets, so recording a
+request is a few bisects and counter increments under a lock. ``start_metrics_server`` serves everything at
+``http://127.0.0.1:<port>/metrics`` from a daemon thread, in the text
+format Prometheus scrapes.
+
+Usage:
+    predictor = InstrumentedPredictor(model, FrameEncoder(), version="best_model_3f2a9c1b7e40")
+    start_metrics_server(9108)
+    predictor.predict(X)
+
+    curl -s localhost:9108/metrics | grep stage_latency
+"""
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Seconds; covers sub-millisecond tree predictions up to slow cold starts
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+# Rows per request
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 4096)
+
+DEFAULT_PORT = int(os.environ.get("SERVING_METRICS_PORT", 9108))
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values)) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name, doc, labels=()):
+        self.name, self.doc, self.labels = name, doc, tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for label_values, value in items:
+            yield self.name, _format_labels(self.labels, label_values), value
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set (Prometheus semantics)."""
+
+    kind = "histogram"
+
+    def __init__(self, name, doc, buckets, labels=()):
+        self.name, self.doc, self.labels = name, doc, tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def samples(self):
+        with self._lock:
+            items = sorted((k, (list(v[0]), v[1], v[2])) for k, v in self._series.items())
+        for label_values, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else _format_value(float(bound))
+                yield (f"{self.name}_bucket",
+                       _format_labels(self.labels, label_values, ("le", le)), cumulative)
+            yield f"{self.name}_sum", _format_labels(self.labels, label_values), total
+            yield f"{self.name}_count", _format_labels(self.labels, label_values), count
+
+
+class ServingMetrics:
+    """
+    The metric families recorded by ``InstrumentedPredictor``.
+
+    Parameters:
+    -----------
+    namespace : str, default="serving"
+        Prefix of every metric name
+    """
+
+    def __init__(self, namespace="serving", latency_buckets=LATENCY_BUCKETS, batch_buckets=BATCH_BUCKETS):
+        self.stage_latency = Histogram(
+            f"{namespace}_stage_latency_seconds", "Latency of one inference stage",
+            latency_buckets, labels=("stage", "version"))
+        self.batch_rows = Histogram(
+            f"{namespace}_batch_rows", "Rows per prediction request",
+            batch_buckets, labels=("version",))
+        self.requests = Counter(
+            f"{namespace}_requests_total", "Prediction requests", labels=("version",))
+        self.rows = Counter(
+            f"{namespace}_rows_total", "Rows predicted", labels=("version",))
+        self.errors = Counter(
+            f"{namespace}_errors_total", "Failed inference stages",
+            labels=("stage", "version", "error"))
+        self._families = [self.stage_latency, self.batch_rows, self.requests, self.rows, self.errors]
+
+    @contextmanager
+    def time_stage(self, stage, version, count_errors=True):
+        """
+        Record the duration of the block, and an error if it raises.
+
+        An enclosing stage passes ``count_errors=False`` so a failure is only
+        counted once, under the innermost stage that raised.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            if count_errors:
+                self.errors.inc(stage, version, type(e).__name__)
+            raise
+        finally:
+            self.stage_latency.observe(time.perf_counter() - start, stage, version)
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        for family in self._families:
+            lines.append(f"# HELP {family.name} {family.doc}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            for name, labels, value in family.samples():
+                lines.append(f"{name}{labels} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# Shared by every predictor in the process unless one is passed explicitly
+METRICS = ServingMetrics()
+
+
+class InstrumentedPredictor:
+    """
+    ``preprocessor.transform`` followed by ``model.predict``, with metrics.
+
+    Parameters:
+    -----------
+    model : estimator
+        Fitted model
+    preprocessor : transformer or None
+        Fitted preprocessor; None feeds the input to the model directly
+    version : str
+        Model version label on every metric
+    metrics : ServingMetrics, optional
+        Where to record (default: the module-level ``METRICS``)
+    """
+
+    def __init__(self, model, preprocessor, version, metrics=None):
+        self.model = model
+        self.preprocessor = preprocessor
+        self.version = str(version)
+        self.metrics = metrics if metrics is not None else METRICS
+
+    def predict(self, X):
+        metrics, version = self.metrics, self.version
+        n_rows = len(X)
+        metrics.requests.inc(version)
+        metrics.batch_rows.observe(n_rows, version)
+        # Errors are counted by the inner stages only, once per failed request
+        with metrics.time_stage("total", version, count_errors=False):
+            if self.preprocessor is not None:
+                with metrics.time_stage("preprocess", version):
+                    X = self.preprocessor.transform(X)
+            with metrics.time_stage("predict", version):
+                predictions = self.model.predict(X)
+        metrics.rows.inc(version, amount=n_rows)
+        return predictions
+
+
+def _make_handler(metrics):
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = metrics.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass  # keep scrapes out of the app logs
+
+    return MetricsHandler
+
+
+_servers = {}
+_servers_lock = threading.Lock()
+
+
+def start_metrics_server(port=None, host="127.0.0.1", metrics=None):
+    """
+    Serve ``metrics`` on ``http://host:port/metrics`` from a daemon thread.
+
+    Calling it again for the same port returns the running server, so it
+    is safe from Streamlit reruns.
+
+    Returns:
+    --------
+    ThreadingHTTPServer : The running server
+    """
+    port = DEFAULT_PORT if port is None else port
+    metrics = metrics if metrics is not None else METRICS
+    with _servers_lock:
+        if port not in _servers:
+            server = ThreadingHTTPServer((host, port), _make_handler(metrics))
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, name=f"metrics-{port}", daemon=True).start()
+            _servers[port] = server
+        return _servers[port]
@@ -6,24 +6,24 @@
 # =========================================
 import os
 import pandas as pd
-import numpy as np
 import joblib
-from sklearn.model_selection import train_test_split, RandomizedSearchCV
+from dataset_cache import INSURANCE_URL, load_dataset
+from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler, OneHotEncoder
 from sklearn.pipeline import Pipeline
 from sklearn.compose import ColumnTransformer
-from sklearn.metrics import mean_squared_error, r2_score
 from sklearn.linear_model import LinearRegression
 from sklearn.tree import DecisionTreeRegressor
 from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
 from sklearn.svm import SVR
+from trial_scheduler import schedule_trials
 import warnings
 warnings.filterwarnings('ignore')
 
 def load_data():
-    url = ('https://raw.githubusercontent.com/stedy/Machine-Learning-with-R-datasets/master/insurance.csv')
-    df = pd.read_csv(url)
-    return df
+    # Served from the local Parquet cache; downloads only on the first run
+    # (see dataset_cache.py for seeding air-gapped machines)
+    return load_dataset(INSURANCE_URL)
 
 def preprocess_split(df):
     # Basic preprocessing: encode categorical features, split
@@ -88,30 +88,17 @@ def get_param_distributions():
     return param_distributions
 
 def evaluate_models(X_train, X_test, y_train, y_test, pipelines, param_dists):
-    results = {}
-    for name, pipe in pipelines.items():
-        print(f"\nTraining and tuning: {name}")
-        params = param_dists.get(name, {})
-        if params:
-            search = RandomizedSearchCV(pipe, param_distributions=params, n_iter=6, cv=3, scoring='r2', random_state=42, n_jobs=-1)
-            search.fit(X_train, y_train)
-            best = search.best_estimator_
-            best_params = search.best_params_
-        else:
-            pipe.fit(X_train, y_train)
-            best = pipe
-            best_params = {}
-        preds = best.predict(X_test)
-        rmse = np.sqrt(mean_squared_error(y_test, preds))
-        r2 = r2_score(y_test, preds)
-        results[name] = {
-            'model': best,
-            'rmse': rmse,
-            'r2': r2,
-            'best_params': best_params
-        }
-        print(f"{name} -> RMSE: {rmse:.2f}, R2: {r2:.3f}")
-    return results
+    # All models' (candidate, fold) trials share one worker pool; each model is
+    # reported as soon as its search and refit are done (see trial_scheduler.py)
+    print(f"\nTuning {len(pipelines)} models on a shared worker pool...")
+    print(f"{'Model':<18} {'CV R2':>8} {'Test RMSE':>11} {'Test R2':>8}")
+
+    def report(name, result):
+        cv_r2 = f"{result['cv_r2']:.3f}" if result['cv_r2'] is not None else '-'
+        print(f"{name:<18} {cv_r2:>8} {result['rmse']:>11.2f} {result['r2']:>8.3f}")
+
+    return schedule_trials(X_train, X_test, y_train, y_test, pipelines, param_dists,
+                           n_iter=6, cv=3, random_state=42, n_jobs=-1, on_result=report)
 
 def select_and_save_best(results, output_path='models/best_model.pkl'):
     # select by highest R2, then lowest RMSE as tiebreaker
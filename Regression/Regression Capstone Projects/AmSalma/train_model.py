@@ -6,27 +6,28 @@ import os
 import pandas as pd
 import numpy as np
 import joblib
+from categorical_encoder import CategoricalEncoder
+from dataset_cache import INSURANCE_URL, load_dataset
 from sklearn.model_selection import train_test_split, RandomizedSearchCV
-from sklearn.preprocessing import LabelEncoder
 from sklearn.metrics import mean_squared_error, r2_score
 from sklearn.ensemble import RandomForestRegressor
 
 def load_data():
-    url = ("https://raw.githubusercontent.com/stedy/Machine-Learning-with-R-datasets/"
-           "master/insurance.csv")
-    df = pd.read_csv(url)
-    return df
-
-def preprocess(df):
-    df = df.copy()
-    df['sex'] = LabelEncoder().fit_transform(df['sex'])
-    df['smoker'] = LabelEncoder().fit_transform(df['smoker'])
+    # Served from the local Parquet cache; downloads only on the first run
+    # (see dataset_cache.py for seeding air-gapped machines)
+    return load_dataset(INSURANCE_URL)
+
+def preprocess(df, encoder=None):
+    # sex/smoker get the same codes as LabelEncoder, from one fitted encoder
+    if encoder is None:
+        encoder = CategoricalEncoder().fit(df, columns=['sex', 'smoker'])
+    df = encoder.transform(df)
     df = pd.get_dummies(df, columns=['region'], drop_first=True)
-    return df
+    return df, encoder
 
 def train_and_save_model(output_path='models/best_model.pkl'):
     df = load_data()
-    df = preprocess(df)
+    df, encoder = preprocess(df)
     X = df.drop('charges', axis=1)
     y = df['charges']
 
@@ -50,10 +51,13 @@ def train_and_save_model(output_path='models/best_model.pkl'):
 
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
     joblib.dump(best_model, output_path)
+    encoder_path = os.path.join(os.path.dirname(output_path), 'encoder.npz')
+    encoder.save(encoder_path)
 
     print(f"Best params: {search.best_params_}")
     print(f"RMSE: {rmse:.2f}, R2: {r2:.2f}")
     print(f"Saved model to: {output_path}")
+    print(f"Saved encoder to: {encoder_path}")
 
 if __name__ == '__main__':
     train_and_save_model()
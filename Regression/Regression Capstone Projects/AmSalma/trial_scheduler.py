@@ -0,0 +1,155 @@
+# =========================================
+# Project: Medical Cost Personal Prediction
+# File: trial_scheduler.py
+# Description: Runs the hyperparameter searches of every model as one queue of
+# (candidate, fold) trials over a shared process pool, reusing the
+# preprocessed fold matrices, and reports each model as soon as it finishes.
+# =========================================
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import joblib
+import numpy as np
+from sklearn.base import clone
+from sklearn.metrics import mean_squared_error, r2_score
+from sklearn.model_selection import KFold, ParameterSampler
+from sklearn.pipeline import Pipeline
+
+# Preprocessed matrices, set once per worker process by _init_worker
+_MATRICES = {}
+
+
+def _init_worker(matrices):
+    global _MATRICES
+    _MATRICES = matrices
+
+
+def _run_trial(estimator, params, key):
+    # Fit one candidate on one cached fold (or on the full training set)
+    X_fit, y_fit, X_eval, y_eval = _MATRICES[key]
+    if key[1] == 'full':
+        return clone(estimator).set_params(**params).fit(X_fit, y_fit)
+    try:
+        model = clone(estimator).set_params(**params).fit(X_fit, y_fit)
+        return r2_score(y_eval, model.predict(X_eval))
+    except Exception as e:
+        # Like RandomizedSearchCV(error_score=np.nan): score the fold as NaN and go on
+        warnings.warn(f"Trial {params} on fold {key[1]} failed: {type(e).__name__}: {e}")
+        return np.nan
+
+
+def _model_params(params):
+    # 'model__max_depth' -> 'max_depth' (the searches only tune the model step)
+    return {k.split('__', 1)[1]: v for k, v in params.items()}
+
+
+def _trial_cost(estimator, params):
+    # Rough cost estimate so the longest trials start first
+    n_estimators = params.get('model__n_estimators', getattr(estimator, 'n_estimators', 1))
+    return n_estimators if isinstance(n_estimators, (int, np.integer)) else 1
+
+
+def prepare_matrices(pipelines, X_train, y_train, X_test, y_test, cv=3):
+    # Fit each distinct preprocessor once per fold and once on the full training set
+    y_train = np.asarray(y_train)
+    folds = list(KFold(n_splits=cv).split(X_train))
+    matrices, pre_keys = {}, {}
+    for name, pipe in pipelines.items():
+        pre = pipe.named_steps['pre']
+        pre_key = joblib.hash(pre)
+        pre_keys[name] = pre_key
+        if (pre_key, 'full') in matrices:
+            continue
+        for i, (train_idx, val_idx) in enumerate(folds):
+            fitted = clone(pre).fit(X_train.iloc[train_idx])
+            matrices[(pre_key, i)] = (fitted.transform(X_train.iloc[train_idx]), y_train[train_idx],
+                                      fitted.transform(X_train.iloc[val_idx]), y_train[val_idx])
+        fitted = clone(pre).fit(X_train)
+        matrices[(pre_key, 'full')] = (fitted.transform(X_train), y_train,
+                                       fitted.transform(X_test), np.asarray(y_test))
+        matrices[(pre_key, 'pre')] = fitted
+    return matrices, pre_keys, len(folds)
+
+
+def schedule_trials(X_train, X_test, y_train, y_test, pipelines, param_dists,
+                    n_iter=6, cv=3, random_state=42, n_jobs=-1, on_result=None):
+    # Same candidates and folds as RandomizedSearchCV(n_iter, cv, random_state)
+    for name, pipe in pipelines.items():
+        if any(not key.startswith('model__') for key in param_dists.get(name, {})):
+            raise ValueError(f"{name}: only 'model__' parameters can share cached preprocessing")
+
+    matrices, pre_keys, n_folds = prepare_matrices(pipelines, X_train, y_train, X_test, y_test, cv)
+    fitted_pre = {key: matrices.pop((key, 'pre')) for key in set(pre_keys.values())}
+
+    candidates = {}
+    for name in pipelines:
+        params = param_dists.get(name, {})
+        candidates[name] = list(ParameterSampler(params, n_iter=n_iter, random_state=random_state)) \
+            if params else []
+
+    scores = {name: np.full((len(c), n_folds), np.nan) for name, c in candidates.items()}
+    remaining = {name: len(c) * n_folds for name, c in candidates.items()}
+    results = {}
+
+    n_workers = os.cpu_count() if n_jobs in (None, -1) else n_jobs
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                             initargs=(matrices,)) as pool:
+        pending = {}
+
+        def submit_refit(name, best_params):
+            estimator = pipelines[name].named_steps['model']
+            future = pool.submit(_run_trial, estimator, _model_params(best_params),
+                                 (pre_keys[name], 'full'))
+            pending[future] = (name, 'refit', best_params)
+
+        # Longest trials first, so short searches fill the gaps at the end
+        trials = [(name, i, fold, params)
+                  for name, cands in candidates.items()
+                  for i, params in enumerate(cands)
+                  for fold in range(n_folds)]
+        trials.sort(key=lambda t: -_trial_cost(pipelines[t[0]].named_steps['model'], t[3]))
+        for name, i, fold, params in trials:
+            future = pool.submit(_run_trial, pipelines[name].named_steps['model'],
+                                 _model_params(params), (pre_keys[name], fold))
+            pending[future] = (name, (i, fold), None)
+        # Models without a search are just fitted once
+        for name, cands in candidates.items():
+            if not cands:
+                submit_refit(name, {})
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, task, best_params = pending.pop(future)
+                if task != 'refit':
+                    i, fold = task
+                    scores[name][i, fold] = future.result()
+                    remaining[name] -= 1
+                    if remaining[name] == 0:
+                        mean_scores = scores[name].mean(axis=1)  # NaN if any fold failed
+                        if np.isnan(mean_scores).all():
+                            warnings.warn(f"{name}: every candidate failed, refitting default parameters")
+                            submit_refit(name, {})
+                        else:
+                            # Ties go to the first candidate, as in RandomizedSearchCV
+                            best = int(np.nanargmax(mean_scores))
+                            submit_refit(name, candidates[name][best])
+                    continue
+
+                model = future.result()
+                X_test_proc, y_true = matrices[(pre_keys[name], 'full')][2:]
+                preds = model.predict(X_test_proc)
+                results[name] = {
+                    'model': Pipeline([('pre', fitted_pre[pre_keys[name]]), ('model', model)]),
+                    'rmse': np.sqrt(mean_squared_error(y_true, preds)),
+                    'r2': r2_score(y_true, preds),
+                    'best_params': best_params,
+                    # No search, or every candidate failed and defaults were refitted
+                    'cv_r2': float(np.nanmax(scores[name].mean(axis=1))) if best_params else None,
+                }
+                if on_result is not None:
+                    on_result(name, results[name])
+
+    # Report in the original model order
+    return {name: results[name] for name in pipelines}
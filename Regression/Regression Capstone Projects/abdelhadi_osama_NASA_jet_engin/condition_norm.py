@@ -0,0 +1,142 @@
+# ===========================
+# 📦 condition_norm.py — Operating-condition normalization
+# ===========================
+"""
+Operating-condition normalization for the six-condition FD002/FD004 subsets.
+
+Sensor readings in FD002/FD004 jump between six flight regimes set by the
+three operational settings, so one global scaler mixes regimes together.
+``ConditionNormalizer`` clusters the settings into conditions and
+standardizes every sensor with the mean/std of its row's condition.
+
+Per-condition statistics live in two (n_conditions, n_features) arrays,
+and transform is a nearest-centroid lookup plus one vectorized gather, so
+a single streamed cycle costs the same per row as a whole file.
+
+Usage:
+    from cmapss_loader import load_subset
+    from condition_norm import ConditionNormalizer
+
+    fd002 = load_subset("FD002")
+    norm = ConditionNormalizer(n_conditions=6).fit(fd002.train)
+    X_train = norm.transform(fd002.train)
+    x_row = norm.transform_one(settings_row, sensors_row)   # streaming
+"""
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.cluster import KMeans
+
+from cmapss_loader import SETTING_NAMES, SENSOR_NAMES, VALUE_NAMES
+
+
+class ConditionNormalizer(BaseEstimator, TransformerMixin):
+    """
+    Standardize sensors per operating condition.
+
+    Parameters:
+    -----------
+    n_conditions : int, default=6
+        Number of operating conditions (6 for FD002/FD004, 1 for FD001/FD003)
+    features : list of str, optional
+        Sensor columns to normalize (default: all 21 sensors)
+    random_state : int, default=42
+        Seed for the k-means clustering of the settings
+    """
+
+    def __init__(self, n_conditions=6, features=None, random_state=42):
+        self.n_conditions = n_conditions
+        self.features = features
+        self.random_state = random_state
+
+    # ---------- input handling ----------
+    def _feature_names(self):
+        return list(self.features) if self.features is not None else list(SENSOR_NAMES)
+
+    def _split(self, X):
+        """
+        Return (settings, sensors) float32 arrays from a TurbofanFrame,
+        a DataFrame with the notebook's column names, or an array laid out
+        in ``VALUE_NAMES`` order (3 settings followed by 21 sensors).
+        """
+        features = self._feature_names()
+        if isinstance(X, pd.DataFrame):
+            return (X[SETTING_NAMES].to_numpy(np.float32),
+                    X[features].to_numpy(np.float32))
+        values = X.values if hasattr(X, 'values') and not isinstance(X, np.ndarray) else X
+        values = np.asarray(values, dtype=np.float32)
+        col_idx = [VALUE_NAMES.index(name) for name in features]
+        return values[:, :len(SETTING_NAMES)], values[:, col_idx]
+
+    # ---------- fit ----------
+    def fit(self, X, y=None):
+        """
+        Cluster the operational settings and store per-condition statistics.
+
+        Settings are scaled to unit variance before clustering, since
+        altitude, Mach number and throttle angle have very different ranges.
+        """
+        settings, sensors = self._split(X)
+
+        self.setting_scale_ = settings.std(axis=0)
+        self.setting_scale_[self.setting_scale_ == 0] = 1.0
+
+        kmeans = KMeans(n_clusters=self.n_conditions, n_init=10, random_state=self.random_state)
+        conditions = kmeans.fit_predict(settings / self.setting_scale_)
+        self.centers_ = kmeans.cluster_centers_.astype(np.float32)
+
+        # Per-condition mean/std with a one-hot matrix product instead of a groupby
+        one_hot = (conditions[None, :] == np.arange(self.n_conditions)[:, None]).astype(np.float64)
+        sensors64 = sensors.astype(np.float64)
+        counts = one_hot.sum(axis=1)
+        means = (one_hot @ sensors64) / counts[:, None]
+        sq_sums = one_hot @ sensors64 ** 2
+        stds = np.sqrt(np.maximum(sq_sums / counts[:, None] - means ** 2, 0.0))
+        # Sensors that are constant within a condition carry no signal there
+        stds[stds < 1e-8] = 1.0
+
+        self.means_ = means.astype(np.float32)
+        self.stds_ = stds.astype(np.float32)
+        self.condition_counts_ = counts.astype(np.int64)
+        self.feature_names_out_ = self._feature_names()
+        return self
+
+    # ---------- transform ----------
+    def predict_condition(self, settings):
+        """Assign each row of ``settings`` (n, 3) to its nearest condition."""
+        scaled = np.atleast_2d(settings) / self.setting_scale_
+        distances = ((scaled[:, None, :] - self.centers_[None, :, :]) ** 2).sum(axis=2)
+        return distances.argmin(axis=1)
+
+    def _normalize(self, settings, sensors):
+        conditions = self.predict_condition(settings)
+        return (sensors - self.means_[conditions]) / self.stds_[conditions]
+
+    def transform(self, X):
+        """Return normalized sensors, shape (n_rows, n_features), float32."""
+        if not hasattr(self, 'means_'):
+            raise ValueError("Transformer must be fitted before transform()")
+        settings, sensors = self._split(X)
+        return self._normalize(settings, sensors)
+
+    def transform_one(self, settings, sensors):
+        """
+        Normalize a single streamed cycle.
+
+        Parameters:
+        -----------
+        settings : array-like, shape (3,)
+            Operational settings of the cycle
+        sensors : array-like, shape (n_features,)
+            Sensor readings in ``features`` order
+
+        Returns:
+        --------
+        np.ndarray : Normalized sensors, shape (n_features,)
+        """
+        settings = np.asarray(settings, dtype=np.float32)
+        sensors = np.asarray(sensors, dtype=np.float32)
+        return self._normalize(settings[None, :], sensors[None, :])[0]
+
+    def get_feature_names_out(self, input_features=None):
+        return np.asarray(self.feature_names_out_, dtype=object)
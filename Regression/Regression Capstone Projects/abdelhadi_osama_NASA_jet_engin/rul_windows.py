@@ -0,0 +1,184 @@
+# ===========================
+# 📦 rul_windows.py — Sliding-window datasets for RUL sequence models
+# ===========================
+"""
+Zero-copy sliding-window dataset builder for RUL sequence models.
+
+Rows are grouped by engine once, and every fixed-length window is a
+read-only strided view into a single (rows, features) buffer, so memory
+scales with the raw data rather than with ``window * n_windows``. Only the
+mini-batches handed to a model are materialised.
+
+Usage:
+    from cmapss_loader import load_subset
+    from rul_windows import RULWindowDataset
+
+    fd001 = load_subset("FD001")
+    train = RULWindowDataset(fd001.train, window=30, features=SENSOR_COLS_VARYING)
+    for X_batch, y_batch in train.batches(256, shuffle=True):
+        ...
+    test = RULWindowDataset(fd001.test, window=30, features=SENSOR_COLS_VARYING,
+                            final_rul=fd001.rul)
+    X_last, y_last = test.last_windows()   # one (padded) window per engine
+"""
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+from cmapss_loader import VALUE_NAMES
+
+# Piecewise-linear target: RUL is flat at the cap early in life, then decays
+RUL_CAP = 125
+
+
+class RULWindowDataset:
+    """
+    Fixed-length windows over per-engine trajectories.
+
+    Parameters:
+    -----------
+    frame : TurbofanFrame
+        Parsed split from ``cmapss_loader`` (unit, cycle, values)
+    window : int, default=30
+        Window length in cycles
+    features : list of str, optional
+        Setting/sensor columns to keep (default: all 24)
+    rul_cap : int or None, default=RUL_CAP
+        Upper bound of the piecewise-linear RUL label (None = linear RUL)
+    final_rul : array-like, optional
+        True RUL at the last cycle of each unit (test split). Training
+        trajectories run to failure, so it defaults to zero.
+    pad_value : float, optional
+        Value used to left-pad trajectories shorter than ``window``.
+        Default repeats the unit's first cycle (edge padding).
+    """
+
+    def __init__(self, frame, window=30, features=None, rul_cap=RUL_CAP,
+                 final_rul=None, pad_value=None):
+        self.window = int(window)
+        self.rul_cap = rul_cap
+        self.features = list(features) if features is not None else list(VALUE_NAMES)
+
+        unit = np.asarray(frame.unit)
+        cycle = np.asarray(frame.cycle)
+
+        # ---------- group rows by unit (once) ----------
+        # C-MAPSS files are already sorted by (unit, cycle); only reorder if not
+        key_sorted = np.all((np.diff(unit) > 0) | ((np.diff(unit) == 0) & (np.diff(cycle) > 0)))
+        order = None if key_sorted else np.lexsort((cycle, unit))
+        if order is not None:
+            unit, cycle = unit[order], cycle[order]
+
+        bounds = np.flatnonzero(np.diff(unit)) + 1
+        starts = np.concatenate(([0], bounds))
+        lengths = np.diff(np.concatenate((starts, [len(unit)])))
+        self.units = unit[starts]
+        self.lengths = lengths
+
+        # ---------- piecewise-linear labels (row level, vectorized) ----------
+        end_cycle = np.repeat(cycle[starts + lengths - 1], lengths)
+        offset = np.zeros(len(starts), dtype=np.int64) if final_rul is None else np.asarray(final_rul)
+        if len(offset) != len(starts):
+            raise ValueError(f"final_rul has {len(offset)} values for {len(starts)} units")
+        row_rul = (end_cycle - cycle + np.repeat(offset, lengths)).astype(np.float32)
+        if rul_cap is not None:
+            np.minimum(row_rul, rul_cap, out=row_rul)
+
+        # ---------- one C-contiguous (rows, features) buffer ----------
+        col_idx = [VALUE_NAMES.index(name) for name in self.features]
+        values = frame.values
+        if order is not None:
+            values = values[order]
+        data = np.ascontiguousarray(values[:, col_idx], dtype=np.float32)
+
+        # Left-pad short trajectories so each unit holds at least one window.
+        # Padding adds at most ``window - 1`` rows per short unit.
+        pad = np.maximum(self.window - lengths, 0)
+        if pad.any():
+            padded_lengths = lengths + pad
+            out_starts = np.concatenate(([0], np.cumsum(padded_lengths)[:-1]))
+            pos = np.arange(padded_lengths.sum()) - np.repeat(out_starts, padded_lengths)
+            src = np.repeat(starts, padded_lengths) + np.maximum(pos - np.repeat(pad, padded_lengths), 0)
+            data = data[src]
+            row_rul = row_rul[src]
+            if pad_value is not None:
+                data[pos < np.repeat(pad, padded_lengths)] = pad_value
+            starts, lengths = out_starts, padded_lengths
+
+        data.flags.writeable = False
+        self.data = data
+        self.row_rul = row_rul
+        self.unit_starts = starts
+        self.unit_lengths = lengths
+
+        # Valid window starts never straddle two units
+        n_windows = lengths - self.window + 1
+        self.window_starts = (np.repeat(starts - np.concatenate(([0], np.cumsum(n_windows)[:-1])), n_windows)
+                              + np.arange(n_windows.sum()))
+        self.window_units = np.repeat(self.units, n_windows)
+
+    # ---------- views ----------
+    @property
+    def all_windows(self):
+        """
+        Read-only view of shape (rows - window + 1, window, features).
+
+        Window ``i`` covers rows ``i .. i + window - 1``; index it with
+        ``window_starts`` to keep only windows inside a single unit.
+        """
+        n_rows, n_features = self.data.shape
+        s0, s1 = self.data.strides
+        return as_strided(self.data, shape=(n_rows - self.window + 1, self.window, n_features),
+                          strides=(s0, s0, s1), writeable=False)
+
+    @property
+    def labels(self):
+        """RUL label of each valid window (the RUL at its last cycle)."""
+        return self.row_rul[self.window_starts + self.window - 1]
+
+    def __len__(self):
+        return len(self.window_starts)
+
+    def __getitem__(self, i):
+        """Return (window view, label) for valid window ``i``."""
+        start = self.window_starts[i]
+        return self.all_windows[start], self.row_rul[start + self.window - 1]
+
+    def last_windows(self):
+        """
+        Return the final window of every unit, as used for test scoring.
+
+        Returns:
+        --------
+        tuple : (X of shape (units, window, features), y of shape (units,))
+        """
+        ends = self.unit_starts + self.unit_lengths - 1
+        return self.all_windows[ends - self.window + 1], self.row_rul[ends]
+
+    def batches(self, batch_size=256, shuffle=False, seed=None, drop_last=False):
+        """
+        Yield (X_batch, y_batch) mini-batches of valid windows.
+
+        Each batch is gathered from the strided view, so only
+        ``batch_size * window * features`` values are copied at a time.
+        """
+        order = np.arange(len(self))
+        if shuffle:
+            np.random.default_rng(seed).shuffle(order)
+        windows = self.all_windows
+        labels = self.labels
+        stop = len(order) - (len(order) % batch_size if drop_last else 0)
+        for begin in range(0, stop, batch_size):
+            idx = order[begin:begin + batch_size]
+            yield windows[self.window_starts[idx]], labels[idx]
+
+
+if __name__ == '__main__':
+    from cmapss_loader import load_subset
+
+    fd001 = load_subset('FD001')
+    train = RULWindowDataset(fd001.train, window=30)
+    test = RULWindowDataset(fd001.test, window=30, final_rul=fd001.rul)
+    X_last, y_last = test.last_windows()
+    print(f"📊 Train: {len(train):,} windows over {train.data.nbytes / 1e6:.1f} MB of rows "
+          f"(materialised would be {len(train) * train.window * train.data.shape[1] * 4 / 1e6:.1f} MB)")
+    print(f"📊 Test: {len(test):,} windows | last windows {X_last.shape}")
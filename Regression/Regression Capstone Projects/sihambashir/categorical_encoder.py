@@ -0,0 +1,108 @@
+# =========================================
+# Project: Health Score Prediction
+# File: categorical_encoder.py
+# Description: One fitted encoder for all categorical columns. Every column's
+# vocabulary is a sorted array (so the codes match LabelEncoder), and all
+# columns are encoded together with a single searchsorted over one merged
+# vocabulary. Saved as one small .npz file (no pickle).
+# =========================================
+import numpy as np
+import pandas as pd
+
+HANDLE_UNKNOWN = ('error', 'use_encoded_value')
+
+
+class CategoricalEncoder:
+    def __init__(self, handle_unknown='error', unknown_value=-1):
+        if handle_unknown not in HANDLE_UNKNOWN:
+            raise ValueError(f"handle_unknown must be one of {HANDLE_UNKNOWN}, got {handle_unknown!r}")
+        self.handle_unknown = handle_unknown
+        self.unknown_value = int(unknown_value)
+
+    def fit(self, df, columns=None):
+        # Default: every text / category column
+        if columns is None:
+            columns = [c for c in df.columns if not pd.api.types.is_numeric_dtype(df[c])]
+        return self._set_vocabularies(
+            {col: np.unique(df[col].astype(str).to_numpy(dtype=str)) for col in columns})
+
+    @classmethod
+    def from_categories(cls, categories, **kwargs):
+        # Build directly from {column: list of categories}
+        return cls(**kwargs)._set_vocabularies(categories)
+
+    @classmethod
+    def from_label_encoders(cls, encoders, **kwargs):
+        # Convert a {column: fitted LabelEncoder} dict (classes_ are already sorted)
+        return cls.from_categories(
+            {col: np.asarray(enc.classes_).astype(str) for col, enc in encoders.items()}, **kwargs)
+
+    def _set_vocabularies(self, vocabularies):
+        self.columns_ = list(vocabularies)
+        self.categories_ = [np.sort(np.asarray(v, dtype=str)) for v in vocabularies.values()]
+        # Merged vocabulary of all columns, plus a (column, merged position) -> code table
+        self.vocab_ = np.unique(np.concatenate(self.categories_)) if self.categories_ \
+            else np.array([], dtype=str)
+        self.table_ = np.full((len(self.columns_), len(self.vocab_)), -1, dtype=np.int64)
+        for i, cats in enumerate(self.categories_):
+            self.table_[i, np.searchsorted(self.vocab_, cats)] = np.arange(len(cats))
+        return self
+
+    @property
+    def categories(self):
+        return {col: cats.tolist() for col, cats in zip(self.columns_, self.categories_)}
+
+    def encode(self, df, columns=None):
+        # (n_rows, n_columns) int64 codes for the fitted columns (or a subset of them)
+        columns = self.columns_ if columns is None else list(columns)
+        unfitted = [c for c in columns if c not in self.columns_]
+        if unfitted:
+            raise ValueError(f"Encoder was not fitted on: {', '.join(unfitted)}")
+        missing = [c for c in columns if c not in df.columns]
+        if missing:
+            raise ValueError(f"Missing categorical columns: {', '.join(missing)}")
+        values = df[columns].astype(str).to_numpy(dtype=str)
+        if not len(self.vocab_):
+            codes = np.full(values.shape, -1, dtype=np.int64)
+        else:
+            rows = np.array([self.columns_.index(c) for c in columns], dtype=np.intp)
+            pos = np.searchsorted(self.vocab_, values).clip(max=len(self.vocab_) - 1)
+            codes = self.table_[rows, pos]
+            codes[self.vocab_[pos] != values] = -1
+
+        unknown = codes == -1
+        if unknown.any():
+            if self.handle_unknown == 'error':
+                j = int(np.argmax(unknown.any(axis=0)))
+                bad = sorted(set(values[unknown[:, j], j].tolist()))
+                raise ValueError(f"Unknown categories in '{columns[j]}': {bad[:5]}")
+            codes[unknown] = self.unknown_value
+        return codes
+
+    def transform(self, df):
+        # Copy of df with every categorical column replaced by its codes
+        df = df.copy()
+        df[self.columns_] = self.encode(df)
+        return df
+
+    def fit_transform(self, df, columns=None):
+        return self.fit(df, columns).transform(df)
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            np.savez_compressed(
+                f,
+                columns=np.asarray(self.columns_, dtype=str),
+                lengths=np.array([len(c) for c in self.categories_], dtype=np.int64),
+                categories=np.concatenate(self.categories_) if self.categories_ else np.array([], dtype=str),
+                policy=np.array([self.handle_unknown]),
+                unknown_value=np.array(self.unknown_value),
+            )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            splits = np.cumsum(data['lengths'])[:-1]
+            return cls.from_categories(
+                dict(zip(data['columns'].tolist(), np.split(data['categories'], splits))),
+                handle_unknown=str(data['policy'][0]), unknown_value=int(data['unknown_value']))
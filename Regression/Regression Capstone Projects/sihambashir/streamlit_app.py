@@ -2,11 +2,18 @@ import streamlit as st
 import joblib
 import pandas as pd
 import numpy as np
+import os
+from categorical_encoder import CategoricalEncoder
 
 # ----- 1. Load saved artifacts -----
 model = joblib.load('best_model.pkl')
 scaler = joblib.load('scaler.pkl')
-encoders = joblib.load('encoders.pkl')  # dict: {column_name: encoder object}
+# One encoder for every categorical column; older runs only saved the
+# per-column dict in encoders.pkl, which is converted once here
+if os.path.exists('encoder.npz'):
+    encoder = CategoricalEncoder.load('encoder.npz')
+else:
+    encoder = CategoricalEncoder.from_label_encoders(joblib.load('encoders.pkl'))
 
 # ----- 2. App title -----
 st.set_page_config(page_title="Health Score Predictor", layout="centered")
@@ -16,9 +23,8 @@ st.write("ادخل بيانات المستخدم أدناه للتنبؤ بال
 # ----- 3. Collect user input dynamically -----
 user_input = {}
 
-# Categorical features from encoders
-for col, enc in encoders.items():
-    options = enc.classes_.tolist()
+# Categorical features from the encoder vocabularies
+for col, options in encoder.categories.items():
     user_input[col] = st.selectbox(f"{col}", options)
 
 # Numeric features from scaler
@@ -30,9 +36,8 @@ for col in numeric_cols:
 # ----- 4. Prepare DataFrame -----
 input_df = pd.DataFrame([user_input])
 
-# Apply encoders
-for col, enc in encoders.items():
-    input_df[col] = enc.transform(input_df[col])
+# Apply the encoder (all categorical columns at once)
+input_df = encoder.transform(input_df)
 
 # Apply scaler
 input_df[numeric_cols] = scaler.transform(input_df[numeric_cols])
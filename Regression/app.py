@@ -1,40 +1,39 @@
 # app.py
 import streamlit as st
-import joblib
 import pandas as pd
-import os
-import glob
+from model_registry import serving_loader
+from serving_metrics import InstrumentedPredictor, start_metrics_server
 from utils import AdvancedFeatureEngineer, OutlierHandler
 
 # ===========================
-# 1️⃣ Auto-detect latest model version
+# 1️⃣ Load the promoted model version
 # ===========================
-model_folders = glob.glob("models/v1_*")
-if not model_folders:
-    st.error("❌ No model folders found in 'models/'. Please train and save a model first.")
-    st.stop()
+# ✅ Make sure utils.py is imported before unpickling
+@st.cache_resource
+def get_model_loader():
+    return serving_loader("models")
 
-# Get the latest folder by modification time
-MODEL_DIR = max(model_folders, key=os.path.getmtime)
-model_path = os.path.join(MODEL_DIR, "best_model.pkl")
-preprocessor_path = os.path.join(MODEL_DIR, "preprocessor.pkl")
+@st.cache_resource
+def get_metrics_server():
+    # Prometheus endpoint on SERVING_METRICS_PORT (default 9108); None if the
+    # port is taken, e.g. by app_2.py running alongside
+    try:
+        return start_metrics_server()
+    except OSError:
+        return None
 
-# Safety check
-if not os.path.exists(model_path):
-    st.error(f"❌ Model file not found at {model_path}")
+try:
+    # One stat of models/registry.json per rerun; reloads only after a promotion
+    model, preprocessor, model_entry = get_model_loader().get()
+except (FileNotFoundError, LookupError) as e:
+    st.error(f"❌ No promoted model found in 'models/'. Please train and register a model first. ({e})")
     st.stop()
-if not os.path.exists(preprocessor_path):
-    st.error(f"❌ Preprocessor file not found at {preprocessor_path}")
-    st.stop()
-
-# ✅ Make sure utils.py is imported before unpickling
-@st.cache_resource
-def load_model():
-    model = joblib.load(model_path)
-    preprocessor = joblib.load(preprocessor_path)
-    return model, preprocessor
 
-model, preprocessor = load_model()
+MODEL_VERSION = model_entry["version"]
+MODEL_METRICS = model_entry["metrics"]
+# Records per-stage latency, batch sizes and errors for this version
+predictor = InstrumentedPredictor(model, preprocessor, MODEL_VERSION)
+get_metrics_server()
 
 # ===========================
 # 2️⃣ Streamlit UI
@@ -81,8 +80,7 @@ input_df = pd.DataFrame([[
 # ===========================
 if st.button("🚀 Predict House Price"):
     try:
-        X_input = preprocessor.transform(input_df)
-        prediction = model.predict(X_input)[0]
+        prediction = predictor.predict(input_df)[0]
         predicted_price = prediction * 100_000  # Convert from 100k units
 
         st.success(f"### Predicted House Price: ${predicted_price:,.0f}")
@@ -96,8 +94,15 @@ if st.button("🚀 Predict House Price"):
 # ===========================
 st.sidebar.markdown("---")
 st.sidebar.subheader("ℹ️ Model Information")
-st.sidebar.write(f"**Loaded from:** `{MODEL_DIR}`")
-st.sidebar.write("**Model:** Gradient Boosting Regressor")
+st.sidebar.write(f"**Model version:** `{MODEL_VERSION}`")
+st.sidebar.write(f"**Model:** {model_entry.get('model_name') or 'Gradient Boosting Regressor'}")
 st.sidebar.write("**Dataset:** California Housing")
-st.sidebar.write("**Validation R²:** 0.8298")
-st.sidebar.write("**Test R²:** 0.8333 | RMSE: 0.4673 | MAE: 0.3087")
+if MODEL_METRICS:
+    # Older model cards may lack some of these
+    fmt = {k: f"{MODEL_METRICS[k]:.4f}" if k in MODEL_METRICS else "n/a"
+           for k in ('val_r2', 'test_r2', 'test_rmse', 'test_mae')}
+    st.sidebar.write(f"**Validation R²:** {fmt['val_r2']}")
+    st.sidebar.write(
+        f"**Test R²:** {fmt['test_r2']} | "
+        f"RMSE: {fmt['test_rmse']} | MAE: {fmt['test_mae']}"
+    )
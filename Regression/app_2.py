@@ -1,10 +1,12 @@
 # app.py - Enhanced Version
 import streamlit as st
-import joblib
 import pandas as pd
 import numpy as np
-import os
 import plotly.graph_objects as go
+from model_registry import serving_loader
+from permutation_importance import load_importances
+from serving_metrics import InstrumentedPredictor, start_metrics_server
+from tree_explainer import MODEL_FEATURES, TreeExplainer
 from utils import AdvancedFeatureEngineer, OutlierHandler
 
 st.set_page_config(page_title="🏠 Housing Price Predictor", layout="wide", initial_sidebar_state="expanded")
@@ -12,17 +14,39 @@ st.set_page_config(page_title="🏠 Housing Price Predictor", layout="wide", ini
 # ===========================
 # 1️⃣ Load model and preprocessor
 # ===========================
-MODEL_DIR = os.path.join("models", "v1_20251018_042353")
-model_path = os.path.join(MODEL_DIR, "best_model.pkl")
-preprocessor_path = os.path.join(MODEL_DIR, "preprocessor.pkl")
+@st.cache_resource
+def get_model_loader():
+    return serving_loader("models")
+
+@st.cache_resource
+def get_metrics_server():
+    # Prometheus endpoint on SERVING_METRICS_PORT (default 9108); None if the
+    # port is taken, e.g. by app.py running alongside
+    try:
+        return start_metrics_server()
+    except OSError:
+        return None
 
 @st.cache_resource
-def load_model():
-    model = joblib.load(model_path)
-    preprocessor = joblib.load(preprocessor_path)
-    return model, preprocessor
+def get_explainer(version, _model, _preprocessor):
+    # Built once per model version; None for models without trees
+    try:
+        return TreeExplainer(_model, _preprocessor, feature_names=MODEL_FEATURES)
+    except (TypeError, ValueError):
+        return None
 
-model, preprocessor = load_model()
+try:
+    # Follows the version promoted in models/registry.json without a server restart
+    model, preprocessor, model_entry = get_model_loader().get()
+except (FileNotFoundError, LookupError) as e:
+    st.error(f"❌ No promoted model found in 'models/'. Please train and register a model first. ({e})")
+    st.stop()
+MODEL_VERSION = model_entry["version"]
+MODEL_METRICS = model_entry["metrics"]
+# Records per-stage latency, batch sizes and errors for this version
+predictor = InstrumentedPredictor(model, preprocessor, MODEL_VERSION)
+get_metrics_server()
+explainer = get_explainer(MODEL_VERSION, model, preprocessor)
 
 # ===========================
 # 2️⃣ Helper Functions
@@ -44,19 +68,47 @@ def get_price_context(price):
     else:
         return "🔴 Luxury", "High-end segment"
 
-def create_feature_importance_chart():
-    """Create a feature importance visualization"""
-    features = ["Median Income", "Location (Lat/Long)", "House Age", "Avg Rooms", 
-                "Population", "Avg Bedrooms", "Avg Occupancy"]
-    importance = [0.45, 0.25, 0.10, 0.08, 0.05, 0.04, 0.03]
+FEATURE_LABELS = {
+    "MedInc": "Median Income", "HouseAge": "House Age", "AveRooms": "Avg Rooms",
+    "AveBedrms": "Avg Bedrooms", "Population": "Population", "AveOccup": "Avg Occupancy",
+    "Latitude": "Latitude", "Longitude": "Longitude",
+    "DistToCenter": "Distance to CA Center", "RoomsPerBedroom": "Rooms per Bedroom",
+    "IncomePerRoom": "Income per Room", "PopPerOccupancy": "Households",
+    "IncomeXRooms": "Income × Rooms", "Quadrant": "Region Quadrant",
+}
+
+def create_feature_importance_chart(importances):
+    """Bar chart of the permutation importances stored with the model version"""
+    order = [importances["features"].index(name) for name in importances["ranking"]]
+    features = [FEATURE_LABELS.get(importances["features"][i], importances["features"][i]) for i in order]
     
     fig = go.Figure(data=[
-        go.Bar(x=importance, y=features, orientation='h', 
+        go.Bar(x=[importances["importances_mean"][i] for i in order], y=features, orientation='h',
+               error_x=dict(type='data', array=[importances["importances_std"][i] for i in order]),
                marker=dict(color='rgba(58, 123, 213, 0.8)'))
     ])
     fig.update_layout(title="Feature Importance in Price Prediction",
-                      xaxis_title="Importance", yaxis_title="",
-                      height=300, margin=dict(l=150))
+                      xaxis_title="Drop in R² when shuffled", yaxis_title="",
+                      height=300, margin=dict(l=150), yaxis=dict(autorange="reversed"))
+    return fig
+
+def create_contribution_chart(explanation, top_n=8):
+    """Bar chart of the largest per-feature contributions to one prediction, in dollars"""
+    contributions = np.asarray(explanation["contributions"]) * 100_000
+    order = np.argsort(-np.abs(contributions))[:top_n]
+    names = [FEATURE_LABELS.get(explanation["feature_names"][i], explanation["feature_names"][i])
+             for i in order]
+    values = contributions[order]
+    
+    fig = go.Figure(data=[
+        go.Bar(x=values, y=names, orientation='h',
+               marker=dict(color=['rgba(46, 160, 67, 0.8)' if v >= 0 else 'rgba(215, 58, 73, 0.8)'
+                                  for v in values]),
+               text=[f"{v:+,.0f}" for v in values], textposition='auto')
+    ])
+    fig.update_layout(title=f"Contributions vs. average price (${explanation['bias'] * 100_000:,.0f})",
+                      xaxis_title="Effect on predicted price ($)", yaxis_title="",
+                      height=320, margin=dict(l=150), yaxis=dict(autorange="reversed"))
     return fig
 
 # ===========================
@@ -117,8 +169,7 @@ with tab1:
         ]], columns=feature_names)
         
         try:
-            X_input = preprocessor.transform(input_df)
-            prediction = model.predict(X_input)[0]
+            prediction = predictor.predict(input_df)[0]
             predicted_price = prediction * 100_000
             lower_price, upper_price = estimate_price_range(predicted_price)
             category, segment = get_price_context(predicted_price)
@@ -139,6 +190,12 @@ with tab1:
             
             st.info(f"**Market Segment:** {segment}")
             
+            if explainer is not None:
+                # Exact path contributions, cached per input row
+                with st.expander("🔍 Why this price?", expanded=True):
+                    st.plotly_chart(create_contribution_chart(explainer.explain(input_df)),
+                                    use_container_width=True)
+            
             # Input summary
             with st.expander("📋 Input Summary", expanded=False):
                 summary_df = pd.DataFrame({
@@ -157,13 +214,19 @@ with tab2:
     col1, col2 = st.columns(2)
     
     with col1:
-        st.plotly_chart(create_feature_importance_chart(), use_container_width=True)
+        importances = load_importances("models", MODEL_VERSION)
+        if importances is not None:
+            st.plotly_chart(create_feature_importance_chart(importances), use_container_width=True)
+        else:
+            st.info(f"No importances stored for `{MODEL_VERSION}` yet. "
+                    f"Run `python permutation_importance.py --version {MODEL_VERSION}`.")
     
     with col2:
         st.markdown("**Model Performance Metrics**")
+        metric_keys = ['val_r2', 'test_r2', 'test_rmse', 'test_mae']
         metrics_df = pd.DataFrame({
             'Metric': ['Validation R²', 'Test R²', 'Test RMSE', 'Test MAE'],
-            'Score': ['0.8298', '0.8333', '0.4673', '0.3087']
+            'Score': [f"{MODEL_METRICS[k]:.4f}" if k in MODEL_METRICS else "n/a" for k in metric_keys]
         })
         st.dataframe(metrics_df, use_container_width=True, hide_index=True)
         
@@ -217,5 +280,5 @@ with tab3:
     
     st.divider()
     
-    st.markdown("**Model Version:** v1_20251018_042353")
+    st.markdown(f"**Model Version:** {MODEL_VERSION}")
     st.markdown("**Last Updated:** October 18, 2025")
\ No newline at end of file
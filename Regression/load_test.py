@@ -0,0 +1,311 @@
+# load_test.py - Local load generator for the prediction apps
+"""
+Load-testing harness for local inference entry points.
+
+Replays synthetic or recorded feature rows against an in-process predict
+function at a fixed concurrency and (optionally) a fixed request rate, and
+reports p50/p95/p99 latency, throughput and error rate as JSON. Gate
+options turn the report into a pass/fail exit code, so a model version can
+be load-tested before it is promoted.
+
+Targets:
+    housing            promoted (or --version) model from models/registry.json
+    module:function    any importable callable that takes a DataFrame batch and
+                       returns its predictions (e.g. a thin wrapper around the
+                       Spaceship production pipeline or the Gradio app's model)
+
+With ``--rate`` the load is open-loop: requests are scheduled at fixed
+arrival times and latency is measured from the scheduled time, so queueing
+behind slow requests is counted instead of hidden.
+
+Usage:
+    python load_test.py housing --requests 2000 --concurrency 8
+    python load_test.py housing --version v1_20251018_042353 --rate 200 --duration 30
+    python load_test.py housing --rows recorded.csv --batch-size 32 --max-p95-ms 50
+    python load_test.py mypkg.serving:predict_batch --rows rows.parquet --output report.json
+    python load_test.py housing --duration 60 --metrics-port 9108   # scrape stage timings meanwhile
+"""
+import argparse
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from serving_metrics import InstrumentedPredictor, start_metrics_server
+
+HOUSING_FEATURES = [
+    "MedInc", "HouseAge", "AveRooms", "AveBedrms",
+    "Population", "AveOccup", "Latitude", "Longitude"
+]
+# Same ranges as the sliders in app.py / app_2.py
+HOUSING_RANGES = {
+    "MedInc": (0.5, 15.0),
+    "HouseAge": (1, 52),
+    "AveRooms": (1.0, 15.0),
+    "AveBedrms": (0.5, 10.0),
+    "Population": (100, 5000),
+    "AveOccup": (1.0, 10.0),
+    "Latitude": (32.0, 42.0),
+    "Longitude": (-124.0, -114.0),
+}
+
+PERCENTILES = (50, 95, 99)
+
+
+def synthetic_housing_rows(n_rows, random_state=42):
+    """Uniform random rows within the app input ranges."""
+    rng = np.random.default_rng(random_state)
+    return pd.DataFrame({name: rng.uniform(low, high, n_rows)
+                         for name, (low, high) in HOUSING_RANGES.items()},
+                        columns=HOUSING_FEATURES)
+
+
+def load_rows(path):
+    """Read recorded feature rows from a CSV or Parquet file."""
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
+def housing_predictor(root="models", version=None):
+    """
+    Predict function of a registered housing model version.
+
+    Parameters:
+    -----------
+    root : str, default="models"
+        Registry directory
+    version : str, optional
+        Version to load; defaults to the promoted one
+
+    Returns:
+    --------
+    tuple : (predict function, version name)
+    """
+    # The pickled preprocessors reference these classes
+    import utils  # noqa: F401
+    import joblib
+    from model_registry import ModelRegistry, file_checksum
+
+    registry = ModelRegistry(root)
+    manifest = registry.load_manifest()
+    entry = registry.current_entry(manifest) if version is None else manifest["versions"][version]
+    loaded = {}
+    for name, spec in entry["artifacts"].items():
+        path = os.path.join(root, spec["path"])
+        if file_checksum(path) != spec["sha256"]:
+            raise ValueError(f"Checksum mismatch for {spec['path']}")
+        loaded[name] = joblib.load(path)
+    # Per-stage timings land in serving_metrics.METRICS (see --metrics-port)
+    predictor = InstrumentedPredictor(loaded["model"], loaded["preprocessor"], entry["version"])
+    return predictor.predict, entry["version"]
+
+
+def resolve_target(target, root="models", version=None):
+    """Return (predict function, version label) for a target name or 'module:function'."""
+    if target == "housing":
+        return housing_predictor(root, version)
+    module_name, sep, attr = target.partition(":")
+    if not sep:
+        raise ValueError(f"Target must be 'housing' or 'module:function', got {target!r}")
+    return getattr(importlib.import_module(module_name), attr), version
+
+
+def summarize_latencies(latencies_s):
+    """Latency statistics in milliseconds."""
+    if not len(latencies_s):
+        return {f"p{p}": None for p in PERCENTILES} | {"mean": None, "max": None}
+    ms = np.asarray(latencies_s) * 1000
+    stats = {f"p{p}": round(float(v), 3) for p, v in zip(PERCENTILES, np.percentile(ms, PERCENTILES))}
+    stats["mean"] = round(float(ms.mean()), 3)
+    stats["max"] = round(float(ms.max()), 3)
+    return stats
+
+
+def run_load_test(predict, rows, n_requests=None, duration=None, concurrency=4, rate=None,
+                  batch_size=1, warmup=20):
+    """
+    Replay ``rows`` against ``predict`` and measure every request.
+
+    Parameters:
+    -----------
+    predict : callable
+        Takes a DataFrame batch, returns its predictions
+    rows : DataFrame
+        Feature rows, replayed in order and wrapped around
+    n_requests : int, optional
+        Stop after this many requests
+    duration : float, optional
+        Stop issuing requests after this many seconds
+    concurrency : int, default=4
+        Requests in flight at the same time
+    rate : float, optional
+        Target requests per second (open-loop); None sends as fast as the
+        workers allow (closed-loop)
+    batch_size : int, default=1
+        Rows per request
+    warmup : int, default=20
+        Unmeasured requests sent first (lazy imports, caches); failures are
+        counted in ``warmup_errors``
+
+    Returns:
+    --------
+    dict : Report with latency percentiles, throughput and error rate
+    """
+    if n_requests is None and duration is None:
+        raise ValueError("Set n_requests, duration or both")
+    if len(rows) < batch_size:
+        raise ValueError(f"Need at least batch_size={batch_size} rows, got {len(rows)}")
+    rows = rows.reset_index(drop=True)
+    n_batches = len(rows) // batch_size
+    batches = [rows.iloc[i * batch_size:(i + 1) * batch_size] for i in range(n_batches)]
+
+    # Failures here are reported like any other, so a broken target still yields a report
+    warmup_errors = []
+    for i in range(warmup):
+        try:
+            predict(batches[i % n_batches])
+        except Exception as e:
+            warmup_errors.append(f"{type(e).__name__}: {e}")
+
+    latencies, errors = [], []
+    lock = threading.Lock()
+    counter = iter(range(sys.maxsize))
+    start = time.perf_counter()
+    deadline = None if duration is None else start + duration
+
+    def next_request():
+        with lock:
+            i = next(counter)
+        if n_requests is not None and i >= n_requests:
+            return None
+        scheduled = start + i / rate if rate else None
+        if deadline is not None and (scheduled or time.perf_counter()) >= deadline:
+            return None
+        return i, scheduled
+
+    def worker():
+        while True:
+            request = next_request()
+            if request is None:
+                return
+            i, scheduled = request
+            if scheduled is not None:
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            t0 = scheduled if scheduled is not None else time.perf_counter()
+            try:
+                predict(batches[i % n_batches])
+                ok = True
+            except Exception as e:
+                ok, error = False, f"{type(e).__name__}: {e}"
+            elapsed = time.perf_counter() - t0
+            with lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    errors.append(error)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker)
+    wall = time.perf_counter() - start
+
+    total = len(latencies) + len(errors)
+    return {
+        "requests": total,
+        "errors": len(errors),
+        "error_rate": round(len(errors) / total, 6) if total else None,
+        "duration_s": round(wall, 3),
+        "throughput_rps": round(len(latencies) / wall, 3) if wall else None,
+        "rows_per_s": round(len(latencies) * batch_size / wall, 3) if wall else None,
+        "latency_ms": summarize_latencies(latencies),
+        "concurrency": concurrency,
+        "target_rate_rps": rate,
+        "batch_size": batch_size,
+        "warmup_errors": len(warmup_errors),
+        # First few distinct messages, enough to see what broke
+        "error_samples": sorted(set(errors) | set(warmup_errors))[:5],
+    }
+
+
+def check_gates(report, max_p95_ms=None, max_p99_ms=None, max_error_rate=None, min_throughput=None):
+    """Return the list of failed gates (empty if the run passes)."""
+    failures = []
+    latency = report["latency_ms"]
+    if max_p95_ms is not None and (latency["p95"] is None or latency["p95"] > max_p95_ms):
+        failures.append(f"p95 {latency['p95']} ms > {max_p95_ms} ms")
+    if max_p99_ms is not None and (latency["p99"] is None or latency["p99"] > max_p99_ms):
+        failures.append(f"p99 {latency['p99']} ms > {max_p99_ms} ms")
+    if max_error_rate is not None and (report["error_rate"] is None or report["error_rate"] > max_error_rate):
+        failures.append(f"error rate {report['error_rate']} > {max_error_rate}")
+    if min_throughput is not None and (report["throughput_rps"] or 0) < min_throughput:
+        failures.append(f"throughput {report['throughput_rps']} rps < {min_throughput} rps")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test a local inference entry point")
+    parser.add_argument("target", help="'housing' or 'module:function' taking a DataFrame batch")
+    parser.add_argument("--root", default="models", help="Registry directory (housing target)")
+    parser.add_argument("--version", default=None, help="Registry version to test (default: promoted)")
+    parser.add_argument("--rows", default=None, help="Recorded rows (.csv or .parquet); default: synthetic")
+    parser.add_argument("--synthetic-rows", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=None, help="Number of requests to send")
+    parser.add_argument("--duration", type=float, default=None, help="Seconds to send requests for")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=None, help="Requests per second (open-loop)")
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--output", default=None, help="Also write the JSON report here")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="Serve per-stage metrics (housing target) on this port during the run")
+    parser.add_argument("--max-p95-ms", type=float, default=None)
+    parser.add_argument("--max-p99-ms", type=float, default=None)
+    parser.add_argument("--max-error-rate", type=float, default=None)
+    parser.add_argument("--min-throughput", type=float, default=None, help="Requests per second")
+    args = parser.parse_args()
+    if args.requests is None and args.duration is None:
+        args.requests = 1000
+
+    predict, version = resolve_target(args.target, args.root, args.version)
+    if args.metrics_port is not None:
+        start_metrics_server(args.metrics_port)
+    if args.rows is not None:
+        rows = load_rows(args.rows)
+    elif args.target == "housing":
+        rows = synthetic_housing_rows(args.synthetic_rows)
+    else:
+        parser.error("--rows is required for custom targets")
+
+    report = {
+        "target": args.target,
+        "model_version": version,
+        "rows_source": args.rows or "synthetic",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+    }
+    report.update(run_load_test(predict, rows, args.requests, args.duration, args.concurrency,
+                                args.rate, args.batch_size, args.warmup))
+    failures = check_gates(report, args.max_p95_ms, args.max_p99_ms,
+                           args.max_error_rate, args.min_throughput)
+    report["gates_passed"] = not failures
+    report["gate_failures"] = failures
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
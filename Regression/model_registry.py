@@ -0,0 +1,286 @@
+# model_registry.py - Versioned model registry
+"""
+Versioned model registry for the California Housing apps.
+
+All saved versions live under ``models/<version>/`` and are described by a
+single manifest (``models/registry.json``) holding each version's metrics,
+artifact paths and SHA-256 checksums, plus the version currently promoted
+to serving. The apps read the manifest instead of scanning ``models/``.
+
+Usage:
+    python model_registry.py index              # register every models/v1_* folder
+    python model_registry.py register models/v1_20251018_042353
+    python model_registry.py promote v1_20251018_042353
+    python model_registry.py list
+"""
+import argparse
+import glob
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+
+import joblib
+
+MANIFEST_NAME = "registry.json"
+ARTIFACTS = {
+    "model": "best_model.pkl",
+    "preprocessor": "preprocessor.pkl",
+}
+
+
+def file_checksum(path, chunk_size=1 << 20):
+    """Return the SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    """
+    Manifest-backed index of saved model versions.
+
+    Parameters:
+    -----------
+    root : str, default="models"
+        Directory holding the version folders and the manifest
+    """
+
+    def __init__(self, root="models"):
+        self.root = root
+        self.manifest_path = os.path.join(root, MANIFEST_NAME)
+
+    # ---------- manifest I/O ----------
+    def load_manifest(self):
+        """Read the manifest, returning an empty one if it does not exist yet."""
+        if not os.path.exists(self.manifest_path):
+            return {"current": None, "versions": {}}
+        with open(self.manifest_path) as f:
+            return json.load(f)
+
+    def _write_manifest(self, manifest):
+        """
+        Write the manifest atomically.
+
+        The new content goes to a temporary file in the same directory and is
+        moved over the old manifest with ``os.replace``, so readers see either
+        the old or the new manifest, never a partial one.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=".registry-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(manifest, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.manifest_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    # ---------- registration ----------
+    def register(self, version_dir, metrics=None):
+        """
+        Add (or refresh) a version folder in the manifest.
+
+        Metrics default to the ``performance`` block of the folder's
+        ``model_card.json`` when one exists.
+
+        Returns:
+        --------
+        dict : The manifest entry for the version
+        """
+        version = os.path.basename(os.path.normpath(version_dir))
+        artifacts = {}
+        for name, filename in ARTIFACTS.items():
+            path = os.path.join(self.root, version, filename)
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"Missing {name} artifact for {version}: {path}")
+            artifacts[name] = {
+                "path": os.path.join(version, filename),
+                "sha256": file_checksum(path),
+            }
+
+        card_path = os.path.join(self.root, version, "model_card.json")
+        card = {}
+        if os.path.exists(card_path):
+            with open(card_path) as f:
+                card = json.load(f)
+
+        entry = {
+            "version": version,
+            "model_name": card.get("model_name"),
+            "registered_at": datetime.now().isoformat(timespec="seconds"),
+            "metrics": metrics if metrics is not None else card.get("performance", {}),
+            "artifacts": artifacts,
+        }
+
+        manifest = self.load_manifest()
+        manifest["versions"][version] = entry
+        self._write_manifest(manifest)
+        return entry
+
+    def index(self, pattern="v1_*"):
+        """
+        Register every version folder matching ``pattern``.
+
+        Folders missing an artifact are skipped. If nothing is promoted yet,
+        the newest version (by name, which embeds the timestamp) is promoted.
+
+        Returns:
+        --------
+        list : Registered version names
+        """
+        registered = []
+        for version_dir in sorted(glob.glob(os.path.join(self.root, pattern))):
+            try:
+                self.register(version_dir)
+            except FileNotFoundError:
+                continue
+            registered.append(os.path.basename(version_dir))
+
+        if registered and self.load_manifest().get("current") is None:
+            self.promote(registered[-1])
+        return registered
+
+    def promote(self, version):
+        """Atomically mark ``version`` as the one the apps should serve."""
+        manifest = self.load_manifest()
+        if version not in manifest["versions"]:
+            raise KeyError(f"Unknown model version: {version}")
+        manifest["current"] = version
+        manifest["promoted_at"] = datetime.now().isoformat(timespec="seconds")
+        self._write_manifest(manifest)
+
+    # ---------- lookup ----------
+    def current_entry(self, manifest=None):
+        """Return the manifest entry of the promoted version."""
+        manifest = manifest if manifest is not None else self.load_manifest()
+        version = manifest.get("current")
+        if version is None:
+            raise LookupError(f"No model version promoted in {self.manifest_path}")
+        return manifest["versions"][version]
+
+
+class HotModelLoader:
+    """
+    In-process loader that follows the registry's promoted version.
+
+    Each ``get()`` costs a single ``os.stat`` of the manifest. The manifest
+    is only re-read when its size or mtime changes, and artifacts are cached
+    by checksum, so promoting a version that shares the preprocessor with
+    the previous one unpickles only the new model.
+
+    Parameters:
+    -----------
+    registry : ModelRegistry
+        Registry to follow
+    verify : bool, default=True
+        Check each artifact's SHA-256 against the manifest before unpickling
+    """
+
+    def __init__(self, registry, verify=True):
+        self.registry = registry
+        self.verify = verify
+        self._lock = threading.Lock()
+        self._manifest_stamp = None
+        self._entry = None
+        self._loaded = {}
+        self._artifacts = {}  # sha256 -> unpickled object
+
+    def _load_artifact(self, spec):
+        """Unpickle one artifact, reusing the cached object if the checksum matches."""
+        sha = spec["sha256"]
+        if sha in self._artifacts:
+            return self._artifacts[sha]
+
+        with open(os.path.join(self.registry.root, spec["path"]), "rb") as f:
+            data = f.read()
+        if self.verify and hashlib.sha256(data).hexdigest() != sha:
+            raise ValueError(f"Checksum mismatch for {spec['path']}")
+        obj = joblib.load(io.BytesIO(data))
+        self._artifacts[sha] = obj
+        return obj
+
+    def get(self):
+        """
+        Return the serving model, preprocessor and manifest entry.
+
+        Returns:
+        --------
+        tuple : (model, preprocessor, entry)
+        """
+        st = os.stat(self.registry.manifest_path)
+        stamp = (st.st_mtime_ns, st.st_size)
+
+        with self._lock:
+            if stamp != self._manifest_stamp:
+                entry = self.registry.current_entry()
+                loaded = {name: self._load_artifact(spec)
+                          for name, spec in entry["artifacts"].items()}
+                # Drop artifacts no longer referenced by the serving version
+                keep = {spec["sha256"] for spec in entry["artifacts"].values()}
+                self._artifacts = {sha: obj for sha, obj in self._artifacts.items() if sha in keep}
+                self._entry = entry
+                self._loaded = loaded
+                self._manifest_stamp = stamp
+
+            return self._loaded["model"], self._loaded["preprocessor"], self._entry
+
+
+def serving_loader(root="models"):
+    """
+    ``HotModelLoader`` for the apps, indexing existing version folders on first run.
+
+    Returns:
+    --------
+    HotModelLoader : Loader following the promoted version in ``root``
+    """
+    registry = ModelRegistry(root)
+    if registry.load_manifest()["current"] is None:
+        # First run without a manifest: index the existing version folders once
+        registry.index()
+    return HotModelLoader(registry)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the versioned model registry")
+    parser.add_argument("--root", default="models", help="Registry directory")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("index", help="Register every v1_* folder under the root")
+    register_parser = sub.add_parser("register", help="Register one version folder")
+    register_parser.add_argument("version_dir")
+    promote_parser = sub.add_parser("promote", help="Promote a version to serving")
+    promote_parser.add_argument("version")
+    sub.add_parser("list", help="List registered versions")
+
+    args = parser.parse_args()
+    registry = ModelRegistry(args.root)
+
+    if args.command == "index":
+        versions = registry.index()
+        print(f"✅ Registered {len(versions)} versions")
+    elif args.command == "register":
+        entry = registry.register(args.version_dir)
+        print(f"✅ Registered {entry['version']}")
+    elif args.command == "promote":
+        registry.promote(args.version)
+        print(f"✅ Promoted {args.version}")
+
+    manifest = registry.load_manifest()
+    for version, entry in sorted(manifest["versions"].items()):
+        marker = "*" if version == manifest.get("current") else " "
+        r2 = entry["metrics"].get("test_r2")
+        r2_text = f"test R²={r2:.4f}" if r2 is not None else "no metrics"
+        print(f" {marker} {version}  {r2_text}")
+
+
+if __name__ == "__main__":
+    main()
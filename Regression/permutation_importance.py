@@ -0,0 +1,233 @@
+# permutation_importance.py - Model-agnostic feature importance per model version
+"""
+Parallel permutation importance for registered model versions.
+
+For every feature, ``n_repeats`` shuffled copies of the evaluation rows are
+scored in one batched ``predict`` call: each worker process keeps one
+preallocated ``(n_repeats * n_rows, n_features)`` buffer holding the rows
+tiled ``n_repeats`` times, overwrites a single column with its shuffles,
+predicts, and restores the column. Features are spread over the workers;
+permutations are seeded per feature, so results do not depend on the
+number of workers.
+
+Results are stored next to the model as
+``models/<version>/permutation_importance.json``. The apps read that file
+instead of hard-coded numbers.
+
+Usage:
+    python permutation_importance.py                       # promoted version
+    python permutation_importance.py --version v1_20251018_042353 --n-repeats 10
+    python permutation_importance.py --data holdout.csv --target MedHouseVal
+"""
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import r2_score
+
+IMPORTANCE_FILE = "permutation_importance.json"
+
+HOUSING_FEATURES = [
+    "MedInc", "HouseAge", "AveRooms", "AveBedrms",
+    "Population", "AveOccup", "Latitude", "Longitude"
+]
+
+# Predict function, evaluation data and buffer, set once per worker by _init_worker
+_WORKER = {}
+
+
+def _init_worker(predict, X, y, scorer, n_repeats):
+    n_rows = len(X)
+    _WORKER.update(
+        predict=predict, X=X, y=y, scorer=scorer, n_repeats=n_repeats,
+        buffer=np.tile(X, (n_repeats, 1)),
+        n_rows=n_rows,
+    )
+
+
+def _column_scores(column, random_state):
+    """Scores of ``n_repeats`` shuffles of one column, from a single predict call."""
+    w = _WORKER
+    X, buffer, n_rows, n_repeats = w["X"], w["buffer"], w["n_rows"], w["n_repeats"]
+    rng = np.random.default_rng([random_state, column])
+    for r in range(n_repeats):
+        buffer[r * n_rows:(r + 1) * n_rows, column] = X[rng.permutation(n_rows), column]
+    try:
+        predictions = np.asarray(w["predict"](buffer))
+    finally:
+        # Restore the column for the next feature
+        buffer[:, column] = np.tile(X[:, column], n_repeats)
+    return np.array([w["scorer"](w["y"], predictions[r * n_rows:(r + 1) * n_rows])
+                     for r in range(n_repeats)])
+
+
+def permutation_importance(predict, X, y, scorer=r2_score, n_repeats=5, n_jobs=None,
+                           random_state=42, feature_names=None):
+    """
+    Drop in score when each feature is shuffled.
+
+    Parameters:
+    -----------
+    predict : callable
+        Takes a 2-D array, returns predictions (must be picklable for n_jobs > 1)
+    X, y : array-like
+        Evaluation data
+    scorer : callable, default=r2_score
+        ``scorer(y_true, y_pred)``, higher is better
+    n_repeats : int, default=5
+        Shuffles per feature
+    n_jobs : int, optional
+        Worker processes (None or -1: all cores, 1: in-process)
+    random_state : int, default=42
+        Seed of the per-feature permutations
+    feature_names : list, optional
+        Names for the result (default: DataFrame columns or feature_<i>)
+
+    Returns:
+    --------
+    dict : baseline score, per-feature mean/std/raw importances, ranking
+    """
+    if feature_names is None:
+        feature_names = list(X.columns) if isinstance(X, pd.DataFrame) else \
+            [f"feature_{i}" for i in range(np.shape(X)[1])]
+    X = np.ascontiguousarray(X, dtype=float)
+    y = np.asarray(y)
+    baseline = float(scorer(y, predict(X)))
+
+    init_args = (predict, X, y, scorer, n_repeats)
+    columns = range(X.shape[1])
+    n_workers = os.cpu_count() if n_jobs in (None, -1) else n_jobs
+    if n_workers == 1:
+        _init_worker(*init_args)
+        scores = [_column_scores(j, random_state) for j in columns]
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_workers, X.shape[1]), initializer=_init_worker,
+                                 initargs=init_args) as pool:
+            scores = list(pool.map(_column_scores, columns, [random_state] * X.shape[1]))
+
+    drops = baseline - np.array(scores)
+    mean, std = drops.mean(axis=1), drops.std(axis=1)
+    order = np.argsort(-mean, kind="stable")
+    return {
+        "baseline_score": baseline,
+        "scorer": getattr(scorer, "__name__", str(scorer)),
+        "n_repeats": n_repeats,
+        "n_rows": len(X),
+        "random_state": random_state,
+        "features": feature_names,
+        "importances_mean": mean.tolist(),
+        "importances_std": std.tolist(),
+        "importances": drops.tolist(),
+        "ranking": [feature_names[i] for i in order],
+    }
+
+
+class RegistryPredictor:
+    """Picklable ``preprocessor.transform`` + ``model.predict`` on raw feature arrays."""
+
+    def __init__(self, model, preprocessor, feature_names):
+        self.model = model
+        self.preprocessor = preprocessor
+        self.feature_names = list(feature_names)
+
+    def __call__(self, X):
+        frame = pd.DataFrame(X, columns=self.feature_names)
+        return self.model.predict(self.preprocessor.transform(frame))
+
+
+def load_evaluation_data(path=None, target=None, max_rows=2000, random_state=42):
+    """
+    Held-out rows to score on.
+
+    Defaults to the California Housing test split used by the lectures
+    (``test_size=0.2, random_state=42``), subsampled to ``max_rows``.
+    """
+    if path is not None:
+        df = pd.read_parquet(path) if path.endswith(".parquet") else pd.read_csv(path)
+        X, y = df[HOUSING_FEATURES], df[target]
+    else:
+        from sklearn.datasets import fetch_california_housing
+        from sklearn.model_selection import train_test_split
+        housing = fetch_california_housing(as_frame=True)
+        _, X, _, y = train_test_split(housing.data[HOUSING_FEATURES], housing.target,
+                                      test_size=0.2, random_state=random_state)
+    if max_rows is not None and len(X) > max_rows:
+        rows = np.random.default_rng(random_state).choice(len(X), max_rows, replace=False)
+        X, y = X.iloc[np.sort(rows)], y.iloc[np.sort(rows)]
+    return X, y
+
+
+def compute_for_version(root="models", version=None, data=None, target=None, n_repeats=5,
+                        n_jobs=None, max_rows=2000, random_state=42):
+    """
+    Compute and store the permutation importances of one registered version.
+
+    Returns:
+    --------
+    dict : The stored result (also written to models/<version>/permutation_importance.json)
+    """
+    import joblib
+    import utils  # noqa: F401  (classes referenced by the pickled preprocessors)
+    from model_registry import ModelRegistry, file_checksum
+
+    registry = ModelRegistry(root)
+    manifest = registry.load_manifest()
+    entry = registry.current_entry(manifest) if version is None else manifest["versions"][version]
+    loaded = {}
+    for name, spec in entry["artifacts"].items():
+        path = os.path.join(root, spec["path"])
+        if file_checksum(path) != spec["sha256"]:
+            raise ValueError(f"Checksum mismatch for {spec['path']}")
+        loaded[name] = joblib.load(path)
+
+    X, y = load_evaluation_data(data, target, max_rows, random_state)
+    predictor = RegistryPredictor(loaded["model"], loaded["preprocessor"], X.columns)
+    result = permutation_importance(predictor, X, y, r2_score, n_repeats, n_jobs, random_state)
+    result.update(
+        version=entry["version"],
+        model_sha256=entry["artifacts"]["model"]["sha256"],
+        data=data or "california_housing_test_split",
+        computed_at=datetime.now().isoformat(timespec="seconds"),
+    )
+    out_path = os.path.join(root, entry["version"], IMPORTANCE_FILE)
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(result, f, indent=2)
+    os.replace(tmp_path, out_path)
+    return result
+
+
+def load_importances(root, version):
+    """Stored importances of ``version``, or None if they were not computed yet."""
+    path = os.path.join(root, version, IMPORTANCE_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute permutation importances for a model version")
+    parser.add_argument("--root", default="models", help="Registry directory")
+    parser.add_argument("--version", default=None, help="Version (default: promoted)")
+    parser.add_argument("--data", default=None, help="Evaluation rows (.csv/.parquet); default: test split")
+    parser.add_argument("--target", default="MedHouseVal", help="Target column of --data")
+    parser.add_argument("--n-repeats", type=int, default=5)
+    parser.add_argument("--n-jobs", type=int, default=None)
+    parser.add_argument("--max-rows", type=int, default=2000)
+    args = parser.parse_args()
+
+    result = compute_for_version(args.root, args.version, args.data, args.target,
+                                 args.n_repeats, args.n_jobs, args.max_rows)
+    print(f"✅ {result['version']}: baseline R²={result['baseline_score']:.4f}")
+    for name in result["ranking"]:
+        i = result["features"].index(name)
+        print(f"   {name:<12} {result['importances_mean'][i]:.4f} ± {result['importances_std'][i]:.4f}")
+
+
+if __name__ == "__main__":
+    main()
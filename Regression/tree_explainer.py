@@ -0,0 +1,192 @@
+# tree_explainer.py - Per-prediction feature contributions for tree ensembles
+"""
+Exact path-based explanations for the deployed tree models.
+
+Every prediction of a regression tree is the root value plus the change in
+node value at each split on the way to its leaf; crediting each change to
+the feature of the split gives contributions that add up exactly to the
+prediction (``prediction = bias + contributions.sum()``). For an ensemble the
+trees are combined the way the model combines them: scaled by the learning
+rate for GradientBoosting, averaged for RandomForest / ExtraTrees.
+
+The path sums only depend on the leaf, so they are computed once per leaf
+when the explainer is built. Explaining a row is then one ``model.apply``
+call (all trees, in C) and a gather-and-sum over the leaf table. Results of
+single rows are kept in an LRU cache keyed by the row's bytes, so repeated
+or re-run inputs (Streamlit reruns on every widget change) cost a dict lookup.
+
+Usage:
+    explainer = TreeExplainer(model, preprocessor, feature_names=MODEL_FEATURES)
+    explanation = explainer.explain(input_df)     # one row, cached
+    bias, contributions = explainer.contributions(X_processed)  # batch
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Model inputs after utils.AdvancedFeatureEngineer; the clipping and scaling
+# steps that follow it work column by column and keep this order
+MODEL_FEATURES = [
+    "MedInc", "HouseAge", "AveRooms", "AveBedrms",
+    "Population", "AveOccup", "Latitude", "Longitude",
+    "DistToCenter", "RoomsPerBedroom", "IncomePerRoom",
+    "PopPerOccupancy", "IncomeXRooms", "Quadrant",
+]
+
+
+def _tree_paths(tree, n_features):
+    """(node -> summed contributions on the path from the root, root value) of one fitted tree."""
+    value = tree.value[:, 0, 0].astype(float)
+    left, right, feature = tree.children_left, tree.children_right, tree.feature
+    internal = np.flatnonzero(left >= 0)
+    parent = np.full(tree.node_count, -1)
+    parent[left[internal]] = internal
+    parent[right[internal]] = internal
+
+    paths = np.zeros((tree.node_count, n_features))
+    # Children always come after their parent in sklearn's node order, but a
+    # node-by-node loop is slow for deep forests; go one depth level at a time
+    level = np.array([0])
+    while len(level):
+        children = np.concatenate([left[level], right[level]])
+        children = children[children >= 0]
+        parents = parent[children]
+        paths[children] = paths[parents]
+        paths[children, feature[parents]] += value[children] - value[parents]
+        level = children
+    return paths, value[0]
+
+
+class TreeExplainer:
+    """
+    Path-based feature contributions for fitted tree regressors.
+
+    Parameters:
+    -----------
+    model : estimator
+        Fitted GradientBoostingRegressor, RandomForestRegressor,
+        ExtraTreesRegressor or DecisionTreeRegressor
+    preprocessor : transformer, optional
+        Applied to the input before ``model.apply`` (same as for predict)
+    feature_names : list, optional
+        Names of the model inputs (default: feature_<i>)
+    cache_size : int, default=1024
+        Rows kept in the LRU cache of ``explain``; 0 disables it
+    dtype : numpy dtype, default=np.float64
+        Storage of the leaf table; float32 halves it for deep forests
+    """
+
+    def __init__(self, model, preprocessor=None, feature_names=None, cache_size=1024, dtype=np.float64):
+        self.model = model
+        self.preprocessor = preprocessor
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+        trees, scale, bias = self._unpack(model)
+        n_features = model.n_features_in_
+        self.feature_names = list(feature_names) if feature_names is not None else \
+            [f"feature_{i}" for i in range(n_features)]
+        if len(self.feature_names) != n_features:
+            raise ValueError(f"Model has {n_features} features, got {len(self.feature_names)} names")
+
+        # One row per leaf of every tree, scaled by the tree's weight in the ensemble
+        tables, leaf_rows, offset = [], [], 0
+        for tree in trees:
+            paths, root_value = _tree_paths(tree, n_features)
+            leaves = np.flatnonzero(tree.children_left < 0)
+            rows = np.full(tree.node_count, -1)
+            rows[leaves] = np.arange(offset, offset + len(leaves))
+            tables.append((paths[leaves] * scale).astype(dtype))
+            leaf_rows.append(rows)
+            bias += scale * root_value
+            offset += len(leaves)
+        self._leaf_table = np.concatenate(tables)
+        # (n_trees, max node count) lookup from model.apply's node ids to table rows
+        self._leaf_rows = np.full((len(trees), max(len(r) for r in leaf_rows)), -1)
+        for i, rows in enumerate(leaf_rows):
+            self._leaf_rows[i, :len(rows)] = rows
+        self.bias = float(bias)
+
+    @staticmethod
+    def _unpack(model):
+        """(trees, weight of each tree, constant term) of a supported model."""
+        name = type(model).__name__
+        if name == "GradientBoostingRegressor":
+            if model.init_ == "zero":
+                init = 0.0
+            else:
+                init = float(np.ravel(model.init_.predict(np.zeros((1, model.n_features_in_))))[0])
+            return [est.tree_ for est in model.estimators_[:, 0]], model.learning_rate, init
+        if name in ("RandomForestRegressor", "ExtraTreesRegressor"):
+            return [est.tree_ for est in model.estimators_], 1.0 / len(model.estimators_), 0.0
+        if name == "DecisionTreeRegressor":
+            return [model.tree_], 1.0, 0.0
+        raise TypeError(f"TreeExplainer does not support {name}; expected a tree regressor")
+
+    def _apply(self, X):
+        # GB returns float node ids shaped (n, n_trees, 1), a single tree (n,)
+        leaves = self.model.apply(X)
+        return leaves.reshape(len(leaves), -1).astype(np.intp, copy=False)
+
+    def contributions(self, X):
+        """
+        Contributions of already preprocessed rows.
+
+        Returns:
+        --------
+        tuple : (bias, (n_rows, n_features) array); each row sums to prediction - bias
+        """
+        X = np.asarray(X, dtype=np.float32)
+        leaves = self._apply(X)
+        rows = self._leaf_rows[np.arange(leaves.shape[1]), leaves]
+        out = np.empty((len(X), self._leaf_table.shape[1]))
+        # Chunked so the (rows, trees, features) gather stays small
+        chunk = max(1, 2 ** 20 // (rows.shape[1] * self._leaf_table.shape[1]))
+        for start in range(0, len(X), chunk):
+            out[start:start + chunk] = self._leaf_table[rows[start:start + chunk]].sum(axis=1)
+        return self.bias, out
+
+    def explain(self, X):
+        """
+        Explanation of a single input row (raw features if a preprocessor is set).
+
+        Returns:
+        --------
+        dict : prediction, bias, feature_names and contributions (list), in model input order
+        """
+        row = X.to_numpy(dtype=float) if isinstance(X, pd.DataFrame) else np.asarray(X, dtype=float)
+        row = np.ascontiguousarray(row.reshape(1, -1))
+        key = row.tobytes()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        frame = pd.DataFrame(row, columns=X.columns) if isinstance(X, pd.DataFrame) else row
+        processed = self.preprocessor.transform(frame) if self.preprocessor is not None else row
+        bias, contributions = self.contributions(processed)
+        explanation = {
+            "prediction": bias + float(contributions[0].sum()),
+            "bias": bias,
+            "feature_names": self.feature_names,
+            "contributions": contributions[0].tolist(),
+        }
+        if self.cache_size:
+            with self._lock:
+                self._cache[key] = explanation
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return explanation
+
+    def cache_info(self):
+        """Hits, misses and current size of the ``explain`` cache."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "size": len(self._cache), "max_size": self.cache_size}